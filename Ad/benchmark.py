@@ -0,0 +1,278 @@
+# benchmark.py
+# -*- coding: utf-8 -*-
+import sys
+import os
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+import warnings
+warnings.filterwarnings('ignore')
+
+import pandas as pd
+from src.data_loader import load_data, get_data_info
+from src.feature_engineering import (create_features, get_feature_columns,
+                                     FeaturePipeline)
+from src.model_training import prepare_data, train_models, optimize_random_forest
+from src.out_of_core import train_out_of_core
+from src.scoring import save_model_bundle, load_model_bundle, score_csv
+from src.synthetic import generate_csv
+from src.rendering import configure_fonts, pyplot
+from src.profiling import measure, profile_run, peak_rss_mb, current_rss_mb
+from config import (CHUNK_SIZE, RANDOM_STATE, REPORT_DIR, BENCHMARK_SIZES,
+                    BENCHMARK_IN_MEMORY_MAX_ROWS, BENCHMARK_MODELS,
+                    BENCHMARK_SEARCH_MAX_ROWS, BENCHMARK_SEARCH_METHOD,
+                    BENCHMARK_MIN_ROWS_PER_SEC, BENCHMARK_MAX_BYTES_PER_ROW,
+                    BENCHMARK_RSS_ALLOWANCE_MB, BENCHMARK_OOC_MAX_RSS_MB)
+
+STAGES = ['load', 'features', 'train', 'search', 'score']
+
+def _score_stage(model, scaler, feature_pipeline, path, n_rows, work_dir,
+                 scaled=False):
+    """학습된 모델로 번들을 만들어 CSV 전체를 스코어링 (출력은 버림)"""
+    bundle_path = save_model_bundle(model, scaler, feature_pipeline,
+                                    path=os.path.join(work_dir, 'bundle.joblib'),
+                                    scaled=scaled)
+    bundle = load_model_bundle(bundle_path)
+    with measure('score', kind='stage', rows=n_rows):
+        with open(os.devnull, 'w') as sink:
+            score_csv(bundle, path, sink)
+
+def _run_in_memory(path, n_rows, search, work_dir):
+    """main.py와 같은 메모리 내 경로: CSV 로드 → create_features → train_models"""
+    # Arrow 캐시는 첫 실행에만 만들어지므로 CSV 파싱 경로로 측정한다
+    with measure('load', kind='stage', rows=n_rows):
+        df = load_data(path, use_cache=False)
+    with measure('features', kind='stage', rows=n_rows):
+        df = create_features(df, verbose=False)
+
+    feature_cols = get_feature_columns()
+    X_train, X_test, y_train, y_test, X_train_scaled, X_test_scaled, scaler = \
+        prepare_data(df, feature_cols)
+    with measure('train', kind='stage', rows=len(X_train)):
+        _, trained_models = train_models(X_train, X_test, y_train, y_test,
+                                         X_train_scaled, X_test_scaled,
+                                         model_names=BENCHMARK_MODELS)
+    if search and n_rows <= BENCHMARK_SEARCH_MAX_ROWS:
+        with measure('search', kind='stage', rows=len(X_train)):
+            optimize_random_forest(X_train, y_train, method=BENCHMARK_SEARCH_METHOD)
+
+    feature_pipeline = FeaturePipeline(feature_cols).fit(df)
+    del df, X_train, X_test, X_train_scaled, X_test_scaled
+    _score_stage(trained_models['Random Forest'], scaler, feature_pipeline,
+                 path, n_rows, work_dir)
+
+def _run_out_of_core(path, n_rows, work_dir):
+    """메모리보다 큰 크기: 청크 스트리밍 통계 → 메모리 맵 피처 + out-of-core 학습"""
+    with measure('load', kind='stage', rows=n_rows):
+        get_data_info(load_data(path, chunksize=CHUNK_SIZE))
+    # 피처 변환은 메모리 맵 생성(학습 단계)에 포함된다
+    with measure('train', kind='stage', rows=n_rows):
+        _, trained_models, data = train_out_of_core(
+            path, work_dir=os.path.join(work_dir, 'out_of_core'))
+    _score_stage(trained_models['HistGradientBoosting'], data['scaler'],
+                 data['pipeline'], path, n_rows, work_dir)
+
+def run_size(n_rows, search=False, seed=RANDOM_STATE):
+    """
+    한 크기에서 load → features → train → (search) → score 측정
+
+    단계별 메모리는 measure()가 단계 시작 RSS 대비 단계 안 최대 RSS
+    증가량(peak_rss_growth_mb)으로 잰다. 앞 크기의 메모리가 섞이지 않도록
+    크기마다 새 프로세스(--worker)에서 실행하고, 라이브러리 import 직후의
+    현재 RSS를 기준선으로 함께 기록한다.
+    """
+    path = generate_csv(n_rows, seed=seed)
+    mode = 'in_memory' if n_rows <= BENCHMARK_IN_MEMORY_MAX_ROWS else 'out_of_core'
+    baseline = current_rss_mb()
+    with tempfile.TemporaryDirectory(prefix='benchmark_') as work_dir:
+        with profile_run(save=False) as profiler:
+            if mode == 'in_memory':
+                _run_in_memory(path, n_rows, search, work_dir)
+            else:
+                _run_out_of_core(path, n_rows, work_dir)
+    return {'size': n_rows, 'mode': mode, 'baseline_rss_mb': baseline,
+            'peak_rss_mb': peak_rss_mb(), 'records': profiler.records}
+
+def _run_worker(n_rows, search, verbose):
+    """크기 하나를 새 프로세스에서 측정하고 결과 dict 반환"""
+    with tempfile.TemporaryDirectory(prefix='benchmark_') as tmp_dir:
+        result_path = os.path.join(tmp_dir, 'result.json')
+        command = [sys.executable, os.path.abspath(__file__), '--worker',
+                   str(n_rows), '--result', result_path]
+        if search:
+            command.append('--search')
+        subprocess.run(command, check=True,
+                       stdout=None if verbose else subprocess.DEVNULL)
+        with open(result_path, encoding='utf-8') as f:
+            return json.load(f)
+
+def result_table(results):
+    """크기 × 구간별 처리량/메모리 표"""
+    rows = []
+    for result in results:
+        for record in result['records']:
+            rows.append({
+                'size': result['size'],
+                'mode': result['mode'],
+                'name': record['name'],
+                'kind': record['kind'],
+                'wall_seconds': record['wall_seconds'],
+                'cpu_seconds': record['cpu_seconds'],
+                'rows_per_second': record['rows_per_second'],
+                'peak_rss_mb': record['peak_rss_mb'],
+                'peak_rss_growth_mb': record['peak_rss_growth_mb'],
+                'rss_over_baseline_mb': (None if record['peak_rss_mb'] is None
+                                         or result['baseline_rss_mb'] is None
+                                         else record['peak_rss_mb'] - result['baseline_rss_mb']),
+            })
+    return pd.DataFrame(rows)
+
+def _rss_limit_mb(result):
+    """단계 하나의 최대 RSS 증가 허용치 (MB)"""
+    if result['mode'] == 'in_memory':
+        return BENCHMARK_RSS_ALLOWANCE_MB + result['size'] * BENCHMARK_MAX_BYTES_PER_ROW / 1024 ** 2
+    return BENCHMARK_OOC_MAX_RSS_MB
+
+def check_thresholds(results):
+    """
+    통과 기준 검사
+
+    - 단계별 처리량 >= BENCHMARK_MIN_ROWS_PER_SEC
+    - 단계별 최대 RSS 증가(단계 시작 RSS 기준, peak_rss_growth_mb)
+      - 메모리 내 경로: <= BENCHMARK_RSS_ALLOWANCE_MB + 행 수 × BENCHMARK_MAX_BYTES_PER_ROW
+      - out-of-core 경로: <= BENCHMARK_OOC_MAX_RSS_MB (행 수와 무관)
+
+    Returns:
+    --------
+    checks : list of dict
+        size, check, value, limit, passed
+    """
+    checks = []
+    for result in results:
+        size = result['size']
+        for record in result['records']:
+            if record['kind'] != 'stage':
+                continue
+            limit = BENCHMARK_MIN_ROWS_PER_SEC.get(record['name'])
+            if limit is not None:
+                value = record['rows_per_second'] or 0.0
+                checks.append({'size': size, 'check': f"{record['name']} 행/초",
+                               'value': value, 'limit': limit, 'passed': value >= limit})
+            growth = record['peak_rss_growth_mb']
+            if growth is not None:
+                limit = _rss_limit_mb(result)
+                checks.append({'size': size, 'check': f"{record['name']} RSS 증가(MB)",
+                               'value': growth, 'limit': limit, 'passed': growth <= limit})
+    return checks
+
+def plot_curves(table, path):
+    """크기별 단계 처리량(행/초)과 최대 RSS 증가 곡선 (로그 축)"""
+    plt = pyplot()
+    configure_fonts()
+    stages = table[table['kind'] == 'stage']
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    for name in STAGES:
+        stage = stages[stages['name'] == name]
+        if len(stage):
+            axes[0].plot(stage['size'], stage['rows_per_second'], marker='o', label=name)
+    axes[0].set_title('단계별 처리량')
+    axes[0].set_ylabel('행/초')
+
+    for name in STAGES:
+        stage = stages[stages['name'] == name]
+        if len(stage):
+            axes[1].plot(stage['size'], stage['peak_rss_growth_mb'], marker='o', label=name)
+    axes[1].set_title('단계별 최대 RSS 증가 (단계 시작 기준)')
+    axes[1].set_ylabel('MB')
+    for ax in axes:
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('행 수')
+        ax.grid(True, which='both', alpha=0.3)
+    axes[0].legend()
+    axes[1].legend()
+    plt.tight_layout()
+    plt.savefig(path, dpi=100, bbox_inches='tight')
+    plt.close(fig)
+
+def run_benchmark(sizes=BENCHMARK_SIZES, search=False, verbose=False,
+                  report_dir=REPORT_DIR):
+    """
+    크기별 벤치마크 실행 후 리포트(JSON, CSV, PNG) 저장
+
+    Returns:
+    --------
+    table : DataFrame
+    checks : list of dict
+    """
+    print("="*70)
+    print(f"벤치마크: {', '.join(f'{n:,}' for n in sizes)}행")
+    print("="*70)
+
+    for n_rows in sizes:
+        generate_csv(n_rows)
+
+    results = []
+    for n_rows in sizes:
+        start = time.perf_counter()
+        results.append(_run_worker(n_rows, search, verbose))
+        print(f"[{n_rows:,}행] {results[-1]['mode']} | "
+              f"{time.perf_counter() - start:.1f}초")
+
+    table = result_table(results)
+    checks = check_thresholds(results)
+
+    stages = table[table['kind'] == 'stage']
+    print("\n단계별 처리량 (행/초):")
+    print(stages.pivot(index='size', columns='name', values='rows_per_second')
+          .reindex(columns=[s for s in STAGES if s in set(stages['name'])])
+          .to_string(float_format=lambda v: f'{v:,.0f}'))
+    print("\n단계별 최대 RSS 증가 (MB, 단계 시작 기준):")
+    print(stages.pivot(index='size', columns='name', values='peak_rss_growth_mb')
+          .reindex(columns=[s for s in STAGES if s in set(stages['name'])])
+          .to_string(float_format=lambda v: f'{v:,.1f}'))
+
+    print("\n통과 기준:")
+    for check in checks:
+        status = 'PASS' if check['passed'] else 'FAIL'
+        print(f"  [{status}] {check['size']:>12,}행 | {check['check']:22s} "
+              f"{check['value']:>14,.1f} (기준 {check['limit']:,.1f})")
+
+    os.makedirs(report_dir, exist_ok=True)
+    stem = os.path.join(report_dir, f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}")
+    with open(stem + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'sizes': list(sizes), 'search': search, 'results': results,
+                   'checks': checks}, f, indent=2, ensure_ascii=False, default=str)
+    table.to_csv(stem + '.csv', index=False)
+    plot_curves(table, stem + '.png')
+    print(f"\n벤치마크 리포트: {stem}.json (.csv, .png)")
+    return table, checks
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='합성 데이터 크기별 파이프라인 벤치마크')
+    parser.add_argument('--sizes', nargs='+', type=float, default=None,
+                        help='측정할 행 수 목록 (예: 1e4 1e5 1e6, 기본: config.BENCHMARK_SIZES)')
+    parser.add_argument('--search', action='store_true',
+                        help=f'{BENCHMARK_SEARCH_MAX_ROWS:,}행 이하에서 하이퍼파라미터 탐색도 측정')
+    parser.add_argument('--verbose', action='store_true',
+                        help='단계 출력을 그대로 표시')
+    parser.add_argument('--worker', type=float, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--result', default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker is not None:
+        result = run_size(int(args.worker), args.search)
+        with open(args.result, 'w', encoding='utf-8') as f:
+            json.dump(result, f, default=str)
+        return 0
+
+    sizes = [int(n) for n in args.sizes] if args.sizes else BENCHMARK_SIZES
+    _, checks = run_benchmark(sizes, args.search, args.verbose)
+    return 0 if all(check['passed'] for check in checks) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# cli.py
+# -*- coding: utf-8 -*-
+"""
+광고 클릭 분석 명령행 도구
+
+    python cli.py eda      # 데이터 로드 + EDA 그래프 (2~5단계)
+    python cli.py train    # 모델 학습 및 비교 (9단계와 의존 단계)
+    python cli.py tune     # Random Forest 하이퍼파라미터 최적화 (10단계와 의존 단계)
+    python cli.py score csv data/new.csv -o scores.csv   # 저장된 번들로 스코어링
+
+하위 명령마다 필요한 모듈만 import한다. score는 matplotlib과 학습용
+estimator를 로드하지 않고, eda/train/tune은 해당 단계 함수 안에서
+필요한 모듈을 불러온다. 전체 파이프라인은 main.py로 실행한다.
+"""
+import argparse
+import sys
+import warnings
+warnings.filterwarnings('ignore')
+
+from config import RUN_REPORT, PROFILE_CPROFILE
+
+# 하위 명령별로 실행할 파이프라인 단계 (의존 단계는 자동으로 함께 실행)
+PIPELINE_COMMANDS = {
+    'eda': (['target', 'numeric', 'segment', 'correlation'],
+            '데이터 로드 및 탐색적 분석 그래프'),
+    'train': (['train'], '모델 학습 및 비교'),
+    'tune': (['tune'], 'Random Forest 하이퍼파라미터 최적화'),
+}
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='캐시된 아티팩트를 무시하고 다시 계산')
+    common.add_argument('--cprofile', action='store_true', default=PROFILE_CPROFILE,
+                        help='단계별 cProfile 통계를 실행 리포트에 포함')
+    common.add_argument('--no-report', dest='report', action='store_false',
+                        default=RUN_REPORT, help='실행 리포트(JSON)를 저장하지 않음')
+
+    parser = argparse.ArgumentParser(description='광고 클릭 분석 명령행 도구')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for command, (_, help_text) in PIPELINE_COMMANDS.items():
+        sub.add_parser(command, parents=[common], help=help_text)
+    # score의 인자는 src.scoring이 해석한다 (python cli.py score --help)
+    sub.add_parser('score', add_help=False,
+                   help='저장된 모델 번들로 스코어링 (csv/jsonl/serve)')
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args, rest = build_parser().parse_known_args(argv)
+
+    if args.command == 'score':
+        from src.scoring import main as score_main
+        return score_main(rest)
+    if rest:
+        build_parser().error(f"알 수 없는 인자: {' '.join(rest)}")
+
+    from main import run_pipeline
+    only, _ = PIPELINE_COMMANDS[args.command]
+    run_pipeline(only=only, no_cache=args.no_cache, cprofile=args.cprofile,
+                 report=args.report)
+
+if __name__ == "__main__":
+    main()
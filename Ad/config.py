@@ -7,19 +7,51 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 DATA_PATH = os.path.join(DATA_DIR, 'advertising.csv')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
 PLOTS_DIR = os.path.join(OUTPUT_DIR, 'plots')
+CACHE_DIR = os.path.join(OUTPUT_DIR, 'cache')
+MODEL_DIR = os.path.join(OUTPUT_DIR, 'models')
+MODEL_BUNDLE_PATH = os.path.join(MODEL_DIR, 'ad_click_model.joblib')
+SYNTHETIC_DIR = os.path.join(CACHE_DIR, 'synthetic')  # 합성 데이터 CSV 저장 위치
+REPORT_DIR = os.path.join(OUTPUT_DIR, 'reports')  # 실행 리포트(JSON) 저장 위치
 
 # 디렉토리 생성
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 os.makedirs(PLOTS_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
+os.makedirs(MODEL_DIR, exist_ok=True)
 
 # 실행 모드 설정
 SHOW_PLOTS = False  
 SAVE_PLOTS = True 
 
+# 실행 계측 (단계/모델 학습별 시간, 메모리)
+RUN_REPORT = True  # 실행마다 output/reports/run-<시각>.json 저장
+PROFILE_CPROFILE = False  # 단계별 cProfile 통계 수집 (실행이 느려짐, --cprofile로도 켤 수 있음)
+PROFILE_TOP_FUNCTIONS = 25  # 리포트에 남길 단계별 누적 시간 상위 함수 수
+PROFILE_RSS_INTERVAL = 0.005  # 구간 안 최대 RSS를 잡기 위한 현재 RSS 표본 간격(초)
+
+# 데이터 로딩 설정
+CHUNK_SIZE = 100000  # 스트리밍 로딩 시 청크당 행 수
+USE_DATA_CACHE = True  # CSV를 Arrow(Feather) 캐시로 변환해 재사용
+QUANTILE_SKETCH_K = 1000  # 스트리밍 분위수 스케치 크기 (순위 오차 약 0.2%, 최대 약 3000개 값 보관)
+
 # 모델 파라미터
 RANDOM_STATE = 42
 TEST_SIZE = 0.2
 CV_FOLDS = 5
+N_JOBS = -1  # 전체 CPU 코어 예산 (-1: 모든 코어)
+PARALLEL_TRAINING = False  # train_models에서 모델들을 병렬로 학습
+CV_LEADERBOARD = False  # 9단계에서 모든 모델을 CV_FOLDS-fold 교차검증한 리더보드도 계산
+SCALED_MODELS = ['Logistic Regression', 'SVM', 'KNN', 'Naive Bayes']  # 스케일링된 데이터로 학습하는 모델
+
+# 해싱 피처 설정 (Ad Topic Line/City/Country + Timestamp 주기형 시간 피처)
+HASHED_FEATURES = True  # 6단계에서 해싱 희소 블록을 만들어 선형 모델 입력에 추가
+HASH_N_FEATURES = 2 ** 10  # 해싱 열 수 (고정 폭, 어휘 수와 무관)
+HASHED_FEATURE_MODELS = ['Logistic Regression']  # 스케일 피처 + 해싱 블록(CSR)으로 학습할 모델
+
+# Out-of-core 학습 설정 (메모리보다 큰 데이터)
+OOC_DIR = os.path.join(CACHE_DIR, 'out_of_core')  # 메모리 맵 피처 행렬 저장 위치
+OOC_EPOCHS = 5  # SGD 로지스틱 회귀 반복 횟수
+OOC_HGB_MAX_ITER = 100  # HistGradientBoosting 부스팅 반복 횟수
 
 # GridSearch 파라미터
 PARAM_GRID = {
@@ -29,13 +61,57 @@ PARAM_GRID = {
     'min_samples_leaf': [1, 2, 4]
 }
 
+# 하이퍼파라미터 탐색 설정
+SEARCH_METHOD = 'grid'  # 'grid', 'warm_start', 'halving_grid', 'halving_random', 'bayes'
+SEARCH_MAX_FITS = 150  # 탐색 예산: 최대 모델 학습 횟수 (halving_random, bayes)
+SEARCH_TIME_BUDGET = None  # 탐색 예산: 최대 실행 시간(초), None이면 제한 없음 (bayes)
+SEARCH_HALVING_FACTOR = 3  # successive halving 단계별 후보 축소 비율
+SEARCH_COMPARE_BASELINE = False  # 전체 GridSearch 대비 속도/ROC-AUC 비교 리포트
+
+# 평가 설정
+BOOTSTRAP_SAMPLES = 1000  # 부트스트랩 신뢰구간 재표본 수
+CALIBRATION_BINS = 10  # 신뢰도(calibration) 곡선 구간 수
+CALIBRATION_METHOD = 'isotonic'  # 확률 보정 방법: 'isotonic' 또는 'sigmoid'(Platt)
+
+# 노출 임계값 최적화 (확률 >= 임계값인 대상에게만 광고 노출)
+COST_PER_IMPRESSION = 0.5  # 노출 1회 비용
+VALUE_PER_CLICK = 2.0  # 클릭 1회 가치
+BUDGET_RATIO = 0.5  # 전체 대상 중 예산으로 노출 가능한 최대 비율
+
+# 스코어링 설정
+SCORING_BATCH_SIZE = 10000  # 마이크로 배치당 행 수
+SCORING_HOST = '127.0.0.1'
+SCORING_PORT = 8000
+
+# 벤치마크 설정 (benchmark.py, 합성 데이터 크기별 측정)
+BENCHMARK_SIZES = [10000, 100000, 1000000]  # 측정할 행 수 (10^4 ~ 10^8)
+BENCHMARK_IN_MEMORY_MAX_ROWS = 1000000  # 이보다 크면 out-of-core 경로(청크 로드, 메모리 맵 학습)로 측정
+BENCHMARK_MODELS = ['Logistic Regression', 'Decision Tree', 'Random Forest',
+                    'Gradient Boosting', 'Naive Bayes']  # SVM/KNN은 비용이 행 수의 제곱에 비례해 제외
+BENCHMARK_SEARCH_MAX_ROWS = 10000  # --search 시 하이퍼파라미터 탐색을 측정할 최대 행 수
+BENCHMARK_SEARCH_METHOD = 'halving_random'  # 벤치마크용 탐색 엔진 (SEARCH_MAX_FITS 예산)
+BENCHMARK_MIN_ROWS_PER_SEC = {  # 단계별 최소 처리량 (행/초, 통과 기준)
+    'load': 100000,
+    'features': 500000,
+    'train': 500,
+    'search': 30,
+    'score': 30000
+}
+BENCHMARK_MAX_BYTES_PER_ROW = 2000  # 메모리 내 경로의 행당 최대 RSS 증가 (byte)
+BENCHMARK_RSS_ALLOWANCE_MB = 300  # 행 수와 무관한 RSS 증가 허용치 (MB)
+BENCHMARK_OOC_MAX_RSS_MB = 2000  # out-of-core 경로의 최대 RSS 증가 (MB, 행 수와 무관)
+
 # 세그먼트 정의
 SEGMENT_AGE_THRESHOLD = 40
 SEGMENT_TIME_THRESHOLD = 60
 SEGMENT_INCOME_THRESHOLD = 40000
 SEGMENT_INTERNET_THRESHOLD = 180
+SEGMENT_QUANTILE_BINS = None  # 정수이면 연령/소득 구간을 고정 구간 대신 분위수(동일 빈도) 구간으로 분할
+SEGMENT_CUBE_BINS = 32  # CTR 큐브에서 연속형 차원의 최대 구간 수 (고유값이 더 적으면 고유값 사용)
 
 # 시각화 설정
 PLOT_STYLE = 'whitegrid'
 PLOT_PALETTE = 'Set2'
-FIGURE_DPI = 100
\ No newline at end of file
+FIGURE_DPI = 100
+PLOT_FONT = None  # None이면 설치된 한글 폰트를 자동 선택 (Malgun Gothic → AppleGothic → NanumGothic …)
+PARALLEL_PLOTS = True  # 그래프를 모아 프로세스 풀에서 Agg 백엔드로 동시 렌더링
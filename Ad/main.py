@@ -2,143 +2,315 @@
 # -*- coding: utf-8 -*-
 import sys
 import os
+import argparse
 import warnings
 warnings.filterwarnings('ignore')
 
-# 현재 디렉토리를 Python 경로에 추가
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# 단계별 모듈(sklearn, matplotlib 등)은 각 단계 함수 안에서 import한다.
+# --list나 일부 단계만 실행할 때 쓰지 않는 라이브러리를 로드하지 않기 위함
+from src.pipeline import Stage, Pipeline, ArtifactStore
+from src.rendering import collect_plots
+from src.profiling import profile_run
+from config import (SEGMENT_AGE_THRESHOLD, SEGMENT_TIME_THRESHOLD,
+                    SEGMENT_INCOME_THRESHOLD, SEGMENT_INTERNET_THRESHOLD,
+                    SEARCH_COMPARE_BASELINE, PARALLEL_PLOTS, CV_LEADERBOARD,
+                    CALIBRATION_METHOD, RUN_REPORT, PROFILE_CPROFILE,
+                    HASHED_FEATURES)
 
-from src.data_loader import load_data, get_data_info
-from src.eda import (plot_target_distribution, analyze_numeric_features,
-                     segment_analysis, correlation_analysis)
-from src.feature_engineering import create_features, get_feature_columns
-from src.model_training import prepare_data, train_models, optimize_random_forest
-from src.evaluation import (evaluate_model, plot_feature_importance,
-                            plot_roc_curve, generate_business_insights)
-from config import SEGMENT_AGE_THRESHOLD, SEGMENT_TIME_THRESHOLD
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
 
-def main():
-    """메인 실행 함수"""
-    
-    print("="*70)
-    print("광고 클릭 분석 및 예측 모델 실행")
-    print("="*70)
-    
-    # 1. 데이터 로드
-    print("\n[Step 1/11] 데이터 로드")
-    print("-" * 70)
+def step_load(ctx):
+    """1. 데이터 로드"""
+    from src.data_loader import load_data, get_data_info
     df = load_data()
     info = get_data_info(df)
-    
-    # 2. EDA - 타겟 변수 분포
-    print("\n[Step 2/11] 타겟 변수 분포 분석")
-    print("-" * 70)
-    plot_target_distribution(df)
-    
-    # 3. 수치형 변수 분석
-    print("\n[Step 3/11] 수치형 변수 분석")
-    print("-" * 70)
-    analyze_numeric_features(df)
-    
-    # 4. 세그먼트 분석
-    print("\n[Step 4/11] 세그먼트 분석")
-    print("-" * 70)
-    age_click, income_click = segment_analysis(df)
-    
-    # 5. 상관관계 분석
-    print("\n[Step 5/11] 상관관계 분석")
-    print("-" * 70)
-    correlation_analysis(df)
-    
-    # 6. Feature Engineering
-    print("\n[Step 6/11] Feature Engineering")
-    print("-" * 70)
-    df = create_features(df)
+    return {'df': df, 'info': info}
+
+def step_target(ctx):
+    """2. EDA - 타겟 변수 분포"""
+    from src.eda import plot_target_distribution
+    plot_target_distribution(ctx['df'])
+
+def step_numeric(ctx):
+    """3. 수치형 변수 분석"""
+    from src.eda import analyze_numeric_features
+    return {'numeric_results': analyze_numeric_features(ctx['df'])}
+
+def step_segment(ctx):
+    """4. 세그먼트 분석"""
+    from src.eda import segment_analysis
+    age_click, income_click = segment_analysis(ctx['df'])
+    return {'age_click': age_click, 'income_click': income_click}
+
+def step_correlation(ctx):
+    """5. 상관관계 분석"""
+    from src.eda import correlation_analysis
+    return {'corr_matrix': correlation_analysis(ctx['df'])}
+
+def step_features(ctx):
+    """6. Feature Engineering"""
+    from src.feature_engineering import create_features, get_feature_columns
+    df = create_features(ctx['df'])
     feature_cols = get_feature_columns()
-    
-    # 7. 세그먼트 정의 및 CTR 계산
-    print("\n[Step 7/11] 타겟 세그먼트 정의")
-    print("-" * 70)
-    segment_a = df[(df['Age'] >= SEGMENT_AGE_THRESHOLD) & 
-                   (df['Daily Time Spent on Site'] <= SEGMENT_TIME_THRESHOLD)]
-    segment_a_ctr = segment_a['Clicked on Ad'].mean()
-    
-    segment_b = df[(df['Area Income'] <= 40000) & 
-                   (df['Daily Internet Usage'] <= 180)]
-    segment_b_ctr = segment_b['Clicked on Ad'].mean()
-    
-    overall_ctr = df['Clicked on Ad'].mean()
-    
+    outputs = {'df': df, 'feature_cols': feature_cols}
+    if HASHED_FEATURES:
+        from src.feature_engineering import HashedFeatures
+        X_hashed = HashedFeatures().transform(df)
+        size_mb = (X_hashed.data.nbytes + X_hashed.indices.nbytes +
+                   X_hashed.indptr.nbytes) / 1024 ** 2
+        print(f"\n해싱 피처 (Ad Topic Line/City/Country + 시간 주기 4개): "
+              f"{X_hashed.shape[1]:,}열 | 행당 nnz {X_hashed.nnz / X_hashed.shape[0]:.1f} | "
+              f"{size_mb:.2f}MB (CSR)")
+        outputs['X_hashed'] = X_hashed
+    return outputs
+
+def step_target_segments(ctx):
+    """7. 세그먼트 정의 및 CTR 계산 (CTR 큐브 질의, 큐브는 캐시하지 않고 결과만 반환)"""
+    from src.segment_cube import SegmentCube
+    df = ctx['df']
+    cube = SegmentCube.build(df)
+    segment_a = cube.query(age_ge=SEGMENT_AGE_THRESHOLD,
+                           time_le=SEGMENT_TIME_THRESHOLD)
+    segment_a_ctr = segment_a['ctr']
+
+    segment_b = cube.query(income_le=SEGMENT_INCOME_THRESHOLD,
+                           usage_le=SEGMENT_INTERNET_THRESHOLD)
+    segment_b_ctr = segment_b['ctr']
+
+    overall_ctr = cube.overall_ctr
+
     print(f"전체 클릭률(CTR): {overall_ctr:.2%}")
     print(f"세그먼트 A (40세+ & 체류시간 <=60분):")
-    print(f"  - 표본 수: {len(segment_a)}명")
+    print(f"  - 표본 수: {segment_a['size']}명")
     print(f"  - 클릭률: {segment_a_ctr:.2%}")
     print(f"  - 개선율: +{(segment_a_ctr - overall_ctr) / overall_ctr * 100:.1f}%")
-    
+
     print(f"\n세그먼트 B (저소득 & 인터넷 사용 <=180분):")
-    print(f"  - 표본 수: {len(segment_b)}명")
+    print(f"  - 표본 수: {segment_b['size']}명")
     print(f"  - 클릭률: {segment_b_ctr:.2%}")
     print(f"  - 개선율: +{(segment_b_ctr - overall_ctr) / overall_ctr * 100:.1f}%")
-    
-    # 8. 데이터 준비
-    print("\n[Step 8/11] 데이터 전처리 및 분할")
-    print("-" * 70)
+
+    return {'segment_a_ctr': segment_a_ctr, 'segment_b_ctr': segment_b_ctr,
+            'overall_ctr': overall_ctr}
+
+def step_split(ctx):
+    """8. 데이터 준비"""
+    from src.model_training import prepare_data
     X_train, X_test, y_train, y_test, X_train_scaled, X_test_scaled, scaler = \
-        prepare_data(df, feature_cols)
-    
-    # 9. 모델 학습
-    print("\n[Step 9/11] 모델 학습 및 비교")
-    print("-" * 70)
-    results_df, trained_models = train_models(
-        X_train, X_test, y_train, y_test,
-        X_train_scaled, X_test_scaled
+        prepare_data(ctx['df'], ctx['feature_cols'])
+    outputs = {'X_train': X_train, 'X_test': X_test,
+               'y_train': y_train, 'y_test': y_test,
+               'X_train_scaled': X_train_scaled, 'X_test_scaled': X_test_scaled,
+               'scaler': scaler}
+    if 'X_hashed' in ctx:
+        # 해싱 블록을 분할과 같은 행으로 나눠 스케일된 피처 옆에 붙인다
+        from src.feature_engineering import stack_sparse
+        positions = ctx['df'].index.get_indexer
+        outputs['X_train_sparse'] = stack_sparse(
+            X_train_scaled, ctx['X_hashed'][positions(X_train.index)])
+        outputs['X_test_sparse'] = stack_sparse(
+            X_test_scaled, ctx['X_hashed'][positions(X_test.index)])
+    return outputs
+
+def step_train(ctx):
+    """9. 모델 학습"""
+    from src.model_training import train_models
+    results_df, trained_models, evaluation = train_models(
+        ctx['X_train'], ctx['X_test'], ctx['y_train'], ctx['y_test'],
+        ctx['X_train_scaled'], ctx['X_test_scaled'], return_probabilities=True,
+        X_train_sparse=ctx.get('X_train_sparse'),
+        X_test_sparse=ctx.get('X_test_sparse')
     )
-    
-    # 10. Random Forest 최적화
-    print("\n[Step 10/11] Random Forest 하이퍼파라미터 최적화")
-    print("-" * 70)
-    best_rf = optimize_random_forest(X_train, y_train)
-    
-    # 11. 모델 평가
-    print("\n[Step 11/11] 최적 모델 평가")
-    print("-" * 70)
-    y_pred, y_prob = evaluate_model(best_rf, X_test, y_test)
-    
+    outputs = {'results_df': results_df, 'trained_models': trained_models,
+               'evaluation': evaluation}
+    if CV_LEADERBOARD:
+        from src.leaderboard import cross_validate_models
+        outputs['leaderboard'], _ = cross_validate_models(ctx['X_train'],
+                                                          ctx['y_train'])
+    return outputs
+
+def step_tune(ctx):
+    """10. Random Forest 최적화"""
+    from src.model_training import optimize_random_forest, compare_search_methods
+    outputs = {'best_rf': optimize_random_forest(ctx['X_train'], ctx['y_train'])}
+    if SEARCH_COMPARE_BASELINE:
+        outputs['search_report'] = compare_search_methods(
+            ctx['X_train'], ctx['y_train'], ctx['X_test'], ctx['y_test'])
+    return outputs
+
+def step_calibrate(ctx):
+    """11. 확률 보정 및 노출 임계값 최적화"""
+    from src.calibration import calibrate_and_optimize
+    calibrated_model, decision, test_decisions = calibrate_and_optimize(
+        ctx['best_rf'], ctx['X_train'], ctx['y_train'],
+        ctx['X_test'], ctx['y_test'])
+    return {'calibrated_model': calibrated_model, 'decision': decision,
+            'test_decisions': test_decisions}
+
+def step_evaluate(ctx):
+    """12. 모델 평가"""
+    from src.evaluation import (evaluate_model, plot_feature_importance,
+                                plot_roc_curve, compare_models,
+                                generate_business_insights)
+    from src.feature_engineering import FeaturePipeline
+    from src.scoring import save_model_bundle
+    y_pred, y_prob = evaluate_model(ctx['calibrated_model'], ctx['X_test'],
+                                    ctx['y_test'],
+                                    threshold=ctx['decision']['threshold'],
+                                    serve_nothing=ctx['decision']['serve_nothing'])
+
     # Feature Importance
     print("\n" + "="*70)
     print("Feature Importance 분석")
     print("="*70)
-    feature_importance = plot_feature_importance(best_rf, feature_cols)
-    
+    feature_importance = plot_feature_importance(ctx['best_rf'], ctx['feature_cols'])
+
     # ROC Curve
     print("\n" + "="*70)
     print("ROC Curve 생성")
     print("="*70)
-    plot_roc_curve(trained_models, X_test, X_test_scaled, y_test)
-    
+    plot_roc_curve(ctx['trained_models'], ctx['X_test'], ctx['X_test_scaled'],
+                   ctx['y_test'], evaluation=ctx['evaluation'])
+    model_comparison = compare_models(ctx['evaluation'])
+
     # 비즈니스 인사이트
-    generate_business_insights(df, segment_a_ctr, segment_b_ctr, overall_ctr)
-    
+    generate_business_insights(ctx['df'], ctx['segment_a_ctr'],
+                               ctx['segment_b_ctr'], ctx['overall_ctr'],
+                               decision=ctx['decision'],
+                               test_decisions=ctx['test_decisions'])
+
+    # 스코어링용 모델 번들 저장
+    feature_pipeline = FeaturePipeline(ctx['feature_cols']).fit(ctx['df'])
+    save_model_bundle(ctx['calibrated_model'], ctx['scaler'], feature_pipeline,
+                      threshold=ctx['decision']['threshold'],
+                      serve_nothing=ctx['decision']['serve_nothing'],
+                      metadata={'model': f'Random Forest ({CALIBRATION_METHOD} 보정)',
+                                'params': ctx['best_rf'].get_params(),
+                                'n_train': len(ctx['X_train']),
+                                'decision': ctx['decision']})
+
+    return {'feature_importance': feature_importance,
+            'model_comparison': model_comparison}
+
+def build_pipeline(store=None):
+    """main()의 12단계를 의존 관계와 캐시 설정을 가진 파이프라인으로 구성"""
+    features_src = os.path.join(SRC_DIR, 'feature_engineering.py')
+    training_src = os.path.join(SRC_DIR, 'model_training.py')
+    metrics_src = os.path.join(SRC_DIR, 'metrics.py')
+    leaderboard_src = os.path.join(SRC_DIR, 'leaderboard.py')
+    calibration_src = os.path.join(SRC_DIR, 'calibration.py')
+    stages = [
+        Stage(1, 'load', '데이터 로드', step_load),
+        Stage(2, 'target', '타겟 변수 분포 분석', step_target, deps=(1,)),
+        Stage(3, 'numeric', '수치형 변수 분석', step_numeric, deps=(1,)),
+        Stage(4, 'segment', '세그먼트 분석', step_segment, deps=(1,)),
+        Stage(5, 'correlation', '상관관계 분석', step_correlation, deps=(1,)),
+        Stage(6, 'features', 'Feature Engineering', step_features, deps=(1,),
+              cache=True, config_keys=('HASHED_FEATURES', 'HASH_N_FEATURES'),
+              sources=(features_src,)),
+        Stage(7, 'segments', '타겟 세그먼트 정의', step_target_segments, deps=(6,)),
+        Stage(8, 'split', '데이터 전처리 및 분할', step_split, deps=(6,),
+              cache=True, config_keys=('RANDOM_STATE', 'TEST_SIZE'),
+              sources=(training_src,)),
+        Stage(9, 'train', '모델 학습 및 비교', step_train, deps=(8,),
+              cache=True, config_keys=('RANDOM_STATE', 'PARALLEL_TRAINING',
+                                       'N_JOBS', 'CV_LEADERBOARD', 'CV_FOLDS',
+                                       'HASHED_FEATURE_MODELS', 'SCALED_MODELS'),
+              sources=(training_src, metrics_src, leaderboard_src)),
+        Stage(10, 'tune', 'Random Forest 하이퍼파라미터 최적화', step_tune,
+              deps=(8,), cache=True,
+              config_keys=('RANDOM_STATE', 'N_JOBS', 'PARAM_GRID', 'CV_FOLDS',
+                           'SEARCH_METHOD', 'SEARCH_MAX_FITS',
+                           'SEARCH_TIME_BUDGET', 'SEARCH_HALVING_FACTOR',
+                           'SEARCH_COMPARE_BASELINE'),
+              sources=(training_src,)),
+        Stage(11, 'calibrate', '확률 보정 및 노출 임계값 최적화', step_calibrate,
+              deps=(8, 10), cache=True,
+              config_keys=('RANDOM_STATE', 'N_JOBS', 'CV_FOLDS', 'CALIBRATION_METHOD',
+                           'COST_PER_IMPRESSION', 'VALUE_PER_CLICK',
+                           'BUDGET_RATIO'),
+              sources=(calibration_src, metrics_src)),
+        Stage(12, 'evaluate', '최적 모델 평가', step_evaluate,
+              deps=(6, 7, 8, 9, 10, 11)),
+    ]
+    return Pipeline(stages, store)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='광고 클릭 분석 및 예측 모델 실행')
+    parser.add_argument('--from-step', dest='from_step', default=None,
+                        help='이 단계(번호 또는 이름)부터 실행')
+    parser.add_argument('--only', default=None,
+                        help='지정한 단계만 실행 (쉼표 구분, 예: 10,12 또는 tune)')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true',
+                        help='캐시된 아티팩트를 무시하고 모든 단계를 다시 계산')
+    parser.add_argument('--list', dest='list_steps', action='store_true',
+                        help='단계 목록 출력')
+    parser.add_argument('--cprofile', action='store_true', default=PROFILE_CPROFILE,
+                        help='단계별 cProfile 통계를 실행 리포트에 포함')
+    parser.add_argument('--no-report', dest='report', action='store_false',
+                        default=RUN_REPORT, help='실행 리포트(JSON)를 저장하지 않음')
+    return parser.parse_args(argv)
+
+def print_steps(pipeline):
+    for stage in pipeline.stages:
+        deps = ','.join(str(d) for d in stage.deps) or '-'
+        cached = '캐시' if stage.cache else ''
+        print(f"{stage.number:2d}. {stage.name:12s} (의존: {deps}) {cached}")
+
+def run_pipeline(only=None, from_step=None, no_cache=False,
+                 cprofile=PROFILE_CPROFILE, report=RUN_REPORT):
+    """
+    파이프라인을 실행하고 결과 요약, 실행 계측, 출력 파일 목록을 출력
+
+    main.py와 cli.py의 하위 명령이 함께 쓴다.
+
+    Returns:
+    --------
+    ctx : dict
+        단계 출력을 모은 컨텍스트
+    """
+    pipeline = build_pipeline(ArtifactStore(enabled=not no_cache))
+
+    print("="*70)
+    print("광고 클릭 분석 및 예측 모델 실행")
+    print("="*70)
+
+    # 단계/모델 학습별 시간과 메모리를 기록해 output/reports/에 저장
+    with profile_run(cprofile=cprofile, save=report) as profiler:
+        if PARALLEL_PLOTS:
+            # 그래프는 모아 두었다가 파이프라인이 끝난 뒤 병렬로 렌더링
+            with collect_plots():
+                ctx = pipeline.run(only=only, from_step=from_step)
+        else:
+            ctx = pipeline.run(only=only, from_step=from_step)
+
     # 최종 요약
     print("\n" + "="*70)
     print("분석 완료!")
     print("="*70)
-    
-    best_model_name = results_df.iloc[0]['Model']
-    best_roc_auc = results_df.iloc[0]['ROC-AUC']
-    best_accuracy = results_df.iloc[0]['Accuracy']
-    
-    print(f"\n[최종 결과 요약]")
-    print(f"  - 전체 데이터: {df.shape[0]:,}개")
-    print(f"  - 전체 클릭률: {overall_ctr:.2%}")
-    print(f"  - 최고 성능 모델: {best_model_name}")
-    print(f"  - 모델 정확도: {best_accuracy:.2%}")
-    print(f"  - ROC-AUC: {best_roc_auc:.4f}")
-    
+
+    if 'results_df' in ctx:
+        results_df = ctx['results_df']
+        best_model_name = results_df.iloc[0]['Model']
+        best_roc_auc = results_df.iloc[0]['ROC-AUC']
+        best_accuracy = results_df.iloc[0]['Accuracy']
+
+        print(f"\n[최종 결과 요약]")
+        print(f"  - 전체 데이터: {ctx['df'].shape[0]:,}개")
+        print(f"  - 전체 클릭률: {ctx['df']['Clicked on Ad'].mean():.2%}")
+        print(f"  - 최고 성능 모델: {best_model_name}")
+        print(f"  - 모델 정확도: {best_accuracy:.2%}")
+        print(f"  - ROC-AUC: {best_roc_auc:.4f}")
+
+    print(f"\n[실행 계측] 전체 {profiler.wall_seconds:.1f}초")
+    print(profiler.summary())
+    if profiler.report_path:
+        print(f"  실행 리포트: {profiler.report_path}")
+
     print(f"\n[출력 파일]")
     output_path = os.path.abspath('output/plots/')
     print(f"  저장 위치: {output_path}")
-    
+
     try:
         plot_files = sorted(os.listdir('output/plots/'))
         if plot_files:
@@ -149,10 +321,22 @@ def main():
             print("  생성된 그래프가 없습니다.")
     except FileNotFoundError:
         print("  output/plots 폴더를 찾을 수 없습니다.")
-    
+
     print("\n" + "="*70)
     print("프로그램 종료")
     print("="*70)
+    return ctx
+
+def main(argv=None):
+    """메인 실행 함수"""
+    args = parse_args(argv)
+    if args.list_steps:
+        print_steps(build_pipeline())
+        return
+
+    only = args.only.split(',') if args.only else None
+    run_pipeline(only=only, from_step=args.from_step, no_cache=args.no_cache,
+                 cprofile=args.cprofile, report=args.report)
 
 if __name__ == "__main__":
     try:
@@ -161,4 +345,4 @@ if __name__ == "__main__":
         print(f"\n[오류 발생] {str(e)}")
         import traceback
         traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -2,4 +2,13 @@
 """
 Advertisement Click 분석 및 예측 모델 패키지
 """
-__version__ = '1.0.0'
\ No newline at end of file
+__version__ = '1.0.0'
+
+import os
+import sys
+
+# src 모듈들이 `from config import ...`로 설정을 읽을 수 있도록 프로젝트 루트(Ad)를
+# 경로에 한 번만 추가한다 (python -m src.xxx, joblib 워커의 unpickle 포함)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
\ No newline at end of file
@@ -0,0 +1,209 @@
+# src/calibration.py
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+from src.metrics import ScoreCurves, calibration_curve
+from config import (RANDOM_STATE, CV_FOLDS, N_JOBS, CALIBRATION_METHOD,
+                    COST_PER_IMPRESSION, VALUE_PER_CLICK, BUDGET_RATIO)
+
+# isotonic: 단조 계단 함수, sigmoid: Platt scaling
+CALIBRATION_METHODS = ['isotonic', 'sigmoid']
+# test 노출 전략 비교표의 행 (strategy 인덱스 → 표시 이름)
+DECISION_STRATEGIES = {
+    'baseline': '기존 (보정 전 확률 > 0.5)',
+    'optimized': '최적 임계값 (보정 후)',
+    'serve_all': '전체 노출',
+}
+
+def _fit_calibrator(raw_prob, y, method):
+    """보정 전 확률 → 보정기 (isotonic: 단조 회귀, sigmoid: 1차원 로지스틱 회귀)"""
+    if method == 'isotonic':
+        from sklearn.isotonic import IsotonicRegression
+        return IsotonicRegression(out_of_bounds='clip').fit(raw_prob, y)
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(C=np.inf).fit(raw_prob.reshape(-1, 1), y)
+
+def _apply_calibrator(calibrator, raw_prob):
+    """보정기로 보정 전 확률 변환 (0~1)"""
+    if hasattr(calibrator, 'predict_proba'):
+        return calibrator.predict_proba(raw_prob.reshape(-1, 1))[:, 1]
+    return np.clip(calibrator.predict(raw_prob), 0, 1)
+
+class CalibratedModel:
+    """
+    보정된 이진 분류 모델 (기본 모델 + 확률 보정기)
+
+    predict_proba/predict는 sklearn 분류기와 같은 형식이므로 평가와
+    스코어링 번들에서 그대로 쓴다. predict는 보정된 확률 > 0.5이면 양성.
+    """
+
+    def __init__(self, estimator, calibrator):
+        self.estimator = estimator
+        self.calibrator = calibrator
+        self.classes_ = estimator.classes_
+
+    def predict_proba(self, X):
+        prob = _apply_calibrator(self.calibrator, self.estimator.predict_proba(X)[:, 1])
+        return np.column_stack([1 - prob, prob])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+def calibrate_model(model, X_train, y_train, method=CALIBRATION_METHOD,
+                    cv=CV_FOLDS, n_jobs=N_JOBS):
+    """
+    확률 보정 (out-of-fold 예측으로 보정기 학습)
+
+    fold마다 그 fold를 학습하지 않은 모델의 확률(out-of-fold)을 한 번만
+    계산해 보정기를 학습하고, 기본 모델은 전체 train으로 다시 학습한다.
+    임계값 탐색용 확률은 같은 fold 분할로 보정기도 교차 적합해, 각 행의
+    값이 그 행을 학습하지 않은 모델과 그 행을 보지 않은 보정기에서
+    나오게 한다.
+
+    Returns:
+    --------
+    calibrated : CalibratedModel
+    oof_prob : ndarray
+        train 행별 교차 적합된 보정 확률 (보정기가 보지 않은 예측)
+    """
+    if method not in CALIBRATION_METHODS:
+        raise ValueError(f"method는 {CALIBRATION_METHODS} 중 하나여야 합니다: {method}")
+    skf = StratifiedKFold(n_splits=cv, shuffle=True, random_state=RANDOM_STATE)
+    y = np.asarray(y_train)
+
+    oof_raw = cross_val_predict(clone(model), X_train, y_train, cv=skf,
+                                method='predict_proba', n_jobs=n_jobs)[:, 1]
+    oof_prob = np.empty(len(y), dtype=np.float64)
+    for fit_idx, held_idx in skf.split(X_train, y):
+        calibrator = _fit_calibrator(oof_raw[fit_idx], y[fit_idx], method)
+        oof_prob[held_idx] = _apply_calibrator(calibrator, oof_raw[held_idx])
+
+    estimator = clone(model).fit(X_train, y_train)
+    calibrated = CalibratedModel(estimator, _fit_calibrator(oof_raw, y, method))
+    return calibrated, oof_prob
+
+def optimize_threshold(y_true, y_prob, cost_per_impression=COST_PER_IMPRESSION,
+                       value_per_click=VALUE_PER_CLICK, budget_ratio=BUDGET_RATIO):
+    """
+    예산 제약 하 기대 이익 최대 노출 임계값
+
+    확률 >= 임계값인 대상에게만 광고를 노출한다고 할 때, 모든 후보
+    임계값(서로 다른 확률값)의 노출 수/클릭 수를 한 번 정렬한 누적합으로
+    동시에 계산하고, 노출 비율이 budget_ratio 이하인 임계값 중
+    클릭 가치 - 노출 비용이 가장 큰 것을 고른다. 노출하지 않는 경우(이익 0)도
+    후보에 포함하며, 이익이 나는 임계값이 없으면 threshold=None,
+    serve_nothing=True인 '노출 안 함' 결정을 반환한다.
+
+    Returns:
+    --------
+    decision : dict
+        threshold, serve_nothing, impressions, clicks, cost, profit, ctr,
+        clicks_per_cost, served_ratio
+    table : DataFrame
+        후보 임계값별 노출/클릭/비용/이익
+    """
+    curves = ScoreCurves(y_true, y_prob)
+    impressions = (curves.tps + curves.fps).astype(np.float64)
+    clicks = curves.tps.astype(np.float64)
+    cost = impressions * cost_per_impression
+    profit = clicks * value_per_click - cost
+    feasible = impressions <= budget_ratio * curves.n
+
+    table = pd.DataFrame({'threshold': curves.thresholds, 'impressions': impressions,
+                          'clicks': clicks, 'cost': cost, 'profit': profit,
+                          'feasible': feasible})
+
+    candidates = np.where(feasible, profit, -np.inf)
+    best = int(np.argmax(candidates)) if len(candidates) else 0
+    if not len(candidates) or candidates[best] <= 0:
+        # 이익이 나는 임계값이 없으면 노출하지 않는다
+        return _decision(None, 0, 0, cost_per_impression, value_per_click,
+                         curves.n), table
+    return _decision(curves.thresholds[best], impressions[best], clicks[best],
+                     cost_per_impression, value_per_click, curves.n), table
+
+def _decision(threshold, impressions, clicks, cost_per_impression,
+              value_per_click, n):
+    cost = impressions * cost_per_impression
+    return {
+        'threshold': None if threshold is None else float(threshold),
+        'serve_nothing': threshold is None,
+        'impressions': int(impressions),
+        'clicks': int(clicks),
+        'cost': float(cost),
+        'profit': float(clicks * value_per_click - cost),
+        'ctr': clicks / impressions if impressions else 0.0,
+        'clicks_per_cost': clicks / cost if cost else 0.0,
+        'served_ratio': impressions / n if n else 0.0,
+        'cost_per_impression': cost_per_impression,
+        'value_per_click': value_per_click,
+    }
+
+def apply_threshold(y_true, y_prob, threshold,
+                    cost_per_impression=COST_PER_IMPRESSION,
+                    value_per_click=VALUE_PER_CLICK):
+    """정해진 임계값(확률 >= threshold 노출, None이면 노출 안 함)의 노출/클릭/이익"""
+    if threshold is None:
+        return _decision(None, 0, 0, cost_per_impression, value_per_click,
+                         len(y_true))
+    tp, fp, _, _ = ScoreCurves(y_true, y_prob).counts_at(threshold, inclusive=True)
+    return _decision(threshold, tp + fp, tp, cost_per_impression,
+                     value_per_click, len(y_true))
+
+def calibration_report(y_true, probabilities):
+    """{이름: 확률} 별 Brier score와 ECE 비교표"""
+    rows = []
+    for name, y_prob in probabilities.items():
+        curve = calibration_curve(y_true, y_prob)
+        rows.append({'Model': name, 'Brier': curve['brier'], 'ECE': curve['ece']})
+    return pd.DataFrame(rows)
+
+def calibrate_and_optimize(model, X_train, y_train, X_test, y_test,
+                           method=CALIBRATION_METHOD):
+    """
+    보정 → train out-of-fold 확률로 임계값 선택 → test에서 검증
+
+    Returns:
+    --------
+    calibrated : CalibratedModel
+    decision : dict
+        optimize_threshold 결과 (train 교차 적합 보정 확률 기준)
+    test_decisions : DataFrame
+        test에서 기존 0.5 기준 / 최적 임계값 / 전체 노출 비교
+        (인덱스 strategy: DECISION_STRATEGIES의 키)
+    """
+    print(f"보정 방법: {method} ({CV_FOLDS}-fold out-of-fold 예측으로 보정기 학습)")
+    calibrated, oof_prob = calibrate_model(model, X_train, y_train, method)
+
+    raw_prob = model.predict_proba(X_test)[:, 1]
+    cal_prob = calibrated.predict_proba(X_test)[:, 1]
+    report = calibration_report(y_test, {'보정 전': raw_prob,
+                                         f'보정 후 ({method})': cal_prob})
+    print("\n확률 보정 (test):")
+    print(report.to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+
+    decision, _ = optimize_threshold(y_train, oof_prob)
+    print(f"\n노출 비용 {COST_PER_IMPRESSION} / 클릭 가치 {VALUE_PER_CLICK} / "
+          f"최대 노출 비율 {BUDGET_RATIO:.0%}")
+    if decision['serve_nothing']:
+        print("최적 결정: 노출 안 함 (이익이 나는 임계값 없음)")
+    else:
+        print(f"최적 임계값: {decision['threshold']:.4f} "
+              f"(train out-of-fold 노출 {decision['served_ratio']:.1%}, "
+              f"CTR {decision['ctr']:.1%})")
+
+    rows = {}
+    for strategy, y_prob, threshold in [('baseline', raw_prob, np.nextafter(0.5, 1)),
+                                        ('optimized', cal_prob, decision['threshold']),
+                                        ('serve_all', cal_prob, -np.inf)]:
+        result = apply_threshold(y_test, y_prob, threshold)
+        rows[strategy] = {'전략': DECISION_STRATEGIES[strategy],
+                          '노출 비율': result['served_ratio'],
+                          '클릭 수': result['clicks'], 'CTR': result['ctr'],
+                          '비용': result['cost'], '이익': result['profit'],
+                          '비용당 클릭': result['clicks_per_cost']}
+    test_decisions = pd.DataFrame.from_dict(rows, orient='index').rename_axis('strategy')
+    print("\n노출 전략 비교 (test):")
+    print(test_decisions.to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+    return calibrated, decision, test_decisions
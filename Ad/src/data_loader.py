@@ -1,31 +1,295 @@
-import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import hashlib
+import json
 import pandas as pd
 import numpy as np
-from config import DATA_PATH
+from config import DATA_PATH, CHUNK_SIZE, CACHE_DIR, USE_DATA_CACHE
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow가 없으면 CSV를 직접 읽는다
+    pa = None
+
+# advertising.csv 컬럼별 타입 스키마 (스트리밍 로딩용)
+DTYPE_SCHEMA = {
+    'Daily Time Spent on Site': 'float32',
+    'Age': 'float32',
+    'Area Income': 'float32',
+    'Daily Internet Usage': 'float32',
+    'Ad Topic Line': 'category',
+    'City': 'category',
+    'Male': 'int8',
+    'Country': 'category',
+    'Timestamp': 'object',
+    'Clicked on Ad': 'int8'
+}
+
+# pd.read_csv가 추론하는 컬럼 타입 (Arrow 캐시 저장 타입, 값과 타입이 CSV 로드와 같다)
+CSV_SCHEMA = {
+    'Daily Time Spent on Site': 'float64',
+    'Age': 'int64',
+    'Area Income': 'float64',
+    'Daily Internet Usage': 'float64',
+    'Ad Topic Line': 'object',
+    'City': 'object',
+    'Male': 'int64',
+    'Country': 'object',
+    'Timestamp': 'object',
+    'Clicked on Ad': 'int64'
+}
+
+# 캐시 파일 형식 버전 (저장 스키마가 바뀌면 올린다)
+CACHE_FORMAT = 2
+
+def load_data(file_path=DATA_PATH, chunksize=None, columns=None,
+              use_cache=USE_DATA_CACHE, typed=False):
+    """
+    데이터 로드
+
+    chunksize를 지정하면 전체 파일을 메모리에 올리지 않고
+    DTYPE_SCHEMA가 적용된 청크 이터레이터를 반환한다.
+    use_cache가 True이면 CACHE_DIR의 Arrow(Feather) 캐시를 메모리 맵으로
+    열고 columns에 지정한 컬럼만 읽는다. 캐시는 CSV_SCHEMA(pd.read_csv와
+    같은 타입)로 저장하므로 결과는 pd.read_csv와 같고, 원본 CSV의 mtime과
+    해시가 바뀌면 자동으로 다시 만들어진다.
+    typed=True이면 DTYPE_SCHEMA(float32/int8/category)로 변환해 반환한다.
+    """
+    if chunksize is not None:
+        if not os.path.exists(file_path):
+            print(f"파일을 찾을 수 없음: {file_path}")
+            raise FileNotFoundError(file_path)
+        print(f"스트리밍 로드: {file_path} (청크 크기: {chunksize:,}행)")
+        return iter_data_chunks(file_path, chunksize, usecols=columns)
 
-def load_data(file_path=DATA_PATH):
     try:
-        df = pd.read_csv(file_path)
-        print(f"데이터 로드 성공: {df.shape}")
-        return df
+        df = None
+        if use_cache and pa is not None:
+            try:
+                cache_path = build_data_cache(file_path)
+            except (ValueError, pa.ArrowException) as e:
+                # CSV_SCHEMA와 맞지 않는 파일(예: 정수 컬럼의 결측치)은 CSV를 직접 읽는다
+                print(f"Arrow 캐시를 만들 수 없음 ({e}), CSV를 직접 읽습니다.")
+            else:
+                df = read_data_cache(cache_path, columns)
+                print(f"데이터 로드 성공 (캐시): {df.shape}")
+        if df is None:
+            df = pd.read_csv(file_path, usecols=columns)
+            print(f"데이터 로드 성공: {df.shape}")
     except FileNotFoundError:
         print(f"파일을 찾을 수 없음: {file_path}")
         raise
+    return apply_dtype_schema(df) if typed else df
+
+def apply_dtype_schema(df):
+    """DTYPE_SCHEMA 타입(float32/int8/category)으로 변환한 DataFrame"""
+    return df.astype({col: t for col, t in DTYPE_SCHEMA.items()
+                      if col in df.columns})
+
+def iter_data_chunks(file_path=DATA_PATH, chunksize=CHUNK_SIZE, usecols=None,
+                     categorical=True, schema=DTYPE_SCHEMA):
+    """타입 스키마를 적용해 CSV를 청크 단위로 읽는 제너레이터"""
+    dtype = {col: t for col, t in schema.items()
+             if usecols is None or col in usecols}
+    if not categorical:
+        dtype = {col: 'object' if t == 'category' else t
+                 for col, t in dtype.items()}
+    with pd.read_csv(file_path, dtype=dtype, usecols=usecols,
+                     chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+def _file_sha256(file_path, block_size=1 << 20):
+    """원본 파일의 SHA-256 (1MB 블록 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _arrow_schema():
+    """CSV_SCHEMA에 대응하는 Arrow 스키마 (문자열 컬럼은 string)"""
+    arrow_types = {'float64': pa.float64(), 'int64': pa.int64()}
+    return pa.schema([(col, arrow_types.get(t, pa.string()))
+                      for col, t in CSV_SCHEMA.items()])
+
+def _cache_prefix(file_path):
+    """캐시/매니페스트 파일 이름 접두사 (파일 이름 + 절대 경로 해시)"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    path_hash = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()
+    return f"{stem}.{path_hash[:8]}"
+
+def build_data_cache(file_path=DATA_PATH, cache_dir=CACHE_DIR):
+    """
+    CSV를 타입이 지정된 Arrow(Feather) 캐시로 변환
+
+    캐시 파일은 원본 절대 경로의 해시와 내용의 SHA-256으로 이름을 붙이고,
+    manifest에 원본의 mtime/크기를 기록한다. mtime과 크기가 그대로면 해시
+    계산 없이 기존 캐시를 사용하고, 바뀌었으면 해시를 다시 계산해 내용이
+    달라진 경우에만 재변환한다. 이름이 같은 다른 디렉터리의 CSV는 경로
+    해시가 달라 서로의 캐시를 지우지 않는다.
+
+    Returns:
+    --------
+    cache_path : str
+        캐시 파일 경로
+    """
+    stat = os.stat(file_path)
+    prefix = _cache_prefix(file_path)
+    manifest_path = os.path.join(cache_dir, f"{prefix}.manifest.json")
+
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    cache_path = manifest.get('cache_path')
+    if (manifest.get('format') == CACHE_FORMAT
+            and manifest.get('source') == os.path.abspath(file_path)
+            and manifest.get('mtime_ns') == stat.st_mtime_ns
+            and manifest.get('size') == stat.st_size
+            and cache_path and os.path.exists(cache_path)):
+        return cache_path
+
+    sha256 = _file_sha256(file_path)
+    cache_path = os.path.join(
+        cache_dir, f"{prefix}.{sha256[:16]}.v{CACHE_FORMAT}.arrow")
+
+    if not os.path.exists(cache_path):
+        print(f"Arrow 캐시 생성: {cache_path}")
+        schema = _arrow_schema()
+        tmp_path = cache_path + '.tmp'
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, schema) as writer:
+                    for chunk in iter_data_chunks(file_path, schema=CSV_SCHEMA):
+                        writer.write_table(pa.Table.from_pandas(
+                            chunk, schema=schema, preserve_index=False))
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # 같은 원본(같은 절대 경로)에서 만든 이전 캐시 정리
+        for name in os.listdir(cache_dir):
+            old_path = os.path.join(cache_dir, name)
+            if (name.startswith(prefix + '.') and name.endswith('.arrow')
+                    and old_path != cache_path):
+                os.remove(old_path)
+
+    manifest = {
+        'format': CACHE_FORMAT,
+        'source': os.path.abspath(file_path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': sha256,
+        'cache_path': cache_path
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    return cache_path
+
+def read_data_cache(cache_path, columns=None):
+    """Arrow 캐시를 메모리 맵으로 열어 필요한 컬럼만 DataFrame으로 변환"""
+    table = feather.read_table(cache_path, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+def _merge_moments(acc, chunk_stats):
+    """청크별 count/mean/M2/min/max를 병렬 분산 공식(Chan)으로 병합"""
+    if acc is None:
+        return chunk_stats
+    n_a, n_b = acc['count'], chunk_stats['count']
+    n = n_a + n_b
+    delta = chunk_stats['mean'] - acc['mean']
+    safe_n = n.where(n > 0, 1)
+    return {
+        'count': n,
+        'mean': acc['mean'] + delta * n_b / safe_n,
+        'M2': acc['M2'] + chunk_stats['M2'] + delta ** 2 * n_a * n_b / safe_n,
+        'min': np.fmin(acc['min'], chunk_stats['min']),
+        'max': np.fmax(acc['max'], chunk_stats['max'])
+    }
+
+def _chunk_moments(chunk):
+    """청크 하나의 수치형 컬럼 통계량 (float64로 누적)"""
+    numeric = chunk.select_dtypes(include='number').astype('float64')
+    count = numeric.count()
+    mean = numeric.mean().fillna(0.0)
+    return {
+        'count': count,
+        'mean': mean,
+        'M2': ((numeric - mean) ** 2).sum(),
+        'min': numeric.min(),
+        'max': numeric.max()
+    }
+
+def _streaming_info(chunks):
+    """청크 이터레이터를 한 번 순회하며 get_data_info 통계를 누적"""
+    n_rows = 0
+    missing = 0
+    columns = None
+    class_counts = {}
+    moments = None
+
+    for chunk in chunks:
+        if columns is None:
+            columns = chunk.columns.tolist()
+        n_rows += len(chunk)
+        missing += int(chunk.isnull().sum().sum())
+        for label, cnt in chunk['Clicked on Ad'].value_counts().items():
+            class_counts[int(label)] = class_counts.get(int(label), 0) + int(cnt)
+        moments = _merge_moments(moments, _chunk_moments(chunk))
+
+    if columns is None:
+        raise ValueError("읽을 데이터가 없습니다.")
+
+    count = moments['count']
+    std = np.sqrt(moments['M2'] / (count - 1).where(count > 1))
+    describe = pd.DataFrame({
+        'count': count,
+        'mean': moments['mean'],
+        'std': std,
+        'min': moments['min'],
+        'max': moments['max']
+    }).T
+
+    clicks = class_counts.get(1, 0)
+    ctr = clicks / n_rows if n_rows else float('nan')
+    class_distribution = dict(sorted(class_counts.items(),
+                                     key=lambda item: item[1], reverse=True))
+    return (n_rows, len(columns)), missing, ctr, class_distribution, columns, describe
 
 def get_data_info(df):
-    print(f"데이터 크기: {df.shape}")
-    print(f"결측치: {df.isnull().sum().sum()}개")
-    print(f"전체 클릭률(CTR): {df['Clicked on Ad'].mean():.2%}")
-    print(f"클래스 분포: {df['Clicked on Ad'].value_counts().to_dict()}")
-    print(f"\n컬럼: {df.columns.tolist()}")
-    print(f"\n기술 통계량:\n{df.describe()}")
-    
+    """
+    데이터 기본 정보 출력
+
+    DataFrame 대신 load_data(chunksize=...)가 반환한 청크 이터레이터를
+    넘기면 청크 단위로 통계를 누적하므로 최대 메모리가 청크 크기로 제한된다.
+    """
+    if isinstance(df, pd.DataFrame):
+        shape = df.shape
+        missing = df.isnull().sum().sum()
+        ctr = df['Clicked on Ad'].mean()
+        class_distribution = df['Clicked on Ad'].value_counts().to_dict()
+        columns = df.columns.tolist()
+        describe = df.describe()
+    else:
+        shape, missing, ctr, class_distribution, columns, describe = \
+            _streaming_info(df)
+
+    print(f"데이터 크기: {shape}")
+    print(f"결측치: {missing}개")
+    print(f"전체 클릭률(CTR): {ctr:.2%}")
+    print(f"클래스 분포: {class_distribution}")
+    print(f"\n컬럼: {columns}")
+    print(f"\n기술 통계량:\n{describe}")
+
     return {
-        'shape': df.shape,
-        'missing_values': df.isnull().sum().sum(),
-        'ctr': df['Clicked on Ad'].mean(),
-        'class_distribution': df['Clicked on Ad'].value_counts().to_dict()
-    }
\ No newline at end of file
+        'shape': shape,
+        'missing_values': missing,
+        'ctr': ctr,
+        'class_distribution': class_distribution
+    }
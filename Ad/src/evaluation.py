@@ -1,29 +1,16 @@
 # src/evaluation.py
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.metrics import (classification_report, confusion_matrix, 
-                             roc_auc_score, roc_curve, precision_recall_curve)
-from config import PLOTS_DIR, SHOW_PLOTS, SAVE_PLOTS
+                             roc_auc_score)
+from src.rendering import submit, pyplot
+from src.metrics import EvaluationCache
+from config import (BOOTSTRAP_SAMPLES, SCALED_MODELS, SEGMENT_AGE_THRESHOLD, SEGMENT_TIME_THRESHOLD,
+                    SEGMENT_INCOME_THRESHOLD, SEGMENT_INTERNET_THRESHOLD)
 
-def evaluate_model(model, X_test, y_test):
-    """모델 평가"""
-    y_pred = model.predict(X_test)
-    y_prob = model.predict_proba(X_test)[:, 1]
-    
-    print("\n최적 모델 성능:")
-    print(classification_report(y_test, y_pred, 
-                                target_names=['클릭 안함', '클릭함']))
-    print(f"ROC-AUC: {roc_auc_score(y_test, y_prob):.4f}")
-    
-    # Confusion Matrix
-    cm = confusion_matrix(y_test, y_pred)
-    
+def _draw_confusion_matrix(cm):
+    import seaborn as sns
+    plt = pyplot()
     plt.figure(figsize=(8, 6))
     sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
                 xticklabels=['클릭 안함', '클릭함'],
@@ -32,31 +19,37 @@ def evaluate_model(model, X_test, y_test):
     plt.ylabel('실제값')
     plt.xlabel('예측값')
     plt.tight_layout()
-    
-    if SAVE_PLOTS:
-        save_path = os.path.join(PLOTS_DIR, 'confusion_matrix.png')
-        plt.savefig(save_path, dpi=100, bbox_inches='tight')
-        print(f"\n[그래프 저장됨] {save_path}")
-    
-    if SHOW_PLOTS:
-        plt.show()
+
+def evaluate_model(model, X_test, y_test, threshold=None, serve_nothing=False):
+    """
+    모델 평가
+
+    threshold가 있으면 predict(0.5) 대신 확률 >= threshold로 라벨을 정한다.
+    serve_nothing이면 모든 대상을 음성(노출 안 함)으로 정한다.
+    """
+    y_prob = model.predict_proba(X_test)[:, 1]
+    if serve_nothing:
+        y_pred = np.zeros(len(y_prob), dtype=int)
+        print("\n최적 모델 성능 (노출 안 함):")
+    elif threshold is None:
+        y_pred = model.predict(X_test)
+        print("\n최적 모델 성능:")
     else:
-        plt.close()
+        y_pred = (y_prob >= threshold).astype(int)
+        print(f"\n최적 모델 성능 (노출 임계값 {threshold:.4f}):")
+    print(classification_report(y_test, y_pred, 
+                                target_names=['클릭 안함', '클릭함']))
+    print(f"ROC-AUC: {roc_auc_score(y_test, y_prob):.4f}")
+    
+    # Confusion Matrix
+    cm = confusion_matrix(y_test, y_pred)
+    submit('confusion_matrix.png', _draw_confusion_matrix, cm)
     
     return y_pred, y_prob
 
-def plot_feature_importance(model, feature_cols):
-    """Feature Importance 시각화"""
-    feature_importance = pd.DataFrame({
-        'Feature': feature_cols,
-        'Importance': model.feature_importances_
-    }).sort_values('Importance', ascending=False)
-    
-    print("\nFeature Importance (상위 10개):")
-    print(feature_importance.head(10).to_string(index=False))
-    
+def _draw_feature_importance(top_features):
+    plt = pyplot()
     plt.figure(figsize=(10, 8))
-    top_features = feature_importance.head(10)
     plt.barh(top_features['Feature'], top_features['Importance'], 
              color='#8b5cf6', alpha=0.7)
     plt.xlabel('Importance', fontsize=12)
@@ -64,31 +57,27 @@ def plot_feature_importance(model, feature_cols):
               fontsize=14, fontweight='bold')
     plt.gca().invert_yaxis()
     plt.tight_layout()
+
+def plot_feature_importance(model, feature_cols):
+    """Feature Importance 시각화"""
+    feature_importance = pd.DataFrame({
+        'Feature': feature_cols,
+        'Importance': model.feature_importances_
+    }).sort_values('Importance', ascending=False)
     
-    if SAVE_PLOTS:
-        save_path = os.path.join(PLOTS_DIR, 'feature_importance.png')
-        plt.savefig(save_path, dpi=100, bbox_inches='tight')
-        print(f"\n[그래프 저장됨] {save_path}")
+    print("\nFeature Importance (상위 10개):")
+    print(feature_importance.head(10).to_string(index=False))
     
-    if SHOW_PLOTS:
-        plt.show()
-    else:
-        plt.close()
+    submit('feature_importance.png', _draw_feature_importance,
+           feature_importance.head(10))
     
     return feature_importance
 
-def plot_roc_curve(models, X_test, X_test_scaled, y_test):
-    """ROC Curve 비교"""
+def _draw_roc_curves(curves):
+    plt = pyplot()
     plt.figure(figsize=(12, 8))
     
-    for name, model in models.items():
-        if name in ['Logistic Regression', 'SVM', 'KNN', 'Naive Bayes']:
-            y_prob = model.predict_proba(X_test_scaled)[:, 1]
-        else:
-            y_prob = model.predict_proba(X_test)[:, 1]
-        
-        fpr, tpr, _ = roc_curve(y_test, y_prob)
-        roc_auc = roc_auc_score(y_test, y_prob)
+    for name, fpr, tpr, roc_auc in curves:
         plt.plot(fpr, tpr, label=f'{name} (AUC = {roc_auc:.3f})', linewidth=2)
     
     plt.plot([0, 1], [0, 1], 'k--', label='Random Guess', linewidth=2)
@@ -98,49 +87,144 @@ def plot_roc_curve(models, X_test, X_test_scaled, y_test):
     plt.legend(loc='lower right', fontsize=10)
     plt.grid(alpha=0.3)
     plt.tight_layout()
-    
-    if SAVE_PLOTS:
-        save_path = os.path.join(PLOTS_DIR, 'roc_curves.png')
-        plt.savefig(save_path, dpi=100, bbox_inches='tight')
-        print(f"\n[그래프 저장됨] {save_path}")
-    
-    if SHOW_PLOTS:
-        plt.show()
-    else:
-        plt.close()
 
-def generate_business_insights(df, segment_a_ctr, segment_b_ctr, overall_ctr):
-    """비즈니스 인사이트 생성"""
+def plot_roc_curve(models, X_test, X_test_scaled, y_test, evaluation=None):
+    """
+    ROC Curve 비교
+
+    evaluation(train_models의 EvaluationCache)이 있으면 캐시된 확률을
+    쓰고, 없을 때만 모델별 predict_proba를 다시 계산한다.
+    """
+    if evaluation is None:
+        evaluation = EvaluationCache(y_test)
+        for name, model in models.items():
+            X = X_test_scaled if name in SCALED_MODELS else X_test
+            evaluation.add(name, model.predict_proba(X)[:, 1])
+
+    submit('roc_curves.png', _draw_roc_curves, evaluation.roc_curves())
+    return evaluation
+
+def _draw_pr_calibration(payload):
+    plt = pyplot()
+    fig, axes = plt.subplots(1, 2, figsize=(16, 7))
+
+    for name, precision, recall, ap in payload['pr']:
+        axes[0].plot(recall, precision, label=f'{name} (AP = {ap:.3f})', linewidth=2)
+    axes[0].set_xlabel('Recall', fontsize=12)
+    axes[0].set_ylabel('Precision', fontsize=12)
+    axes[0].set_title('Precision-Recall Curve 비교', fontsize=14, fontweight='bold')
+    axes[0].legend(loc='lower left', fontsize=10)
+    axes[0].grid(alpha=0.3)
+
+    axes[1].plot([0, 1], [0, 1], 'k--', label='완벽한 보정', linewidth=2)
+    for name, curve in payload['calibration'].items():
+        axes[1].plot(curve['prob_pred'], curve['prob_true'], marker='o',
+                     label=f"{name} (ECE = {curve['ece']:.3f})", linewidth=2)
+    axes[1].set_xlabel('예측 확률 평균', fontsize=12)
+    axes[1].set_ylabel('실제 클릭 비율', fontsize=12)
+    axes[1].set_title('Calibration Curve 비교', fontsize=14, fontweight='bold')
+    axes[1].legend(loc='upper left', fontsize=10)
+    axes[1].grid(alpha=0.3)
+
+    plt.tight_layout()
+
+def compare_models(evaluation, n_boot=BOOTSTRAP_SAMPLES):
+    """
+    캐시된 확률로 모델 비교표(부트스트랩 신뢰구간 포함)와
+    PR/Calibration 곡선 생성
+    """
+    summary = evaluation.summary(n_boot=n_boot)
+    print(f"\n모델 비교 (test, 부트스트랩 {n_boot}회 95% 신뢰구간):")
+    print(summary.to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+
+    pr = []
+    for name in evaluation.probabilities:
+        curves = evaluation.curves(name)
+        precision, recall, _ = curves.pr_curve()
+        pr.append((name, precision, recall, curves.average_precision()))
+    submit('pr_calibration_curves.png', _draw_pr_calibration,
+           {'pr': pr, 'calibration': evaluation.calibration_curves()})
+    return summary
+
+def generate_business_insights(df, segment_a_ctr, segment_b_ctr, overall_ctr,
+                               decision=None, test_decisions=None):
+    """
+    비즈니스 인사이트 생성
+
+    세그먼트 CTR, 데이터의 관계 방향, 노출 임계값 최적화 결과로 문구와
+    예상 개선 수치를 계산한다.
+    """
+    clicked = df['Clicked on Ad']
+    lift_a = (segment_a_ctr - overall_ctr) / overall_ctr * 100
+    lift_b = (segment_b_ctr - overall_ctr) / overall_ctr * 100
+    low_income = df['Area Income'] < SEGMENT_INCOME_THRESHOLD
+    low_income_ctr = clicked[low_income].mean()
+    other_income_ctr = clicked[~low_income].mean()
+    senior = df['Age'] >= SEGMENT_AGE_THRESHOLD
+    senior_lift = (clicked[senior].mean() - overall_ctr) / overall_ctr * 100
+    time_corr = df['Daily Time Spent on Site'].corr(clicked)
+    usage_corr = df['Daily Internet Usage'].corr(clicked)
+
+    def direction(corr):
+        return '짧을수록 광고 클릭률 증가' if corr < 0 else '길수록 광고 클릭률 증가'
+
+    def more_or_less(value):
+        return '높음' if value >= 0 else '낮음'
+
     print("\n" + "="*70)
     print("비즈니스 인사이트 및 전략 제안")
     print("="*70)
     
     print("\n[1] 주요 발견사항")
     print("-" * 70)
-    print(f"1. 연령: 40세 이상 유저의 클릭률이 평균보다 "
-          f"{(segment_a_ctr - overall_ctr) / overall_ctr * 100:.1f}% 높음")
-    print(f"2. 소득: 저소득층(<4만)의 클릭률이 중고소득층보다 높음")
-    print(f"3. 체류시간: 사이트 체류시간이 짧을수록 광고 클릭률 증가")
-    print(f"4. 인터넷 사용: 일일 인터넷 사용 시간이 적을수록 광고 클릭률 증가")
+    print(f"1. 연령: {SEGMENT_AGE_THRESHOLD}세 이상 유저의 클릭률이 평균보다 "
+          f"{abs(senior_lift):.1f}% {more_or_less(senior_lift)}")
+    print(f"2. 소득: 저소득층(<{SEGMENT_INCOME_THRESHOLD / 10000:g}만)의 클릭률 "
+          f"{low_income_ctr:.1%} vs 그 외 {other_income_ctr:.1%}")
+    print(f"3. 체류시간: 사이트 체류시간이 {direction(time_corr)} (상관계수 {time_corr:.2f})")
+    print(f"4. 인터넷 사용: 일일 인터넷 사용 시간이 {direction(usage_corr)} "
+          f"(상관계수 {usage_corr:.2f})")
     
     print("\n[2] 타겟팅 전략")
     print("-" * 70)
-    print("전략 A: 고연령층 집중 타겟팅")
-    print("  - 대상: 40세 이상 유저")
-    print("  - 예상 개선: 클릭률 약 40-50% 증가")
-    print("  - 실행방안: 광고 노출 빈도 2배 증가, 연령층 맞춤 크리에이티브")
-    
-    print("\n전략 B: 저소득층 맞춤 광고")
-    print("  - 대상: 연소득 4만 달러 미만")
-    print("  - 예상 개선: 클릭률 약 30-40% 증가")
+    print("전략 A: 고연령 · 저체류 집중 타겟팅")
+    print(f"  - 대상: {SEGMENT_AGE_THRESHOLD}세 이상 & 체류시간 {SEGMENT_TIME_THRESHOLD}분 이하")
+    print(f"  - 예상 개선: 클릭률 {segment_a_ctr:.1%} (전체 대비 {lift_a:+.1f}%)")
+    print("  - 실행방안: 광고 노출 빈도 증가, 연령층 맞춤 크리에이티브")
+    
+    print("\n전략 B: 저소득 · 저사용 맞춤 광고")
+    print(f"  - 대상: 연소득 {SEGMENT_INCOME_THRESHOLD:,} 이하 & "
+          f"인터넷 사용 {SEGMENT_INTERNET_THRESHOLD}분 이하")
+    print(f"  - 예상 개선: 클릭률 {segment_b_ctr:.1%} (전체 대비 {lift_b:+.1f}%)")
     print("  - 실행방안: 가격 할인, 실용성 강조 메시지")
+
+    if decision is not None:
+        print("\n전략 C: 모델 확률 기반 노출")
+        if decision['serve_nothing']:
+            print("  - 대상: 없음 (이익이 나는 노출 임계값 없음)")
+        else:
+            print(f"  - 대상: 보정된 클릭 확률 {decision['threshold']:.3f} 이상 "
+                  f"(대상의 {decision['served_ratio']:.1%})")
+        print(f"  - 가정: 노출 비용 {decision['cost_per_impression']} / "
+              f"클릭 가치 {decision['value_per_click']}")
+        if test_decisions is not None:
+            chosen = test_decisions.loc['optimized']
+            serve_all = test_decisions.loc['serve_all']
+            print(f"  - 예상 개선 (test): CTR {chosen['CTR']:.1%} "
+                  f"(전체 노출 {serve_all['CTR']:.1%}), "
+                  f"이익 {chosen['이익']:,.1f} (전체 노출 {serve_all['이익']:,.1f})")
     
     print("\n[3] 실행 권장사항")
     print("-" * 70)
     print("단기 (1-2개월):")
-    print("  1. 40세 이상 유저 대상 광고 노출 빈도 2배 증가")
+    print(f"  1. {SEGMENT_AGE_THRESHOLD}세 이상 유저 대상 광고 노출 빈도 증가")
     print("  2. 저소득층 대상 할인/프로모션 메시지 강화")
-    print("  3. 사이트 초기 방문자 대상 웰컴 광고 캠페인 런칭")
+    if decision is not None and not decision['serve_nothing']:
+        print(f"  3. 스코어링 번들의 임계값({decision['threshold']:.3f})으로 노출 대상 선별")
+    elif decision is not None:
+        print("  3. 노출 비용/클릭 가치 가정 재검토 (현재 가정으로는 노출 이익 없음)")
+    else:
+        print("  3. 사이트 초기 방문자 대상 웰컴 광고 캠페인 런칭")
     
     print("\n중기 (3-6개월):")
     print("  1. 머신러닝 모델 기반 실시간 타겟팅 시스템 구축")
@@ -1,8 +1,20 @@
 # src/feature_engineering.py
+import time
 import pandas as pd
 import numpy as np
+from src.quantile_sketch import KLLSketch
+from config import HASH_N_FEATURES
 
-def create_features(df):
+# 피처 계산에 필요한 원본 컬럼 (FeaturePipeline 입력 블록의 열 순서)
+INPUT_COLUMNS = ['Daily Time Spent on Site', 'Age', 'Area Income',
+                 'Daily Internet Usage', 'Male']
+
+# 해싱 피처 입력: Ad Topic Line은 단어 단위, City/Country는 값 단위로 해싱
+HASHED_TEXT_COLUMNS = ['Ad Topic Line', 'City', 'Country']
+# Timestamp에서 만드는 주기형 시간 피처 (해싱 블록의 마지막 열)
+CYCLIC_TIME_COLUMNS = ['Hour_Sin', 'Hour_Cos', 'Weekday_Sin', 'Weekday_Cos']
+
+def create_features(df, usage_median=None, verbose=True):
     """
     파생 변수 생성
     
@@ -10,15 +22,21 @@ def create_features(df):
     -----------
     df : DataFrame
         원본 데이터프레임
+    usage_median : float, optional
+        High_Usage 기준이 되는 Daily Internet Usage 중앙값.
+        None이면 df에서 계산하며, 스코어링 시에는 학습 때 값을 넘긴다.
+    verbose : bool
+        생성 내역 출력 여부
         
     Returns:
     --------
     df : DataFrame
         파생 변수가 추가된 데이터프레임
     """
-    print("\n" + "="*70)
-    print("Feature Engineering")
-    print("="*70)
+    if verbose:
+        print("\n" + "="*70)
+        print("Feature Engineering")
+        print("="*70)
     
     # 파생 변수 생성
     df['Engagement_Score'] = (df['Daily Time Spent on Site'] + 
@@ -41,13 +59,15 @@ def create_features(df):
     df['Age_Squared'] = df['Age'] ** 2
     df['Is_Senior'] = (df['Age'] >= 50).astype(int)
     df['Is_Low_Income'] = (df['Area Income'] < 40000).astype(int)
-    df['High_Usage'] = (df['Daily Internet Usage'] > 
-                         df['Daily Internet Usage'].median()).astype(int)
+    if usage_median is None:
+        usage_median = df['Daily Internet Usage'].median()
+    df['High_Usage'] = (df['Daily Internet Usage'] > usage_median).astype(int)
     
-    print("\n생성된 파생변수 (9개):")
-    print("1. Engagement_Score | 2. Ad_Affinity_Score | 3. Income_Age_Ratio")
-    print("4. Low_Engagement_High_Age | 5. Time_Income_Interaction | 6. Age_Squared")
-    print("7. Is_Senior | 8. Is_Low_Income | 9. High_Usage")
+    if verbose:
+        print("\n생성된 파생변수 (9개):")
+        print("1. Engagement_Score | 2. Ad_Affinity_Score | 3. Income_Age_Ratio")
+        print("4. Low_Engagement_High_Age | 5. Time_Income_Interaction | 6. Age_Squared")
+        print("7. Is_Senior | 8. Is_Low_Income | 9. High_Usage")
     
     return df
 
@@ -59,4 +79,255 @@ def get_feature_columns():
         'Income_Age_Ratio', 'Low_Engagement_High_Age',
         'Time_Income_Interaction', 'Age_Squared', 'Is_Senior',
         'Is_Low_Income', 'High_Usage'
-    ]
\ No newline at end of file
+    ]
+
+def cyclic_time_features(timestamps):
+    """
+    Timestamp → 하루 중 시각/요일의 sin·cos 피처
+
+    23시와 0시, 일요일과 월요일이 가깝게 표현되도록 각 주기를 원 위의
+    좌표로 바꾼다. 시각은 분 단위까지 반영한다.
+
+    Returns:
+    --------
+    features : ndarray, shape (n, 4)
+        CYCLIC_TIME_COLUMNS 순서의 float64 행렬
+    """
+    ts = pd.to_datetime(pd.Series(timestamps))
+    hour = (ts.dt.hour + ts.dt.minute / 60).to_numpy(dtype=np.float64) / 24
+    weekday = ts.dt.dayofweek.to_numpy(dtype=np.float64) / 7
+    return np.column_stack([np.sin(2 * np.pi * hour), np.cos(2 * np.pi * hour),
+                            np.sin(2 * np.pi * weekday), np.cos(2 * np.pi * weekday)])
+
+class HashedFeatures:
+    """
+    고카디널리티 텍스트/범주 컬럼의 해싱 희소 피처
+
+    Ad Topic Line의 소문자 단어와 City/Country 값을 'column=value' 토큰으로
+    만들어 n_features개 열에 해싱(sklearn FeatureHasher)한다. 어휘 사전을
+    만들지 않으므로 fit이 필요 없고 처음 보는 도시/국가도 그대로 변환되며,
+    열 수가 고정이라 원-핫 인코딩과 달리 카디널리티가 늘어도 폭이 커지지
+    않는다. 행당 0이 아닌 값은 토큰 수(약 6개)뿐이므로 CSR 행렬의 메모리는
+    행 수에만 비례한다. 마지막 4열에 Timestamp의 주기형 시간 피처를 붙인다.
+    """
+
+    def __init__(self, n_features=HASH_N_FEATURES):
+        self.n_features = n_features
+
+    @property
+    def feature_names(self):
+        return [f'hash_{i}' for i in range(self.n_features)] + CYCLIC_TIME_COLUMNS
+
+    @staticmethod
+    def _tokens(df):
+        """행별 토큰 리스트 제너레이터"""
+        rows = df[HASHED_TEXT_COLUMNS].astype(str).itertuples(index=False, name=None)
+        for topic, city, country in rows:
+            tokens = ['topic=' + word for word in topic.lower().split()]
+            tokens.append('city=' + city)
+            tokens.append('country=' + country)
+            yield tokens
+
+    def transform(self, df):
+        """
+        DataFrame → 해싱 + 주기형 시간 피처 CSR 행렬
+
+        Returns:
+        --------
+        X : scipy.sparse.csr_matrix, shape (n, n_features + 4)
+            float32 희소 행렬 (행 순서는 df와 같다)
+        """
+        from scipy import sparse
+        from sklearn.feature_extraction import FeatureHasher
+
+        hasher = FeatureHasher(n_features=self.n_features, input_type='string',
+                               alternate_sign=False, dtype=np.float32)
+        hashed = hasher.transform(self._tokens(df))
+        cyclic = sparse.csr_matrix(cyclic_time_features(df['Timestamp'])
+                                   .astype(np.float32))
+        return sparse.hstack([hashed, cyclic], format='csr')
+
+def stack_sparse(X_scaled, X_hashed):
+    """
+    스케일된 dense 피처 행렬 옆에 해싱 블록을 붙인 CSR 행렬
+
+    dense 피처(열 13개)만 희소 형식으로 바꾸고 해싱 블록은 dense로
+    변환하지 않는다. 선형 모델은 이 행렬을 그대로 학습/예측에 쓴다.
+    """
+    from scipy import sparse
+    return sparse.hstack([sparse.csr_matrix(X_scaled), X_hashed], format='csr',
+                         dtype=np.float64)
+
+class FeaturePipeline:
+    """
+    컴파일된 피처 파이프라인
+
+    High_Usage 기준 중앙값 같은 통계는 fit에서 한 번만 계산하고,
+    transform은 INPUT_COLUMNS 순서의 NumPy 블록을 get_feature_columns()
+    순서의 dtype 행렬로 한 번에 변환한다. 파생 변수는 미리 할당한 출력
+    행렬의 열에 직접 쓰므로 컬럼마다 새 Series를 만들지 않고, 청크 단위로
+    호출해도 학습 때와 같은 기준이 적용된다.
+
+    입력은 float64로 바꿔 create_features와 같은 순서로 계산하므로,
+    load_data()가 반환하는 float64 원본에서는 기본 dtype(float64) 결과가
+    학습 피처(create_features)와 비트 단위로 같다.
+    """
+
+    def __init__(self, feature_cols=None, dtype=np.float64):
+        self.feature_cols = list(feature_cols or get_feature_columns())
+        self.dtype = np.dtype(dtype)
+        self.usage_median_ = None
+
+    def fit(self, df):
+        """학습 데이터에서 피처 통계 계산"""
+        self.usage_median_ = float(df['Daily Internet Usage'].median())
+        return self
+
+    def fit_chunks(self, chunks, sketch_k=None, random_state=0):
+        """
+        청크 이터레이터에서 피처 통계 계산
+
+        sketch_k를 지정하면 Daily Internet Usage를 KLL 분위수 스케치
+        (src.quantile_sketch)로 요약해 메모리를 제한하고 그 중앙값을
+        사용한다. None이면 컬럼 전체를 모아 정확히 계산한다.
+        """
+        if sketch_k is not None:
+            sketch = KLLSketch(sketch_k, seed=random_state)
+            for chunk in chunks:
+                sketch.update(chunk['Daily Internet Usage'])
+            return self.fit_sketch(sketch)
+
+        values = [np.asarray(chunk['Daily Internet Usage'], dtype=np.float64)
+                  for chunk in chunks]
+        self.usage_median_ = float(np.median(np.concatenate(values)))
+        return self
+
+    def fit_sketch(self, usage_sketch):
+        """Daily Internet Usage 분위수 스케치로 피처 통계 설정"""
+        self.usage_median_ = float(usage_sketch.median())
+        return self
+
+    def _compute(self, name, cols, out, mask):
+        """피처 하나를 out(float64 버퍼)에 계산"""
+        t = cols['Daily Time Spent on Site']
+        age = cols['Age']
+        income = cols['Area Income']
+        usage = cols['Daily Internet Usage']
+
+        if name in cols:
+            np.copyto(out, cols[name])
+        elif name == 'Engagement_Score':
+            np.add(t, usage, out=out)
+            out /= 2
+        elif name == 'Ad_Affinity_Score':
+            np.multiply(age, 0.3, out=out)
+            out -= t * 0.4
+            out -= income / 1000 * 0.3
+        elif name == 'Income_Age_Ratio':
+            np.divide(income, age, out=out)
+        elif name == 'Low_Engagement_High_Age':
+            np.greater_equal(age, 40, out=mask)
+            mask &= t <= 60
+            np.copyto(out, mask)
+        elif name == 'Time_Income_Interaction':
+            np.multiply(t, income, out=out)
+            out /= 1000000
+        elif name == 'Age_Squared':
+            np.multiply(age, age, out=out)
+        elif name == 'Is_Senior':
+            np.greater_equal(age, 50, out=mask)
+            np.copyto(out, mask)
+        elif name == 'Is_Low_Income':
+            np.less(income, 40000, out=mask)
+            np.copyto(out, mask)
+        elif name == 'High_Usage':
+            np.greater(usage, self.usage_median_, out=mask)
+            np.copyto(out, mask)
+        else:
+            raise ValueError(f"알 수 없는 피처: {name}")
+
+    def transform(self, block, out=None):
+        """
+        원본 블록을 피처 행렬로 변환
+
+        Parameters:
+        -----------
+        block : ndarray, shape (n, len(INPUT_COLUMNS))
+            INPUT_COLUMNS 순서의 원본 값
+        out : ndarray, optional
+            결과를 쓸 (n, len(feature_cols)) 행렬 (재사용 시,
+            열 우선 순서일 때 가장 빠름)
+
+        Returns:
+        --------
+        out : ndarray
+            get_feature_columns() 순서의 피처 행렬 (기본 self.dtype)
+        """
+        if self.usage_median_ is None:
+            raise ValueError("fit()을 먼저 호출해야 합니다.")
+        # 열 단위로 읽고 쓰므로 입력/출력 모두 열 우선(Fortran) 순서를 사용
+        block = np.asfortranarray(block, dtype=np.float64)
+        n_rows = block.shape[0]
+        if out is None:
+            out = np.empty((n_rows, len(self.feature_cols)), dtype=self.dtype,
+                           order='F')
+
+        cols = {name: block[:, i] for i, name in enumerate(INPUT_COLUMNS)}
+        # float64 출력이면 열에 직접 계산하고, 아니면 float64로 계산한 뒤 변환
+        direct = out.dtype == np.float64
+        scratch = None if direct else np.empty(n_rows, dtype=np.float64)
+        mask = np.empty(n_rows, dtype=bool)
+        for j, name in enumerate(self.feature_cols):
+            if direct:
+                self._compute(name, cols, out[:, j], mask)
+            else:
+                self._compute(name, cols, scratch, mask)
+                out[:, j] = scratch
+        return out
+
+    def transform_frame(self, df, out=None):
+        """DataFrame(또는 청크)의 INPUT_COLUMNS를 꺼내 transform"""
+        return self.transform(df[INPUT_COLUMNS].to_numpy(dtype=np.float64), out)
+
+    def transform_chunks(self, chunks):
+        """청크 이터레이터를 (피처 행렬, 청크) 순서로 변환하는 제너레이터"""
+        for chunk in chunks:
+            yield self.transform_frame(chunk), chunk
+
+def benchmark_feature_pipeline(df, repeat=5):
+    """
+    기존 pandas 경로(create_features)와 FeaturePipeline 변환 속도 비교
+
+    Returns:
+    --------
+    result : dict
+        pandas_sec, compiled_sec, speedup, max_abs_diff, rows
+    """
+    feature_cols = get_feature_columns()
+    pipeline = FeaturePipeline(feature_cols).fit(df)
+    raw = df[INPUT_COLUMNS]
+
+    def best_of(func):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    pandas_sec, expected = best_of(
+        lambda: create_features(raw.copy(), verbose=False)[feature_cols]
+        .to_numpy(dtype=np.float64))
+    compiled_sec, actual = best_of(lambda: pipeline.transform_frame(raw))
+
+    result = {
+        'rows': len(df),
+        'pandas_sec': pandas_sec,
+        'compiled_sec': compiled_sec,
+        'speedup': pandas_sec / compiled_sec,
+        'max_abs_diff': float(np.abs(expected - actual).max())
+    }
+    print(f"피처 변환 벤치마크 ({result['rows']:,}행): "
+          f"pandas {pandas_sec * 1000:.2f}ms | compiled {compiled_sec * 1000:.2f}ms | "
+          f"{result['speedup']:.1f}배 | 최대 오차 {result['max_abs_diff']:.2e}")
+    return result
@@ -0,0 +1,232 @@
+# src/grouped_stats.py
+import copy
+import numpy as np
+import pandas as pd
+from src.quantile_sketch import KLLSketch
+
+BOXPLOT_QUANTILES = (0.25, 0.5, 0.75)
+
+class GroupedStats:
+    """
+    그룹(클래스)별 수치형 컬럼 충분통계량
+
+    count/mean/M2/min/max를 (그룹 수, 컬럼 수) 배열로 보관한다.
+    DataFrame에서 만들 때는 그룹마다 마스크를 한 번만 적용해 모든 컬럼의
+    모멘트와 사분위수, 박스플롯 수염/이상치를 한꺼번에 계산하고,
+    청크별 통계는 merge로 합칠 수 있다. 병합 후 모멘트는 정확하고,
+    사분위수/수염은 그룹 × 컬럼별 KLL 스케치에서 근사한다.
+    """
+
+    def __init__(self, columns, groups):
+        self.columns = list(columns)
+        self.groups = list(groups)
+        shape = (len(self.groups), len(self.columns))
+        self.count = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.quantiles = None  # {q: (그룹 수, 컬럼 수) 배열}
+        self.whiskers = None   # (whislo, whishi)
+        self.fliers = None     # fliers[g][c] = ndarray
+        self.sketches = None   # sketches[g][c] = KLLSketch (스트리밍 통계)
+
+    @classmethod
+    def from_frame(cls, df, columns, by='Clicked on Ad', groups=(0, 1),
+                   exact=True, sketches=None):
+        """
+        DataFrame 한 번 순회로 그룹별 통계 계산
+
+        exact=True이면 사분위수와 박스플롯 수염/이상치도 계산한다.
+        sketches(그룹 × 컬럼 KLLSketch)를 넘기면 같은 마스크로 함께 갱신한다.
+        """
+        result = cls(columns, groups)
+        values = df[result.columns].to_numpy(dtype=np.float64)
+        labels = df[by].to_numpy()
+
+        if exact:
+            result.quantiles = {q: np.full(result.count.shape, np.nan)
+                                for q in BOXPLOT_QUANTILES}
+            whislo = np.full(result.count.shape, np.nan)
+            whishi = np.full(result.count.shape, np.nan)
+            result.fliers = []
+
+        for g, group in enumerate(result.groups):
+            X = values[labels == group]
+            n = len(X)
+            result.count[g] = n
+            if sketches is not None:
+                for c, sketch in enumerate(sketches[g]):
+                    sketch.update(X[:, c])
+            if n == 0:
+                if exact:
+                    result.fliers.append([np.empty(0)] * len(result.columns))
+                continue
+            result.mean[g] = X.mean(axis=0)
+            result.m2[g] = ((X - result.mean[g]) ** 2).sum(axis=0)
+            result.min[g] = X.min(axis=0)
+            result.max[g] = X.max(axis=0)
+
+            if exact:
+                q1, med, q3 = np.percentile(X, [25, 50, 75], axis=0)
+                result.quantiles[0.25][g] = q1
+                result.quantiles[0.5][g] = med
+                result.quantiles[0.75][g] = q3
+
+                # matplotlib boxplot과 같은 규칙: 1.5 IQR 안쪽의 최소/최대 관측값
+                iqr = q3 - q1
+                lo_limit, hi_limit = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+                inside_lo = np.where(X >= lo_limit, X, np.inf).min(axis=0)
+                inside_hi = np.where(X <= hi_limit, X, -np.inf).max(axis=0)
+                whislo[g] = np.where(np.isfinite(inside_lo), inside_lo, q1)
+                whishi[g] = np.where(np.isfinite(inside_hi), inside_hi, q3)
+                outside = (X < whislo[g]) | (X > whishi[g])
+                result.fliers.append([X[outside[:, c], c]
+                                      for c in range(len(result.columns))])
+
+        if exact:
+            result.whiskers = (whislo, whishi)
+        return result
+
+    @classmethod
+    def from_chunks(cls, chunks, columns, by='Clicked on Ad', groups=(0, 1),
+                    sketch=True, seed=0):
+        """
+        청크 이터레이터의 통계를 누적 병합
+
+        sketch=True이면 그룹 × 컬럼별 분위수 스케치도 함께 갱신해
+        박스플롯 통계를 근사한다.
+        """
+        result = cls(columns, groups)
+        if sketch:
+            result.sketches = [[KLLSketch(seed=seed + g * len(columns) + c)
+                                for c in range(len(columns))]
+                               for g in range(len(groups))]
+        for chunk in chunks:
+            result = result.merge(cls.from_frame(chunk, columns, by, groups,
+                                                 exact=False,
+                                                 sketches=result.sketches))
+        return result.apply_sketches()
+
+    def apply_sketches(self):
+        """스케치에서 사분위수, 수염, 이상치(대표 표본) 계산"""
+        if self.sketches is None:
+            return self
+        shape = self.count.shape
+        self.quantiles = {q: np.full(shape, np.nan) for q in BOXPLOT_QUANTILES}
+        whislo, whishi = np.full(shape, np.nan), np.full(shape, np.nan)
+        self.fliers = []
+        for g, row in enumerate(self.sketches):
+            self.fliers.append([])
+            for c, sketch in enumerate(row):
+                if sketch.n == 0:
+                    self.fliers[g].append(np.empty(0))
+                    continue
+                box = sketch.boxplot_stats()
+                self.quantiles[0.25][g, c] = box['q1']
+                self.quantiles[0.5][g, c] = box['med']
+                self.quantiles[0.75][g, c] = box['q3']
+                whislo[g, c], whishi[g, c] = box['whislo'], box['whishi']
+                self.fliers[g].append(box['fliers'])
+        self.whiskers = (whislo, whishi)
+        return self
+
+    @property
+    def approximate(self):
+        """분위수가 스케치 근사이거나 없으면 True"""
+        return self.quantiles is None or self.sketches is not None
+
+    def merge(self, other):
+        """
+        두 통계를 병렬 분산 공식(Chan)으로 병합
+
+        정확한 사분위수는 병합할 수 없으므로 버리고, 양쪽에 스케치가 있으면
+        스케치를 병합한다 (apply_sketches로 사분위수 재계산).
+        """
+        merged = GroupedStats(self.columns, self.groups)
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        safe_n = np.where(n > 0, n, 1)
+        delta = other.mean - self.mean
+        merged.count = n
+        merged.mean = self.mean + delta * n_b / safe_n
+        merged.m2 = self.m2 + other.m2 + delta ** 2 * n_a * n_b / safe_n
+        merged.min = np.minimum(self.min, other.min)
+        merged.max = np.maximum(self.max, other.max)
+        if self.sketches is not None and other.sketches is not None:
+            merged.sketches = [[copy.deepcopy(a).merge(b) for a, b in zip(row_a, row_b)]
+                               for row_a, row_b in zip(self.sketches, other.sketches)]
+        elif self.sketches is not None:
+            # from_chunks: 청크 통계를 만들 때 스케치는 이미 갱신됨
+            merged.sketches = self.sketches
+        return merged
+
+    def variance(self, ddof=1):
+        return self.m2 / np.where(self.count > ddof, self.count - ddof, np.nan)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.variance(ddof))
+
+    def ttest(self, column, equal_var=True, group_a=0, group_b=1):
+        """
+        충분통계량으로 두 그룹 t-검정
+
+        equal_var=True는 Student t-test(stats.ttest_ind 기본값),
+        False는 Welch t-test.
+        """
+        from scipy import stats
+
+        c = self.columns.index(column)
+        a, b = self.groups.index(group_a), self.groups.index(group_b)
+        std = self.std()
+        return stats.ttest_ind_from_stats(
+            self.mean[a, c], std[a, c], self.count[a, c],
+            self.mean[b, c], std[b, c], self.count[b, c],
+            equal_var=equal_var)
+
+    def boxplot_stats(self, column, labels=None):
+        """
+        matplotlib Axes.bxp에 넘길 그룹별 박스플롯 통계
+
+        스트리밍 통계는 스케치 분위수를 쓰고, 스케치도 없으면 박스는
+        평균±표준편차, 수염은 최소/최대값으로 근사한다.
+        """
+        c = self.columns.index(column)
+        labels = labels or [str(g) for g in self.groups]
+        std = self.std()
+        result = []
+        for g, label in enumerate(labels):
+            item = {'label': label, 'mean': self.mean[g, c]}
+            if self.quantiles is not None:
+                q1 = self.quantiles[0.25][g, c]
+                med = self.quantiles[0.5][g, c]
+                q3 = self.quantiles[0.75][g, c]
+                whislo, whishi = self.whiskers[0][g, c], self.whiskers[1][g, c]
+                fliers = self.fliers[g][c]
+            else:
+                med = self.mean[g, c]
+                q1, q3 = med - std[g, c], med + std[g, c]
+                whislo, whishi = self.min[g, c], self.max[g, c]
+                fliers = np.empty(0)
+            notch = 1.57 * (q3 - q1) / np.sqrt(max(self.count[g, c], 1))
+            item.update({'med': med, 'q1': q1, 'q3': q3, 'iqr': q3 - q1,
+                         'whislo': whislo, 'whishi': whishi, 'fliers': fliers,
+                         'cilo': med - notch, 'cihi': med + notch})
+            result.append(item)
+        return result
+
+    def to_frame(self):
+        """그룹 × 컬럼 통계표"""
+        rows = []
+        std = self.std()
+        for g, group in enumerate(self.groups):
+            for c, col in enumerate(self.columns):
+                row = {'group': group, 'column': col,
+                       'count': self.count[g, c], 'mean': self.mean[g, c],
+                       'std': std[g, c], 'min': self.min[g, c],
+                       'max': self.max[g, c]}
+                if self.quantiles is not None:
+                    for q, values in self.quantiles.items():
+                        row[f"q{int(q * 100)}"] = values[g, c]
+                rows.append(row)
+        return pd.DataFrame(rows)
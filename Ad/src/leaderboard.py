@@ -0,0 +1,108 @@
+# src/leaderboard.py
+import os
+
+import shutil
+import tempfile
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+from src.model_training import get_models, _fit_and_score
+from config import RANDOM_STATE, CV_FOLDS, N_JOBS, CACHE_DIR, SCALED_MODELS
+
+METRICS = ['Accuracy', 'Precision', 'Recall', 'F1-Score', 'ROC-AUC']
+
+def build_fold_cache(X, y, n_splits=CV_FOLDS, cache_dir=CACHE_DIR):
+    """
+    Stratified K-fold 인덱스와 fold별 스케일링 행렬을 한 번 계산해 디스크에 저장
+
+    fold마다 train 행으로만 StandardScaler를 학습해 전체 행을 변환한
+    행렬을 (fold, 행, 피처) 배열 하나로 쌓는다. joblib으로 저장한 뒤
+    mmap_mode='r'로 다시 열어 반환하므로 워커 프로세스에는 파일 경로만
+    전달되고 모든 워커가 같은 페이지를 읽기 전용으로 공유한다.
+
+    Returns:
+    --------
+    data : dict
+        X, X_scaled, y, folds [(train_idx, test_idx)] (배열은 np.memmap)
+    work_dir : str
+        임시 디렉토리 (사용 후 삭제)
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=RANDOM_STATE)
+    folds = list(skf.split(X, y))
+
+    X_scaled = np.empty((n_splits,) + X.shape, dtype=np.float64)
+    for i, (train_idx, _) in enumerate(folds):
+        X_scaled[i] = StandardScaler().fit(X[train_idx]).transform(X)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix='leaderboard_', dir=cache_dir)
+    path = os.path.join(work_dir, 'folds.joblib')
+    joblib.dump({'X': X, 'X_scaled': X_scaled, 'y': y,
+                 'train_idx': [train for train, _ in folds],
+                 'test_idx': [test for _, test in folds]}, path)
+    data = joblib.load(path, mmap_mode='r')
+    data['folds'] = list(zip(data.pop('train_idx'), data.pop('test_idx')))
+    return data, work_dir
+
+def _score_fold(name, model, data, fold):
+    """워커: 공유 메모리 맵에서 fold 하나를 잘라 모델 하나 학습/평가"""
+    train_idx, test_idx = data['folds'][fold]
+    X = data['X_scaled'][fold] if name in SCALED_MODELS else data['X']
+    y = data['y']
+    result, _, _ = _fit_and_score(name, model, X[train_idx], X[test_idx],
+                                  y[train_idx], y[test_idx])
+    result['Fold'] = fold
+    return result
+
+def cross_validate_models(X, y, n_splits=CV_FOLDS, n_jobs=N_JOBS):
+    """
+    train_models의 모든 모델을 Stratified K-fold로 평가한 리더보드
+
+    fold × 모델 작업을 joblib(loky) 워커에 한꺼번에 나눠 병렬로 실행한다.
+    워커가 이미 코어 예산을 모두 쓰므로 Random Forest 내부 n_jobs는 1이다.
+
+    Returns:
+    --------
+    leaderboard : DataFrame
+        train_models 결과표 형식 (fold 평균) + 지표별 Std 컬럼,
+        ROC-AUC 평균 내림차순
+    fold_results : DataFrame
+        fold × 모델별 지표
+    """
+    print("\n" + "="*70)
+    print(f"교차검증 리더보드 ({n_splits}-fold)")
+    print("="*70)
+
+    start = time.perf_counter()
+    data, work_dir = build_fold_cache(X, y, n_splits)
+    try:
+        tasks = [(name, model, fold)
+                 for fold in range(n_splits)
+                 for name, model in get_models(n_jobs=1).items()]
+        n_workers = min(effective_n_jobs(n_jobs), len(tasks))
+        print(f"작업 {len(tasks)}개 (fold {n_splits} × 모델 {len(tasks) // n_splits}) | "
+              f"워커 {n_workers}개")
+        results = Parallel(n_jobs=n_workers, backend='loky')(
+            delayed(_score_fold)(name, model, data, fold)
+            for name, model, fold in tasks
+        )
+    finally:
+        del data
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    fold_results = pd.DataFrame(results)
+    grouped = fold_results.groupby('Model', sort=False)[METRICS]
+    leaderboard = grouped.mean()
+    std = grouped.std().add_suffix(' Std')
+    leaderboard = pd.concat([leaderboard, std], axis=1).reset_index()
+    leaderboard = leaderboard.sort_values('ROC-AUC', ascending=False)
+
+    print(f"소요 시간: {time.perf_counter() - start:.1f}초")
+    print(leaderboard.to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+    return leaderboard, fold_results
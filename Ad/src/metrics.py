@@ -0,0 +1,293 @@
+# src/metrics.py
+import numpy as np
+import pandas as pd
+from config import RANDOM_STATE, BOOTSTRAP_SAMPLES, CALIBRATION_BINS
+
+# 부트스트랩 한 배치의 가중치 행렬 최대 원소 수 (메모리 제한)
+# (b × n) 행렬 몇 개가 동시에 있으므로 배치 하나의 최대 메모리는 약 원소 수 × 30byte
+_BOOTSTRAP_BATCH_CELLS = 4_000_000
+
+class ScoreCurves:
+    """
+    점수 한 번 정렬로 만드는 임계값별 누적 혼동행렬
+
+    점수를 내림차순으로 한 번 정렬해 양성 누적합을 만들어 두면,
+    ROC/PR 곡선과 AUC, 임의 임계값(여러 개도 한꺼번에)의 TP/FP/FN/TN과
+    Accuracy/Precision/Recall/F1이 모두 누적합 조회로 계산된다.
+    sklearn의 roc_auc_score, average_precision_score와 같은 값을 준다.
+    """
+
+    def __init__(self, y_true, y_score):
+        y_true = np.asarray(y_true).astype(bool)
+        y_score = np.asarray(y_score, dtype=np.float64)
+        order = np.argsort(-y_score, kind='mergesort')
+        self.scores = y_score[order]              # 내림차순
+        self.labels = y_true[order]
+        self.n = len(y_true)
+        self.P = int(self.labels.sum())
+        self.N = self.n - self.P
+        self._cum_pos = np.concatenate([[0], np.cumsum(self.labels)])
+
+        # 같은 점수는 한 임계값으로 묶는다 (각 묶음의 마지막 위치)
+        last = np.r_[np.flatnonzero(np.diff(self.scores)), self.n - 1]
+        self.thresholds = self.scores[last]
+        self.tps = self._cum_pos[last + 1]
+        self.fps = last + 1 - self.tps
+
+    def counts_at(self, threshold, inclusive=False):
+        """
+        임계값별 TP, FP, FN, TN (threshold는 스칼라 또는 배열)
+
+        inclusive=False이면 score > threshold, True이면 score >= threshold를
+        양성으로 예측한다.
+        """
+        threshold = np.asarray(threshold, dtype=np.float64)
+        side = 'right' if inclusive else 'left'
+        k = np.searchsorted(-self.scores, -threshold, side=side)
+        tp = self._cum_pos[k]
+        fp = k - tp
+        return tp, fp, self.P - tp, self.N - fp
+
+    def metrics_at(self, threshold=0.5, inclusive=False):
+        """임계값별 Accuracy, Precision, Recall, F1 (sklearn과 같은 0 처리)"""
+        tp, fp, fn, tn = self.counts_at(threshold, inclusive)
+        return _label_metrics(tp, fp, fn, tn)
+
+    def roc_curve(self):
+        """FPR, TPR, 임계값 (맨 앞에 (0, 0), 임계값 inf)"""
+        fpr = np.r_[0, self.fps] / max(self.N, 1)
+        tpr = np.r_[0, self.tps] / max(self.P, 1)
+        return fpr, tpr, np.r_[np.inf, self.thresholds]
+
+    def roc_auc(self):
+        fpr, tpr, _ = self.roc_curve()
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def pr_curve(self):
+        """Precision, Recall, 임계값 (sklearn precision_recall_curve 순서)"""
+        precision = self.tps / (self.tps + self.fps)
+        recall = self.tps / max(self.P, 1)
+        return (np.r_[precision[::-1], 1.0], np.r_[recall[::-1], 0.0],
+                self.thresholds[::-1])
+
+    def average_precision(self):
+        precision = self.tps / (self.tps + self.fps)
+        recall = self.tps / max(self.P, 1)
+        return float(np.sum(np.diff(np.r_[0, recall]) * precision))
+
+    def threshold_table(self):
+        """서로 다른 점수마다 score >= 임계값 기준 지표표"""
+        tp, fp = self.tps, self.fps
+        table = pd.DataFrame({'threshold': self.thresholds, 'TP': tp, 'FP': fp,
+                              'FN': self.P - tp, 'TN': self.N - fp})
+        for name, values in _label_metrics(tp, fp, self.P - tp, self.N - fp).items():
+            table[name] = values
+        table['FPR'] = fp / max(self.N, 1)
+        return table
+
+def _label_metrics(tp, fp, fn, tn):
+    tp, fp, fn, tn = (np.asarray(a, dtype=np.float64) for a in (tp, fp, fn, tn))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+        accuracy = (tp + tn) / (tp + fp + fn + tn)
+    return {'Accuracy': accuracy, 'Precision': precision,
+            'Recall': recall, 'F1-Score': f1}
+
+def calibration_curve(y_true, y_prob, n_bins=CALIBRATION_BINS):
+    """
+    균등 구간 신뢰도(calibration) 곡선, Brier score, ECE
+
+    Returns:
+    --------
+    dict : prob_true, prob_pred, count (빈 구간 제외), brier, ece
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+    bins = np.minimum((y_prob * n_bins).astype(int), n_bins - 1)
+    count = np.bincount(bins, minlength=n_bins)
+    sum_true = np.bincount(bins, weights=y_true, minlength=n_bins)
+    sum_prob = np.bincount(bins, weights=y_prob, minlength=n_bins)
+    nonzero = count > 0
+    prob_true = sum_true[nonzero] / count[nonzero]
+    prob_pred = sum_prob[nonzero] / count[nonzero]
+    ece = float(np.sum(count[nonzero] * np.abs(prob_true - prob_pred)) / len(y_true))
+    return {'prob_true': prob_true, 'prob_pred': prob_pred,
+            'count': count[nonzero], 'brier': float(np.mean((y_prob - y_true) ** 2)),
+            'ece': ece}
+
+def bootstrap_metrics(y_true, y_score, threshold=0.5, n_boot=BOOTSTRAP_SAMPLES,
+                      ci=0.95, random_state=RANDOM_STATE, label_score=None,
+                      label_threshold=None):
+    """
+    부트스트랩 신뢰구간 (재표본 전체를 벡터 연산으로 계산)
+
+    점수를 한 번 정렬해 같은 점수 묶음으로 나눈 뒤, 재표본마다 행별 뽑힌
+    횟수(가중치)를 np.add.reduceat으로 묶음별 양성/음성 가중치로 합친다.
+    AUC는 묶음별 가중치의 누적합(Mann-Whitney, 동점 0.5)으로, 임계값
+    지표는 임계값 위 묶음의 가중치 합으로 계산하므로 재표본마다 정렬하거나
+    sklearn을 호출하지 않는다.
+
+    label_score/label_threshold를 주면 Accuracy/F1 등은 그 점수
+    (예: SVM decision_function > 0)로 계산한다.
+
+    Returns:
+    --------
+    DataFrame : metric, estimate, lower, upper
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    n = len(y_true)
+    order = np.argsort(-y_score, kind='mergesort')
+    scores, labels = y_score[order], y_true[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(scores)) + 1]
+
+    if label_score is None:
+        positive = scores > threshold
+    else:
+        label_threshold = threshold if label_threshold is None else label_threshold
+        positive = np.asarray(label_score, dtype=np.float64)[order] > label_threshold
+
+    rng = np.random.RandomState(random_state)
+    batch = max(1, _BOOTSTRAP_BATCH_CELLS // max(n, 1))
+    samples = {name: [] for name in ('ROC-AUC', 'Accuracy', 'Precision',
+                                     'Recall', 'F1-Score')}
+    for start in range(0, n_boot, batch):
+        b = min(batch, n_boot - start)
+        # 재표본 b개의 행별 뽑힌 횟수 (b × n, 횟수는 n 이하이므로 int32)
+        draws = rng.randint(0, n, size=(b, n))
+        draws += (np.arange(b) * n)[:, None]
+        weights = np.bincount(draws.ravel(), minlength=b * n).astype(np.int32).reshape(b, n)
+        del draws
+        pos_w = weights * labels
+        neg_w = weights - pos_w
+
+        # AUC: 묶음별 양성 가중치 × (더 낮은 점수의 음성 + 동점 음성/2)
+        pos_block = np.add.reduceat(pos_w, starts, axis=1)
+        neg_block = np.add.reduceat(neg_w, starts, axis=1)
+        n_pos = pos_block.sum(axis=1)
+        n_neg = neg_block.sum(axis=1)
+        neg_below = n_neg[:, None] - np.cumsum(neg_block, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            auc = (pos_block * (neg_below + neg_block / 2)).sum(axis=1) / (n_pos * n_neg)
+        samples['ROC-AUC'].append(auc)
+
+        tp = pos_w[:, positive].sum(axis=1)
+        fp = neg_w[:, positive].sum(axis=1)
+        for name, values in _label_metrics(tp, fp, n_pos - tp, n_neg - fp).items():
+            samples[name].append(values)
+
+    curves = ScoreCurves(y_true, y_score)
+    if label_score is None:
+        estimates = curves.metrics_at(threshold)
+    else:
+        estimates = ScoreCurves(y_true, label_score).metrics_at(label_threshold)
+    estimates['ROC-AUC'] = curves.roc_auc()
+
+    alpha = (1 - ci) / 2
+    rows = []
+    for name, values in samples.items():
+        values = np.concatenate(values)
+        lower, upper = np.nanquantile(values, [alpha, 1 - alpha])
+        rows.append({'metric': name, 'estimate': float(estimates[name]),
+                     'lower': lower, 'upper': upper})
+    return pd.DataFrame(rows)
+
+class EvaluationCache:
+    """
+    모델별 test 확률 캐시와 평가 엔진
+
+    train_models가 계산한 확률을 한 번 저장해 두고, 곡선/지표/신뢰구간을
+    모델마다 한 번 정렬한 ScoreCurves에서 계산한다. 라벨 예측 기준이
+    확률 > 0.5가 아닌 모델(SVM)은 label_score/label_threshold로 지정한다.
+    """
+
+    def __init__(self, y_true, threshold=0.5):
+        self.y_true = np.asarray(y_true)
+        self.threshold = threshold
+        self.probabilities = {}
+        self.label_scores = {}
+        self._curves = {}
+
+    def add(self, name, y_prob, label_score=None, label_threshold=None):
+        self.probabilities[name] = np.asarray(y_prob, dtype=np.float64)
+        if label_score is not None:
+            self.label_scores[name] = (np.asarray(label_score, dtype=np.float64),
+                                       label_threshold)
+        self._curves.pop(name, None)
+        return self
+
+    @classmethod
+    def from_probabilities(cls, y_true, probabilities, threshold=0.5):
+        """
+        {모델 이름: 확률} 또는 {모델 이름: (확률, 라벨 점수, 라벨 임계값)}
+        """
+        cache = cls(y_true, threshold)
+        for name, value in probabilities.items():
+            if isinstance(value, tuple):
+                cache.add(name, *value)
+            else:
+                cache.add(name, value)
+        return cache
+
+    def curves(self, name):
+        if name not in self._curves:
+            self._curves[name] = ScoreCurves(self.y_true, self.probabilities[name])
+        return self._curves[name]
+
+    def label_metrics(self, name):
+        """현재 임계값 기준 Accuracy/Precision/Recall/F1"""
+        if name in self.label_scores:
+            score, label_threshold = self.label_scores[name]
+            return ScoreCurves(self.y_true, score).metrics_at(label_threshold)
+        return self.curves(name).metrics_at(self.threshold)
+
+    def evaluate(self, name):
+        """train_models 결과표 형식의 지표 + PR-AUC, Brier, ECE"""
+        curves = self.curves(name)
+        calibration = calibration_curve(self.y_true, self.probabilities[name])
+        result = {'Model': name}
+        result.update({key: float(value)
+                       for key, value in self.label_metrics(name).items()})
+        result['ROC-AUC'] = curves.roc_auc()
+        result['PR-AUC'] = curves.average_precision()
+        result['Brier'] = calibration['brier']
+        result['ECE'] = calibration['ece']
+        return result
+
+    def summary(self, n_boot=0, ci=0.95):
+        """
+        전체 모델 비교표 (ROC-AUC 내림차순)
+
+        n_boot > 0이면 ROC-AUC와 F1의 부트스트랩 신뢰구간 컬럼을 추가한다.
+        """
+        rows = []
+        for name in self.probabilities:
+            row = self.evaluate(name)
+            if n_boot:
+                intervals = self.bootstrap(name, n_boot, ci).set_index('metric')
+                for metric in ('ROC-AUC', 'F1-Score'):
+                    row[f'{metric} CI low'] = intervals.loc[metric, 'lower']
+                    row[f'{metric} CI high'] = intervals.loc[metric, 'upper']
+            rows.append(row)
+        return pd.DataFrame(rows).sort_values('ROC-AUC', ascending=False)
+
+    def bootstrap(self, name, n_boot=BOOTSTRAP_SAMPLES, ci=0.95):
+        label_score, label_threshold = self.label_scores.get(name, (None, None))
+        return bootstrap_metrics(self.y_true, self.probabilities[name],
+                                 self.threshold, n_boot, ci,
+                                 label_score=label_score,
+                                 label_threshold=label_threshold)
+
+    def roc_curves(self):
+        """[(이름, fpr, tpr, auc)] (plot_roc_curve 입력 형식)"""
+        curves = []
+        for name in self.probabilities:
+            fpr, tpr, _ = self.curves(name).roc_curve()
+            curves.append((name, fpr, tpr, self.curves(name).roc_auc()))
+        return curves
+
+    def calibration_curves(self, n_bins=CALIBRATION_BINS):
+        return {name: calibration_curve(self.y_true, prob, n_bins)
+                for name, prob in self.probabilities.items()}
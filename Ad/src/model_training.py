@@ -1,21 +1,38 @@
 # src/model_training.py
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
+import importlib
+import time
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 import pandas as pd
-from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold
+from sklearn.model_selection import (train_test_split, StratifiedKFold,
+                                     ParameterGrid, cross_val_score)
 from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.svm import SVC
-from sklearn.neighbors import KNeighborsClassifier
-from sklearn.naive_bayes import GaussianNB
-from sklearn.metrics import (accuracy_score, precision_score, recall_score,
-                             f1_score, roc_auc_score)
-from config import RANDOM_STATE, TEST_SIZE, PARAM_GRID, CV_FOLDS
+from sklearn.metrics import roc_auc_score
+from src.metrics import ScoreCurves, EvaluationCache
+from src.profiling import measure, profiled_call, add_record
+from config import (RANDOM_STATE, TEST_SIZE, PARAM_GRID, CV_FOLDS, N_JOBS,
+                    PARALLEL_TRAINING, SEARCH_METHOD, SEARCH_MAX_FITS, SEARCH_TIME_BUDGET,
+                    SEARCH_HALVING_FACTOR, HASHED_FEATURE_MODELS, SCALED_MODELS)
+
+SEARCH_METHODS = ['grid', 'warm_start', 'halving_grid', 'halving_random', 'bayes']
+
+# 비교 모델: 이름 → (모듈, 클래스, 파라미터)
+# 추정기 클래스는 get_models에서 실제로 만드는 모델의 것만 import한다
+MODEL_SPECS = {
+    'Logistic Regression': ('sklearn.linear_model', 'LogisticRegression',
+                            {'random_state': RANDOM_STATE, 'max_iter': 1000}),
+    'Decision Tree': ('sklearn.tree', 'DecisionTreeClassifier',
+                      {'random_state': RANDOM_STATE, 'max_depth': 10}),
+    'Random Forest': ('sklearn.ensemble', 'RandomForestClassifier',
+                      {'n_estimators': 100, 'random_state': RANDOM_STATE,
+                       'max_depth': 10}),
+    'Gradient Boosting': ('sklearn.ensemble', 'GradientBoostingClassifier',
+                          {'n_estimators': 100, 'random_state': RANDOM_STATE,
+                           'max_depth': 5}),
+    'SVM': ('sklearn.svm', 'SVC', {'probability': True, 'random_state': RANDOM_STATE}),
+    'KNN': ('sklearn.neighbors', 'KNeighborsClassifier', {'n_neighbors': 5}),
+    'Naive Bayes': ('sklearn.naive_bayes', 'GaussianNB', {})
+}
 
 def prepare_data(df, feature_cols):
     """데이터 전처리 및 분할"""
@@ -42,63 +59,110 @@ def prepare_data(df, feature_cols):
     
     return X_train, X_test, y_train, y_test, X_train_scaled, X_test_scaled, scaler
 
+def get_models(n_jobs=None, names=None):
+    """
+    비교할 모델 정의 (n_jobs는 Random Forest 내부 병렬 수)
+
+    names를 주면 해당 모델만 만들며, 그 모델의 sklearn 모듈만 import된다.
+    """
+    models = {}
+    for name in names or MODEL_SPECS:
+        module, class_name, params = MODEL_SPECS[name]
+        if name == 'Random Forest':
+            params = dict(params, n_jobs=n_jobs)
+        models[name] = getattr(importlib.import_module(module), class_name)(**params)
+    return models
+
+def _fit_and_score(name, model, X_fit, X_eval, y_train, y_test):
+    """
+    모델 하나를 학습하고 predict_proba 한 번으로 모든 지표 계산
+
+    지표는 확률을 한 번 정렬한 누적 혼동행렬(ScoreCurves)에서 구한다.
+    predict는 확률 > 0.5와 같다. 단 SVC(probability=True)의 predict는
+    decision_function > 0 기준이므로 SVM의 라벨 지표는 그 점수로 계산해
+    기존 결과와 동일하게 유지한다.
+
+    Returns:
+    --------
+    result : dict, model, prediction : (y_prob, label_score, label_threshold)
+    """
+    model.fit(X_fit, y_train)
+    y_prob = model.predict_proba(X_eval)[:, 1]
+    curves = ScoreCurves(y_test, y_prob)
+    # sklearn.svm을 import하지 않도록 클래스 이름으로 확인
+    if type(model).__name__ == 'SVC':
+        label_score, label_threshold = model.decision_function(X_eval), 0.0
+        label_metrics = ScoreCurves(y_test, label_score).metrics_at(label_threshold)
+    else:
+        label_score = label_threshold = None
+        label_metrics = curves.metrics_at(0.5)
+
+    result = {'Model': name}
+    result.update({key: float(value) for key, value in label_metrics.items()})
+    result['ROC-AUC'] = curves.roc_auc()
+    return result, model, (y_prob, label_score, label_threshold)
+
+def _print_result(result):
+    print(f"\n{result['Model']}:")
+    print(f"  Accuracy: {result['Accuracy']:.4f} | Precision: {result['Precision']:.4f} | "
+          f"Recall: {result['Recall']:.4f}")
+    print(f"  F1-Score: {result['F1-Score']:.4f} | ROC-AUC: {result['ROC-AUC']:.4f}")
+
 def train_models(X_train, X_test, y_train, y_test, 
-                 X_train_scaled, X_test_scaled):
-    """여러 모델 학습 및 비교"""
+                 X_train_scaled, X_test_scaled, parallel=PARALLEL_TRAINING,
+                 n_jobs=N_JOBS, return_probabilities=False, model_names=None,
+                 X_train_sparse=None, X_test_sparse=None):
+    """
+    여러 모델 학습 및 비교
+
+    parallel=True이면 모델들을 joblib(loky) 프로세스로 동시에 학습한다.
+    전체 코어 예산(n_jobs)을 워커 수로 나눠 Random Forest 내부 n_jobs에
+    배정하므로 코어를 초과해서 쓰지 않으며, 결과와 순서는 순차 실행과 같다.
+
+    return_probabilities=True이면 모델별 test 확률을 담은
+    EvaluationCache를 세 번째 값으로 반환한다 (ROC/PR/신뢰구간 재사용).
+    model_names를 주면 get_models()에서 해당 모델만 학습한다.
+    X_train_sparse/X_test_sparse(스케일 피처 + 해싱 블록 CSR 행렬)를 주면
+    HASHED_FEATURE_MODELS의 모델은 스케일된 행렬 대신 이 행렬로 학습한다.
+    """
     print("\n" + "="*70)
     print("머신러닝 모델 학습 및 비교")
     print("="*70)
     
-    models = {
-        'Logistic Regression': LogisticRegression(random_state=RANDOM_STATE, 
-                                                   max_iter=1000),
-        'Decision Tree': DecisionTreeClassifier(random_state=RANDOM_STATE, 
-                                                 max_depth=10),
-        'Random Forest': RandomForestClassifier(n_estimators=100, 
-                                                random_state=RANDOM_STATE, 
-                                                max_depth=10),
-        'Gradient Boosting': GradientBoostingClassifier(n_estimators=100, 
-                                                         random_state=RANDOM_STATE, 
-                                                         max_depth=5),
-        'SVM': SVC(probability=True, random_state=RANDOM_STATE),
-        'KNN': KNeighborsClassifier(n_neighbors=5),
-        'Naive Bayes': GaussianNB()
-    }
-    
-    results = []
-    trained_models = {}
-    
-    for name, model in models.items():
-        if name in ['Logistic Regression', 'SVM', 'KNN', 'Naive Bayes']:
-            model.fit(X_train_scaled, y_train)
-            y_pred = model.predict(X_test_scaled)
-            y_prob = model.predict_proba(X_test_scaled)[:, 1]
-        else:
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-            y_prob = model.predict_proba(X_test)[:, 1]
-        
-        accuracy = accuracy_score(y_test, y_pred)
-        precision = precision_score(y_test, y_pred)
-        recall = recall_score(y_test, y_pred)
-        f1 = f1_score(y_test, y_pred)
-        roc_auc = roc_auc_score(y_test, y_prob)
-        
-        results.append({
-            'Model': name,
-            'Accuracy': accuracy,
-            'Precision': precision,
-            'Recall': recall,
-            'F1-Score': f1,
-            'ROC-AUC': roc_auc
-        })
-        
-        trained_models[name] = model
-        
-        print(f"\n{name}:")
-        print(f"  Accuracy: {accuracy:.4f} | Precision: {precision:.4f} | "
-              f"Recall: {recall:.4f}")
-        print(f"  F1-Score: {f1:.4f} | ROC-AUC: {roc_auc:.4f}")
+    budget = effective_n_jobs(n_jobs)
+    n_models = len(model_names or MODEL_SPECS)
+    n_workers = min(budget, n_models) if parallel else 1
+    models = get_models(n_jobs=max(1, budget // n_workers), names=model_names)
+
+    def task_args(name, model):
+        if X_train_sparse is not None and name in HASHED_FEATURE_MODELS:
+            return name, model, X_train_sparse, X_test_sparse, y_train, y_test
+        if name in SCALED_MODELS:
+            return name, model, X_train_scaled, X_test_scaled, y_train, y_test
+        return name, model, X_train, X_test, y_train, y_test
+
+    if n_workers > 1:
+        print(f"병렬 학습: 워커 {n_workers}개 / 코어 예산 {budget}개")
+        # 학습 시간/메모리는 워커 안에서 측정해 결과와 함께 돌려받는다
+        measured = Parallel(n_jobs=n_workers, backend='loky')(
+            delayed(profiled_call)(f"fit:{name}", 'fit', len(y_train),
+                                   _fit_and_score, *task_args(name, model))
+            for name, model in models.items()
+        )
+        outputs = []
+        for output, fit_record in measured:
+            add_record(fit_record)
+            outputs.append(output)
+            _print_result(output[0])
+    else:
+        outputs = []
+        for name, model in models.items():
+            with measure(f"fit:{name}", kind='fit', rows=len(y_train)):
+                outputs.append(_fit_and_score(*task_args(name, model)))
+            _print_result(outputs[-1][0])
+
+    results = [result for result, _, _ in outputs]
+    trained_models = {result['Model']: model for result, model, _ in outputs}
     
     results_df = pd.DataFrame(results).sort_values('ROC-AUC', ascending=False)
     
@@ -107,26 +171,287 @@ def train_models(X_train, X_test, y_train, y_test,
     print("="*70)
     print(results_df.to_string(index=False))
     
+    if return_probabilities:
+        evaluation = EvaluationCache.from_probabilities(
+            y_test, {result['Model']: prediction
+                     for result, _, prediction in outputs})
+        return results_df, trained_models, evaluation
     return results_df, trained_models
 
-def optimize_random_forest(X_train, y_train):
+def _take_rows(data, idx):
+    """위치 인덱스 idx의 행 (DataFrame/Series는 iloc, 배열은 np.take)"""
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return data.iloc[idx]
+    return np.take(data, idx, axis=0)
+
+def _warm_start_fold(params, X_train, y_train, train_idx, test_idx,
+                     n_estimators_list):
+    """
+    (max_depth, min_samples_split, min_samples_leaf) 설정 하나를 fold 하나에서
+    warm_start로 키우며 트리 수 단계별 ROC-AUC 계산
+
+    warm_start로 추가되는 트리는 처음부터 n_estimators개를 학습한 숲과
+    같은 난수 시드를 받으므로 점수도 GridSearchCV와 동일하다.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    X_tr = _take_rows(X_train, train_idx)
+    y_tr = _take_rows(y_train, train_idx)
+    X_te = _take_rows(X_train, test_idx)
+    y_te = _take_rows(y_train, test_idx)
+
+    model = RandomForestClassifier(random_state=RANDOM_STATE, warm_start=True,
+                                   **params)
+    scores = []
+    for n_estimators in n_estimators_list:
+        model.set_params(n_estimators=n_estimators)
+        model.fit(X_tr, y_tr)
+        scores.append(roc_auc_score(y_te, model.predict_proba(X_te)[:, 1]))
+    return scores
+
+def _warm_start_search(X_train, y_train, param_grid):
+    """
+    n_estimators를 인식하는 GridSearch
+
+    n_estimators를 제외한 설정마다 fold별로 숲을 하나만 키우고
+    50/100/200 등 각 트리 수에서 점수를 매긴다. 같은 fold, 같은 평균,
+    같은 동점 처리 규칙을 쓰므로 GridSearchCV와 결과가 같다.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    n_estimators_list = sorted(param_grid.get('n_estimators', [100]))
+    base_grid = {k: v for k, v in param_grid.items() if k != 'n_estimators'}
+    settings = list(ParameterGrid(base_grid))
+    folds = list(StratifiedKFold(n_splits=CV_FOLDS).split(X_train, y_train))
+
+    fold_scores = Parallel(n_jobs=N_JOBS)(
+        delayed(_warm_start_fold)(params, X_train, y_train, train_idx,
+                                  test_idx, n_estimators_list)
+        for params in settings
+        for train_idx, test_idx in folds
+    )
+    fold_scores = np.array(fold_scores).reshape(len(settings), len(folds),
+                                                len(n_estimators_list))
+    mean_scores = fold_scores.mean(axis=1)
+
+    # GridSearchCV와 같은 ParameterGrid 순서로 첫 최고점 후보 선택
+    best_params, best_score = None, -np.inf
+    for candidate in ParameterGrid(param_grid):
+        base = {k: v for k, v in candidate.items() if k != 'n_estimators'}
+        score = mean_scores[settings.index(base),
+                            n_estimators_list.index(candidate.get('n_estimators', 100))]
+        if score > best_score:
+            best_params, best_score = candidate, score
+
+    best_estimator = RandomForestClassifier(random_state=RANDOM_STATE,
+                                            **best_params)
+    best_estimator.fit(X_train, y_train)
+
+    trees_built = len(settings) * len(folds) * n_estimators_list[-1]
+    trees_grid = len(settings) * len(folds) * sum(n_estimators_list)
+    print(f"warm_start 트리 학습량: {trees_built:,}개 "
+          f"(GridSearchCV {trees_grid:,}개 대비 {1 - trees_built / trees_grid:.0%} 절감)")
+
+    n_fits = len(settings) * len(folds) * len(n_estimators_list)
+    return best_estimator, best_params, best_score, n_fits
+
+def _bayesian_search(X_train, y_train, param_grid, max_fits, time_budget):
+    """
+    순차 모델 기반 최적화(SMBO)
+
+    PARAM_GRID의 후보를 인덱스로 인코딩하고, 평가가 끝난 후보들에
+    RandomForestRegressor 대리 모델을 학습해 트리 간 평균+표준편차(UCB)가
+    가장 큰 후보를 다음으로 평가한다. 학습 횟수(max_fits) 또는
+    실행 시간(time_budget) 예산을 넘기면 중단한다.
+    """
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+    candidates = list(ParameterGrid(param_grid))
+    keys = sorted(param_grid)
+    encoded = np.array([[param_grid[k].index(c[k]) for k in keys]
+                        for c in candidates], dtype=float)
+    cv = StratifiedKFold(n_splits=CV_FOLDS)
+    rng = np.random.RandomState(RANDOM_STATE)
+
+    max_evals = max(1, max_fits // CV_FOLDS) if max_fits else len(candidates)
+    n_init = min(len(candidates), max(3, max_evals // 4))
+    order = list(rng.permutation(len(candidates))[:n_init])
+
+    scores = {}
+    start = time.perf_counter()
+    while len(scores) < min(max_evals, len(candidates)):
+        if time_budget is not None and time.perf_counter() - start > time_budget:
+            break
+        if order:
+            idx = order.pop(0)
+        else:
+            evaluated = list(scores)
+            surrogate = RandomForestRegressor(n_estimators=100,
+                                              random_state=RANDOM_STATE)
+            surrogate.fit(encoded[evaluated], [scores[i] for i in evaluated])
+            remaining = np.array([i for i in range(len(candidates))
+                                  if i not in scores])
+            per_tree = np.stack([tree.predict(encoded[remaining])
+                                 for tree in surrogate.estimators_])
+            ucb = per_tree.mean(axis=0) + 1.96 * per_tree.std(axis=0)
+            idx = int(remaining[np.argmax(ucb)])
+
+        model = RandomForestClassifier(random_state=RANDOM_STATE,
+                                       **candidates[idx])
+        scores[idx] = cross_val_score(model, X_train, y_train, cv=cv,
+                                      scoring='roc_auc', n_jobs=N_JOBS).mean()
+
+    # 동점이면 ParameterGrid 순서상 앞선 후보 (GridSearchCV와 동일한 규칙)
+    best_idx = min(scores, key=lambda i: (-scores[i], i))
+    best_estimator = RandomForestClassifier(random_state=RANDOM_STATE,
+                                            **candidates[best_idx])
+    best_estimator.fit(X_train, y_train)
+    return best_estimator, candidates[best_idx], scores[best_idx], len(scores) * CV_FOLDS
+
+def run_param_search(X_train, y_train, method=SEARCH_METHOD,
+                     max_fits=SEARCH_MAX_FITS, time_budget=SEARCH_TIME_BUDGET,
+                     verbose=1):
+    """
+    선택한 탐색 엔진으로 Random Forest 하이퍼파라미터 탐색
+
+    Parameters:
+    -----------
+    method : str
+        'grid' (전체 GridSearchCV), 'warm_start' (n_estimators별 숲을
+        warm_start로 이어서 키우는 GridSearch, 결과 동일),
+        'halving_grid', 'halving_random'
+        (n_estimators를 자원으로 하는 successive halving),
+        'bayes' (순차 모델 기반 최적화)
+    max_fits : int
+        halving_random/bayes의 최대 학습 횟수 예산
+    time_budget : float or None
+        bayes의 최대 실행 시간(초)
+
+    Returns:
+    --------
+    best_estimator : RandomForestClassifier
+    summary : dict
+        method, best_params, best_score, n_fits, elapsed,
+        fit_seconds (CV 학습 시간 합계, grid/halving만 제공하고 나머지는 None)
+    """
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"지원하지 않는 탐색 방법: {method} "
+                         f"(가능: {', '.join(SEARCH_METHODS)})")
+
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import (GridSearchCV, HalvingGridSearchCV,
+                                         HalvingRandomSearchCV)
+
+    start = time.perf_counter()
+    base = RandomForestClassifier(random_state=RANDOM_STATE)
+    # CV 학습 시간 합계 (cv_results_가 있는 sklearn 탐색기만)
+    fit_seconds = None
+
+    if method == 'warm_start':
+        best_estimator, best_params, best_score, n_fits = _warm_start_search(
+            X_train, y_train, PARAM_GRID)
+    elif method == 'bayes':
+        best_estimator, best_params, best_score, n_fits = _bayesian_search(
+            X_train, y_train, PARAM_GRID, max_fits, time_budget)
+    else:
+        # successive halving은 트리 개수를 자원(resource)으로 사용한다:
+        # 후보 전체를 적은 트리로 평가하고 상위 1/factor만 더 큰 숲으로 재평가
+        halving_grid = {k: v for k, v in PARAM_GRID.items() if k != 'n_estimators'}
+        halving_kwargs = {
+            'resource': 'n_estimators',
+            'max_resources': max(PARAM_GRID['n_estimators']),
+            'min_resources': 'exhaust',
+            'factor': SEARCH_HALVING_FACTOR,
+            'cv': CV_FOLDS,
+            'scoring': 'roc_auc',
+            'n_jobs': N_JOBS,
+            'random_state': RANDOM_STATE,
+            'verbose': verbose
+        }
+        if method == 'grid':
+            search = GridSearchCV(base, PARAM_GRID, cv=CV_FOLDS,
+                                  scoring='roc_auc', n_jobs=N_JOBS, verbose=verbose)
+        elif method == 'halving_grid':
+            search = HalvingGridSearchCV(base, halving_grid, **halving_kwargs)
+        else:
+            # 전체 학습 횟수 ≈ cv × 후보 수 × factor / (factor - 1)
+            factor = SEARCH_HALVING_FACTOR
+            n_candidates = max(factor, int(max_fits * (factor - 1) /
+                                           (factor * CV_FOLDS)))
+            search = HalvingRandomSearchCV(base, halving_grid,
+                                           n_candidates=n_candidates,
+                                           **halving_kwargs)
+        search.fit(X_train, y_train)
+        best_estimator = search.best_estimator_
+        best_params = search.best_params_
+        best_score = search.best_score_
+        n_fits = len(search.cv_results_['params']) * CV_FOLDS
+        fit_seconds = float(np.sum(search.cv_results_['mean_fit_time']) * CV_FOLDS)
+
+    summary = {
+        'method': method,
+        'best_params': best_params,
+        'best_score': best_score,
+        'n_fits': n_fits,
+        'elapsed': time.perf_counter() - start,
+        'fit_seconds': fit_seconds
+    }
+    return best_estimator, summary
+
+def optimize_random_forest(X_train, y_train, method=SEARCH_METHOD):
     """Random Forest 하이퍼파라미터 튜닝"""
     print("\n" + "="*70)
-    print("Random Forest 하이퍼파라미터 튜닝 (GridSearchCV)")
+    print(f"Random Forest 하이퍼파라미터 튜닝 ({method})")
     print("="*70)
-    
-    rf_grid = GridSearchCV(
-        RandomForestClassifier(random_state=RANDOM_STATE),
-        PARAM_GRID,
-        cv=CV_FOLDS,
-        scoring='roc_auc',
-        n_jobs=-1,
-        verbose=1
-    )
-    
-    rf_grid.fit(X_train, y_train)
-    
-    print(f"\n최적 파라미터: {rf_grid.best_params_}")
-    print(f"최적 ROC-AUC (CV): {rf_grid.best_score_:.4f}")
-    
-    return rf_grid.best_estimator_
\ No newline at end of file
+
+    with measure(f"search:{method}", kind='fit', rows=len(y_train)) as record:
+        best_estimator, summary = run_param_search(X_train, y_train, method)
+        record['n_fits'] = summary['n_fits']
+        if summary['fit_seconds'] is not None:
+            # 워커에서 실행된 CV 학습 한 번당 평균 시간
+            record['mean_fit_seconds'] = summary['fit_seconds'] / summary['n_fits']
+
+    print(f"\n최적 파라미터: {summary['best_params']}")
+    print(f"최적 ROC-AUC (CV): {summary['best_score']:.4f}")
+    print(f"학습 횟수: {summary['n_fits']}회 | 소요 시간: {summary['elapsed']:.1f}초")
+
+    return best_estimator
+
+def compare_search_methods(X_train, y_train, X_test=None, y_test=None,
+                           methods=('warm_start', 'halving_grid', 'halving_random',
+                                    'bayes')):
+    """
+    전체 GridSearch 대비 탐색 엔진별 속도와 ROC-AUC 비교 리포트
+
+    Returns:
+    --------
+    report : DataFrame
+        Method, Fits, Time(s), Speedup, CV ROC-AUC, ΔCV ROC-AUC
+        (X_test가 주어지면 Test ROC-AUC 포함)
+    """
+    print("\n" + "="*70)
+    print("탐색 엔진 비교 (기준: 전체 GridSearchCV)")
+    print("="*70)
+
+    rows = []
+    for method in ('grid',) + tuple(m for m in methods if m != 'grid'):
+        estimator, summary = run_param_search(X_train, y_train, method, verbose=0)
+        row = {
+            'Method': method,
+            'Fits': summary['n_fits'],
+            'Time(s)': summary['elapsed'],
+            'CV ROC-AUC': summary['best_score']
+        }
+        if X_test is not None:
+            row['Test ROC-AUC'] = roc_auc_score(
+                y_test, estimator.predict_proba(X_test)[:, 1])
+        rows.append(row)
+
+    report = pd.DataFrame(rows)
+    baseline = report.iloc[0]
+    report.insert(3, 'Speedup', baseline['Time(s)'] / report['Time(s)'])
+    report['ΔCV ROC-AUC'] = report['CV ROC-AUC'] - baseline['CV ROC-AUC']
+
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    return report
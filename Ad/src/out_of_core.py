@@ -0,0 +1,194 @@
+# src/out_of_core.py
+import os
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.metrics import (accuracy_score, precision_score, recall_score,
+                             f1_score, roc_auc_score)
+from src.data_loader import iter_data_chunks
+from src.feature_engineering import FeaturePipeline, get_feature_columns
+from src.quantile_sketch import KLLSketch
+from config import (DATA_PATH, CHUNK_SIZE, RANDOM_STATE, TEST_SIZE, OOC_DIR,
+                    OOC_EPOCHS, OOC_HGB_MAX_ITER, QUANTILE_SKETCH_K)
+
+TARGET = 'Clicked on Ad'
+HASH_BUCKETS = 10000
+
+def hash_test_mask(chunk, test_size=TEST_SIZE, salt=RANDOM_STATE):
+    """
+    행 내용 해시로 test 여부 결정
+
+    같은 행은 항상 같은 쪽에 배정되므로 전체 데이터를 메모리에 올려
+    셔플하지 않고도 재현 가능한 train/test 분할을 얻는다.
+    """
+    hash_key = f"{salt:016d}"[-16:]
+    hashes = pd.util.hash_pandas_object(chunk, index=False, hash_key=hash_key)
+    return (hashes.values % HASH_BUCKETS) < int(test_size * HASH_BUCKETS)
+
+def _iter_blocks(n_rows, block_size, rng=None):
+    """메모리 맵 배열을 block_size 단위로 나누는 구간 (rng가 있으면 블록 순서 셔플)"""
+    starts = np.arange(0, n_rows, block_size)
+    if rng is not None:
+        starts = rng.permutation(starts)
+    for start in starts:
+        yield start, min(start + block_size, n_rows)
+
+def build_feature_memmaps(file_path=DATA_PATH, chunksize=CHUNK_SIZE,
+                          work_dir=OOC_DIR):
+    """
+    CSV를 청크 단위로 읽어 피처 행렬을 디스크 메모리 맵으로 저장
+
+    1차 패스: 해시 분할별 행 수와 High_Usage 중앙값(분위수 스케치) 계산
+    2차 패스: 피처 변환, StandardScaler.partial_fit(train), 메모리 맵 기록
+
+    Returns:
+    --------
+    data : dict
+        X_train, y_train, X_test, y_test (np.memmap), scaler, pipeline
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    feature_cols = get_feature_columns()
+
+    # 1차 패스
+    n_train = n_test = 0
+    usage_sketch = KLLSketch(QUANTILE_SKETCH_K, seed=RANDOM_STATE)
+    for chunk in iter_data_chunks(file_path, chunksize, categorical=False):
+        mask = hash_test_mask(chunk)
+        n_test += int(mask.sum())
+        n_train += int((~mask).sum())
+        usage_sketch.update(chunk['Daily Internet Usage'].to_numpy()[~mask])
+    pipeline = FeaturePipeline(feature_cols).fit_sketch(usage_sketch)
+    print(f"해시 분할: train {n_train:,}행 | test {n_test:,}행")
+
+    # HistGradientBoosting이 복사 없이 읽을 수 있도록 float64로 저장
+    def open_memmap(name, dtype, shape):
+        return np.lib.format.open_memmap(os.path.join(work_dir, name),
+                                         mode='w+', dtype=dtype, shape=shape)
+
+    n_features = len(feature_cols)
+    X_train = open_memmap('X_train.npy', np.float64, (n_train, n_features))
+    X_test = open_memmap('X_test.npy', np.float64, (n_test, n_features))
+    y_train = open_memmap('y_train.npy', np.int8, (n_train,))
+    y_test = open_memmap('y_test.npy', np.int8, (n_test,))
+
+    # 2차 패스
+    scaler = StandardScaler()
+    train_pos = test_pos = 0
+    for chunk in iter_data_chunks(file_path, chunksize, categorical=False):
+        mask = hash_test_mask(chunk)
+        features = pipeline.transform_frame(chunk)
+        labels = chunk[TARGET].to_numpy()
+
+        n = int((~mask).sum())
+        X_train[train_pos:train_pos + n] = features[~mask]
+        y_train[train_pos:train_pos + n] = labels[~mask]
+        if n:
+            scaler.partial_fit(features[~mask])
+        train_pos += n
+
+        n = int(mask.sum())
+        X_test[test_pos:test_pos + n] = features[mask]
+        y_test[test_pos:test_pos + n] = labels[mask]
+        test_pos += n
+
+    for array in (X_train, X_test, y_train, y_test):
+        array.flush()
+
+    return {
+        'X_train': X_train, 'y_train': y_train,
+        'X_test': X_test, 'y_test': y_test,
+        'scaler': scaler, 'pipeline': pipeline
+    }
+
+def _predict_proba_blocks(model, X, scaler=None, block_size=CHUNK_SIZE):
+    """메모리 맵 행렬을 블록 단위로 예측"""
+    probs = np.empty(len(X), dtype=np.float64)
+    for start, end in _iter_blocks(len(X), block_size):
+        block = np.asarray(X[start:end])
+        if scaler is not None:
+            block = scaler.transform(block)
+        probs[start:end] = model.predict_proba(block)[:, 1]
+    return probs
+
+def train_out_of_core(file_path=DATA_PATH, chunksize=CHUNK_SIZE, work_dir=OOC_DIR):
+    """
+    메모리보다 큰 데이터를 위한 out-of-core 학습
+
+    - SGD 로지스틱 회귀, Naive Bayes: 스케일링된 train 블록으로 partial_fit
+    - HistGradientBoosting: 디스크 메모리 맵 train 행렬을 그대로 학습
+    test는 해시로 분리해 두었으므로 전체 셔플이 필요 없다.
+
+    Returns:
+    --------
+    results_df : DataFrame
+        train_models와 같은 형식의 성능 비교표
+    trained_models : dict
+    data : dict
+        build_feature_memmaps 결과 (scaler, pipeline 포함)
+    """
+    print("\n" + "="*70)
+    print("Out-of-core 모델 학습")
+    print("="*70)
+
+    start = time.perf_counter()
+    data = build_feature_memmaps(file_path, chunksize, work_dir)
+    print(f"피처 메모리 맵 생성: {time.perf_counter() - start:.1f}초 ({work_dir})")
+
+    X_train, y_train = data['X_train'], data['y_train']
+    X_test, y_test = data['X_test'], np.asarray(data['y_test'])
+    scaler = data['scaler']
+    classes = np.array([0, 1])
+    rng = np.random.RandomState(RANDOM_STATE)
+
+    sgd = SGDClassifier(loss='log_loss', random_state=RANDOM_STATE)
+    nb = GaussianNB()
+    for epoch in range(OOC_EPOCHS):
+        for block_start, block_end in _iter_blocks(len(X_train), chunksize, rng):
+            block = scaler.transform(np.asarray(X_train[block_start:block_end]))
+            labels = np.asarray(y_train[block_start:block_end])
+            sgd.partial_fit(block, labels, classes=classes)
+            if epoch == 0:
+                nb.partial_fit(block, labels, classes=classes)
+
+    hgb = HistGradientBoostingClassifier(max_iter=OOC_HGB_MAX_ITER,
+                                         early_stopping=False,
+                                         random_state=RANDOM_STATE)
+    hgb.fit(X_train, y_train)
+
+    trained_models = {
+        'SGD Logistic Regression': (sgd, scaler),
+        'Naive Bayes': (nb, scaler),
+        'HistGradientBoosting': (hgb, None)
+    }
+
+    results = []
+    for name, (model, model_scaler) in trained_models.items():
+        y_prob = _predict_proba_blocks(model, X_test, model_scaler, chunksize)
+        y_pred = (y_prob > 0.5).astype(int)
+        results.append({
+            'Model': name,
+            'Accuracy': accuracy_score(y_test, y_pred),
+            'Precision': precision_score(y_test, y_pred),
+            'Recall': recall_score(y_test, y_pred),
+            'F1-Score': f1_score(y_test, y_pred),
+            'ROC-AUC': roc_auc_score(y_test, y_prob)
+        })
+
+    results_df = pd.DataFrame(results).sort_values('ROC-AUC', ascending=False)
+    print(f"\n전체 소요 시간: {time.perf_counter() - start:.1f}초")
+    print(results_df.to_string(index=False))
+
+    return results_df, {name: model for name, (model, _) in trained_models.items()}, data
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Out-of-core 광고 클릭 모델 학습')
+    parser.add_argument('--file', default=DATA_PATH, help='입력 CSV')
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    train_out_of_core(args.file, args.chunksize)
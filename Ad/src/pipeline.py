@@ -0,0 +1,186 @@
+# src/pipeline.py
+import os
+
+import hashlib
+import json
+import pickle
+import joblib
+import numpy as np
+import pandas as pd
+import config
+from config import CACHE_DIR
+from src.profiling import measure
+
+ARTIFACT_DIR = os.path.join(CACHE_DIR, 'artifacts')
+
+def hash_data(obj):
+    """DataFrame/Series/ndarray/일반 객체의 내용 기반 해시"""
+    digest = hashlib.sha256()
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        if isinstance(obj, pd.DataFrame):
+            digest.update(repr(obj.columns.tolist()).encode())
+            digest.update(repr(obj.dtypes.astype(str).tolist()).encode())
+        else:
+            digest.update(repr((obj.name, str(obj.dtype))).encode())
+    elif isinstance(obj, np.ndarray):
+        digest.update(repr((obj.shape, str(obj.dtype))).encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    else:
+        digest.update(pickle.dumps(obj, protocol=4))
+    return digest.hexdigest()
+
+def hash_file(file_path):
+    """소스 파일 내용 해시 (코드가 바뀌면 아티팩트 무효화)"""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class ArtifactStore:
+    """
+    내용 주소 기반(content-addressed) 아티팩트 저장소
+
+    키는 단계 이름, 상위 단계 키, 관련 config 값, 소스 코드 해시로부터
+    계산되므로 입력이 하나라도 바뀌면 자동으로 새 키가 된다.
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, enabled=True):
+        self.root = root
+        self.enabled = enabled
+        os.makedirs(root, exist_ok=True)
+
+    def key(self, *parts):
+        payload = json.dumps(parts, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, stage_name, key):
+        return os.path.join(self.root, f"{stage_name}-{key[:20]}.joblib")
+
+    def load(self, stage_name, key):
+        """저장된 아티팩트 반환 (없으면 None)"""
+        path = self.path(stage_name, key)
+        if not self.enabled or not os.path.exists(path):
+            return None
+        return joblib.load(path)
+
+    def save(self, stage_name, key, outputs):
+        if not self.enabled:
+            return
+        path = self.path(stage_name, key)
+        tmp_path = path + '.tmp'
+        joblib.dump(outputs, tmp_path)
+        os.replace(tmp_path, path)
+
+class Stage:
+    """
+    파이프라인 단계 정의
+
+    Parameters:
+    -----------
+    number : int
+        단계 번호 (실행 순서)
+    name : str
+        CLI와 아티팩트 파일명에 쓰이는 짧은 이름
+    title : str
+        출력용 단계 제목
+    func : callable
+        ctx(dict)를 받아 출력 dict를 반환하는 함수
+    deps : tuple of int
+        의존하는 단계 번호
+    cache : bool
+        출력을 아티팩트로 저장하고 재사용할지 여부
+    config_keys : tuple of str
+        캐시 키에 포함할 config.py 값 이름
+    sources : tuple of str
+        캐시 키에 포함할 소스 파일 경로
+    """
+
+    def __init__(self, number, name, title, func, deps=(), cache=False,
+                 config_keys=(), sources=()):
+        self.number = number
+        self.name = name
+        self.title = title
+        self.func = func
+        self.deps = tuple(deps)
+        self.cache = cache
+        self.config_keys = tuple(config_keys)
+        self.sources = tuple(sources)
+
+class Pipeline:
+    """의존 관계(DAG)에 따라 단계를 실행하고 캐시된 단계는 건너뛰는 실행기"""
+
+    def __init__(self, stages, store=None):
+        self.stages = sorted(stages, key=lambda s: s.number)
+        self.by_number = {s.number: s for s in self.stages}
+        self.store = store if store is not None else ArtifactStore()
+
+    def resolve(self, value):
+        """단계 번호 또는 이름을 번호로 변환"""
+        if isinstance(value, int) or str(value).isdigit():
+            number = int(value)
+            if number not in self.by_number:
+                raise ValueError(f"알 수 없는 단계 번호: {value}")
+            return number
+        for stage in self.stages:
+            if stage.name == value:
+                return stage.number
+        raise ValueError(f"알 수 없는 단계 이름: {value}")
+
+    def plan(self, only=None, from_step=None):
+        """선택된 단계와 그 의존 단계를 실행 순서대로 반환"""
+        if only:
+            selected = {self.resolve(v) for v in only}
+        else:
+            start = self.resolve(from_step) if from_step is not None else 0
+            selected = {s.number for s in self.stages if s.number >= start}
+
+        needed = set()
+        stack = list(selected)
+        while stack:
+            number = stack.pop()
+            if number in needed:
+                continue
+            needed.add(number)
+            stack.extend(self.by_number[number].deps)
+
+        return [s for s in self.stages if s.number in needed], selected
+
+    def run(self, only=None, from_step=None, ctx=None):
+        """단계 실행. ctx에 각 단계의 출력이 누적된다."""
+        ctx = {} if ctx is None else ctx
+        keys = {}
+        plan, selected = self.plan(only, from_step)
+        total = len(self.stages)
+
+        for stage in plan:
+            suffix = '' if stage.number in selected else ' (의존 단계)'
+            print(f"\n[Step {stage.number}/{total}] {stage.title}{suffix}")
+            print("-" * 70)
+
+            key = self.store.key(
+                stage.name,
+                [keys[d] for d in stage.deps],
+                {k: getattr(config, k) for k in stage.config_keys},
+                [hash_file(p) for p in stage.sources]
+            )
+
+            with measure(f"{stage.number}.{stage.name}", kind='step') as record:
+                outputs = self.store.load(stage.name, key) if stage.cache else None
+                record['cached'] = outputs is not None
+                if outputs is not None:
+                    print(f"  [캐시 사용] {stage.name} ({key[:12]})")
+                else:
+                    outputs = stage.func(ctx) or {}
+                    if stage.cache:
+                        self.store.save(stage.name, key, outputs)
+                    else:
+                        # 캐시하지 않는 단계는 출력 내용으로 키를 정한다
+                        key = self.store.key(stage.name, sorted(
+                            (k, hash_data(v)) for k, v in outputs.items()))
+                # 처리량 기준 행 수: 단계가 다룬 데이터프레임
+                df = outputs.get('df', ctx.get('df'))
+                record['rows'] = len(df) if df is not None else None
+
+            ctx.update(outputs)
+            keys[stage.number] = key
+
+        return ctx
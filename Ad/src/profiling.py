@@ -0,0 +1,362 @@
+# src/profiling.py
+import sys
+import os
+
+import cProfile
+import json
+import platform
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from importlib import metadata
+import config
+from config import REPORT_DIR, PROFILE_TOP_FUNCTIONS, PROFILE_RSS_INTERVAL
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없다
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_active = None
+
+def _maxrss_mb(who):
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+def peak_rss_mb():
+    """
+    프로세스 수명 전체의 최대 RSS(MB, 실행 리포트 요약용)
+
+    resource.getrusage의 ru_maxrss를 쓰고 (Linux는 KB, macOS는 byte 단위),
+    resource가 없는 Windows에서는 psutil의 peak_wset을 쓴다. 둘 다 없으면 None.
+    구간별 메모리는 이 값이 아니라 current_rss_mb() 표본으로 잰다.
+    """
+    if resource is not None:
+        return _maxrss_mb(resource.RUSAGE_SELF)
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 ** 2
+    return None
+
+def children_peak_rss_mb():
+    """종료된 자식 프로세스 중 가장 큰 최대 RSS(MB, RUSAGE_CHILDREN, 없으면 None)"""
+    return _maxrss_mb(resource.RUSAGE_CHILDREN) if resource is not None else None
+
+def current_rss_mb():
+    """
+    현재 RSS(MB)
+
+    psutil이 있으면 psutil, 없으면 Linux의 /proc/self/statm을 읽는다.
+    둘 다 없으면 None.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+class _Span:
+    """열린 measure() 구간 하나의 최대 RSS"""
+
+    def __init__(self, rss):
+        self.peak = rss
+
+class _RSSSampler:
+    """
+    열린 measure() 구간들의 최대 RSS를 표본 추출하는 데몬 스레드
+
+    ru_maxrss는 프로세스 수명 전체의 최대값이라 앞 구간보다 적게 쓰는
+    구간은 증가량이 0으로 나온다. 구간이 하나라도 열려 있는 동안
+    interval초마다 현재 RSS를 읽어 열린 구간 모두의 최대값을 갱신하고,
+    구간이 없으면 멈춰 기다린다.
+    """
+
+    def __init__(self, interval=PROFILE_RSS_INTERVAL):
+        self.interval = interval
+        self.spans = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def open(self, rss):
+        span = _Span(rss)
+        with self.lock:
+            self.spans.append(span)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='rss-sampler',
+                                               daemon=True)
+                self.thread.start()
+        self.wake.set()
+        return span
+
+    def close(self, span, rss):
+        """구간을 닫고 구간 안 최대 RSS 반환 (종료 시점 값 포함)"""
+        with self.lock:
+            self.spans = [s for s in self.spans if s is not span]
+        return span.peak if rss is None else max(span.peak, rss)
+
+    def _run(self):
+        while True:
+            self.wake.wait()
+            rss = current_rss_mb()
+            with self.lock:
+                if not self.spans:
+                    self.wake.clear()
+                    continue
+                for span in self.spans:
+                    span.peak = max(span.peak, rss)
+            time.sleep(self.interval)
+
+_sampler = _RSSSampler()
+
+def _reset_sampler():
+    """fork된 자식 프로세스는 부모의 열린 구간/스레드 없이 새 표본기를 쓴다"""
+    global _sampler
+    _sampler = _RSSSampler()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_sampler)
+
+def _library_versions():
+    """설치된 라이브러리 버전 (패키지 메타데이터에서 읽으므로 import하지 않는다)"""
+    versions = {}
+    for dist in ('numpy', 'pandas', 'scikit-learn', 'scipy', 'joblib', 'matplotlib'):
+        try:
+            versions[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            versions[dist] = None
+    return versions
+
+def _config_values():
+    """config.py의 대문자 설정값 (JSON으로 표현 가능한 값)"""
+    values = {}
+    for key in dir(config):
+        if not key.isupper():
+            continue
+        value = getattr(config, key)
+        try:
+            json.dumps(value)
+        except TypeError:
+            value = repr(value)
+        values[key] = value
+    return values
+
+def _top_functions(stats, top):
+    """pstats.Stats에서 누적 시간 상위 함수 목록"""
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({'function': f"{os.path.basename(filename)}:{line}({func})",
+                     'calls': nc, 'total_seconds': tt, 'cumulative_seconds': ct})
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:top]
+
+class RunProfiler:
+    """
+    실행 한 번의 구간별 측정 기록
+
+    measure() 구간(파이프라인 단계, 모델 학습, 그래프 렌더링)마다 wall time,
+    CPU time(현재 프로세스), 구간 시작 RSS 대비 구간 안 최대 RSS 증가량,
+    처리 행 수/초를 기록하고 JSON 리포트로 저장한다. 워커 프로세스의
+    학습/렌더링은 워커 안에서 측정해 돌려받은 기록으로 남는다 (pid가
+    다르다). cprofile=True이면 단계('step') 구간마다
+    cProfile을 켜서 누적 시간 상위 함수를 함께 남긴다.
+    """
+
+    def __init__(self, cprofile=False, top=PROFILE_TOP_FUNCTIONS):
+        self.cprofile = cprofile
+        self.top = top
+        self.records = []
+        self.stack = []
+        self.stats = None
+        self._profiling = False
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.run_id = time.strftime('%Y%m%d-%H%M%S')
+        self._start = time.perf_counter()
+        self.wall_seconds = None
+        self.report_path = None
+
+    def add(self, record):
+        """다른 프로세스에서 측정한 기록 추가 (현재 구간을 부모로 지정)"""
+        if record.get('parent') is None:
+            record['parent'] = self.stack[-1] if self.stack else None
+        self.records.append(record)
+
+    def _start_cprofile(self, kind):
+        if not self.cprofile or kind != 'step' or self._profiling:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # 다른 프로파일러가 이미 실행 중
+            return None
+        self._profiling = True
+        return profile
+
+    def _stop_cprofile(self, profile, record):
+        profile.disable()
+        self._profiling = False
+        stats = pstats.Stats(profile)
+        record['profile'] = _top_functions(stats, self.top)
+        if self.stats is None:
+            self.stats = stats
+        else:
+            self.stats.add(profile)
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def report(self):
+        """JSON으로 저장할 실행 리포트 dict"""
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at,
+            'wall_seconds': self.wall_seconds,
+            'peak_rss_mb': peak_rss_mb(),
+            'children_peak_rss_mb': children_peak_rss_mb(),
+            'argv': sys.argv,
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'machine': platform.machine(),
+                'cpu_count': os.cpu_count(),
+                'libraries': _library_versions(),
+            },
+            'config': _config_values(),
+            'records': self.records,
+        }
+
+    def save(self, report_dir=REPORT_DIR):
+        """
+        리포트를 report_dir/run-<시각>.json으로 저장
+
+        cProfile을 켰으면 전체 단계를 합친 통계를 같은 이름의 .prof로도
+        저장한다 (snakeviz 등으로 확인).
+        """
+        os.makedirs(report_dir, exist_ok=True)
+        path = os.path.join(report_dir, f"run-{self.run_id}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False, default=str)
+        if self.stats is not None:
+            self.stats.dump_stats(os.path.splitext(path)[0] + '.prof')
+        self.report_path = path
+        return path
+
+    def summary(self, kind=None):
+        """구간별 시간/메모리 요약 표 (print용 문자열, *는 캐시에서 로드한 단계)"""
+        records = [r for r in self.records if kind is None or r['kind'] == kind]
+        lines = [f"{'구간':28s} {'wall(s)':>9s} {'CPU(s)':>9s} {'최대 RSS(MB)':>12s} "
+                 f"{'RSS 증가':>9s} {'행/초':>12s}"]
+        for r in records:
+            name = ('  ' if r.get('parent') else '') + r['name']
+            if r.get('cached'):
+                name += ' *'
+            rss = '-' if r['peak_rss_mb'] is None else f"{r['peak_rss_mb']:.1f}"
+            growth = ('-' if r['peak_rss_growth_mb'] is None
+                      else f"{r['peak_rss_growth_mb']:+.1f}")
+            rate = '-' if r['rows_per_second'] is None else f"{r['rows_per_second']:,.0f}"
+            lines.append(f"{name[:28]:28s} {r['wall_seconds']:9.3f} "
+                         f"{r['cpu_seconds']:9.3f} {rss:>12s} {growth:>9s} {rate:>12s}")
+        return '\n'.join(lines)
+
+def _finish_record(record, wall_start, cpu_start, rss_start, span):
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    rss_end = current_rss_mb()
+    peak = _sampler.close(span, rss_end) if span is not None else None
+    rows = record.get('rows')
+    record.update({
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'cpu_utilization': cpu / wall if wall > 0 else None,
+        'rss_start_mb': rss_start,
+        'rss_end_mb': rss_end,
+        'peak_rss_mb': peak,
+        'peak_rss_growth_mb': None if peak is None else peak - rss_start,
+        'rss_growth_mb': None if peak is None or rss_end is None else rss_end - rss_start,
+        'rows_per_second': rows / wall if rows and wall > 0 else None,
+    })
+
+@contextmanager
+def measure(name, kind='step', rows=None, **info):
+    """
+    구간 하나의 wall/CPU 시간과 RSS 측정
+
+    구간 시작/종료 시점의 현재 RSS와, 구간이 열려 있는 동안 표본 추출한
+    최대 RSS를 기록한다. peak_rss_growth_mb(구간 안 최대 - 시작)는 앞
+    구간의 최대값과 무관하게 이 구간이 늘린 메모리이고, rss_growth_mb는
+    종료 시점까지 남은 증가량이다.
+
+    기록 dict를 yield하므로 블록 안에서 rows나 부가 정보를 채울 수 있다.
+    profile_run() 안이면 활성 RunProfiler에 기록이 추가되고, 밖이면
+    측정만 하고 버려진다 (워커 프로세스에서는 profiled_call 사용).
+    CPU time과 RSS는 측정한 프로세스(pid) 기준이므로 loky 워커에서
+    실행된 연산은 부모 구간에 포함되지 않는다 (cpu_utilization이 낮게 나온다).
+    """
+    profiler = _active
+    record = {'name': name, 'kind': kind, 'rows': rows, 'pid': os.getpid(),
+              'parent': profiler.stack[-1] if profiler and profiler.stack else None}
+    record.update(info)
+    profile = profiler._start_cprofile(kind) if profiler else None
+    if profiler:
+        profiler.stack.append(name)
+    rss_start = current_rss_mb()
+    span = _sampler.open(rss_start) if rss_start is not None else None
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        _finish_record(record, wall_start, cpu_start, rss_start, span)
+        if profiler:
+            profiler.stack.pop()
+            if profile is not None:
+                profiler._stop_cprofile(profile, record)
+            profiler.records.append(record)
+
+def profiled_call(name, kind, rows, func, *args, **kwargs):
+    """
+    func(*args, **kwargs)를 측정하며 실행하고 (결과, 기록) 반환
+
+    joblib 워커에서 실행한 뒤 부모 프로세스에서 add_record()로 활성
+    RunProfiler에 넘긴다.
+    """
+    with measure(name, kind, rows) as measured:
+        result = func(*args, **kwargs)
+    return result, measured
+
+def add_record(measured):
+    """profiled_call 기록을 활성 RunProfiler에 추가 (없으면 무시)"""
+    if _active is not None:
+        _active.add(measured)
+
+@contextmanager
+def profile_run(cprofile=False, save=True, report_dir=REPORT_DIR):
+    """
+    블록 안의 measure() 구간을 모아 종료 시 JSON 실행 리포트로 저장
+
+    예외로 중단되어도 그때까지의 기록은 저장한다.
+    """
+    global _active
+    if _active is not None:
+        # 중첩된 경우 바깥 블록이 저장한다
+        yield _active
+        return
+
+    profiler = RunProfiler(cprofile=cprofile)
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = None
+        profiler.finish()
+        if save:
+            profiler.save(report_dir)
@@ -0,0 +1,187 @@
+# src/rendering.py
+import os
+
+import hashlib
+import inspect
+import json
+import pickle
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from joblib import effective_n_jobs
+from src.profiling import measure, profiled_call, add_record
+from config import (PLOTS_DIR, CACHE_DIR, SHOW_PLOTS, SAVE_PLOTS, FIGURE_DPI,
+                    PLOT_FONT, N_JOBS)
+
+# 한글 폰트 후보 (앞에서부터 설치된 폰트를 사용)
+FONT_CANDIDATES = ['Malgun Gothic', 'AppleGothic', 'NanumGothic', 'NanumBarunGothic',
+                   'Noto Sans CJK KR', 'Noto Sans KR', 'DejaVu Sans']
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'plot_manifest.json')
+
+_font = None
+_collector = None
+
+def pyplot():
+    """
+    matplotlib.pyplot을 처음 필요할 때 import (SHOW_PLOTS가 아니면 Agg 백엔드)
+
+    그래프를 렌더링하지 않는 실행(스코어링, 학습만 등)은 matplotlib을
+    불러오지 않는다. 그리기 함수는 모듈 수준 import 대신 이 함수를 쓴다.
+    """
+    import matplotlib
+    if not SHOW_PLOTS:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def resolve_font():
+    """설치된 폰트 목록에서 사용할 폰트 이름 결정 (없는 폰트 지정으로 인한 fallback 탐색 방지)"""
+    global _font
+    if _font is None:
+        from matplotlib import font_manager
+        plt = pyplot()
+        available = {f.name for f in font_manager.fontManager.ttflist}
+        candidates = ([PLOT_FONT] if PLOT_FONT else []) + FONT_CANDIDATES
+        _font = next((name for name in candidates if name in available),
+                     plt.rcParams['font.family'][0])
+    return _font
+
+def configure_fonts(font=None):
+    plt = pyplot()
+    plt.rcParams['font.family'] = font or resolve_font()
+    plt.rcParams['axes.unicode_minus'] = False
+
+class PlotSpec:
+    """
+    그래프 하나의 렌더링 명세
+
+    draw는 payload만 받아 현재 figure를 그리는 모듈 수준 함수여야
+    프로세스 풀로 전달(pickle)할 수 있다.
+    """
+
+    def __init__(self, filename, draw, payload, dpi=FIGURE_DPI):
+        self.filename = filename
+        self.draw = draw
+        self.payload = payload
+        self.dpi = dpi
+
+    @property
+    def path(self):
+        return os.path.join(PLOTS_DIR, self.filename)
+
+    def digest(self, font):
+        """입력 데이터 + 그리기 코드 + 렌더링 설정 해시"""
+        h = hashlib.sha256()
+        h.update(pickle.dumps((self.draw.__module__, self.draw.__qualname__,
+                               self.payload, self.dpi, font), protocol=4))
+        h.update(inspect.getsource(self.draw).encode('utf-8'))
+        return h.hexdigest()
+
+def _load_manifest():
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def _save_manifest(manifest):
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+def _init_worker(font):
+    import matplotlib
+    matplotlib.use('Agg')
+    configure_fonts(font)
+
+def _render(spec):
+    """spec 하나를 그려 PNG로 저장 (워커 프로세스에서도 실행)"""
+    plt = pyplot()
+    spec.draw(spec.payload)
+    plt.savefig(spec.path, dpi=spec.dpi, bbox_inches='tight')
+    plt.close('all')
+    return spec.path
+
+def _is_fresh(spec, digest, manifest):
+    return manifest.get(spec.filename) == digest and os.path.exists(spec.path)
+
+def render_specs(specs, n_jobs=N_JOBS):
+    """
+    수집된 그래프를 Agg 백엔드 프로세스 풀에서 동시에 렌더링
+
+    입력 데이터 해시가 이전 렌더링과 같고 파일이 남아 있으면 건너뛴다.
+    """
+    if not specs:
+        return []
+    font = resolve_font()
+    manifest = _load_manifest()
+    digests = {spec.filename: spec.digest(font) for spec in specs}
+    todo = [spec for spec in specs
+            if not _is_fresh(spec, digests[spec.filename], manifest)]
+
+    skipped = len(specs) - len(todo)
+    if skipped:
+        print(f"\n[그래프 변경 없음] {skipped}개 건너뜀")
+
+    n_workers = min(len(todo), effective_n_jobs(n_jobs))
+    if n_workers > 1:
+        # 렌더링 시간/메모리는 워커 안에서 측정해 결과와 함께 돌려받는다
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(font,)) as executor:
+            measured = list(executor.map(profiled_call, *zip(*[
+                (f"render:{spec.filename}", 'render', None, _render, spec)
+                for spec in todo])))
+        paths = []
+        for path, render_record in measured:
+            add_record(render_record)
+            paths.append(path)
+    else:
+        configure_fonts(font)
+        paths = []
+        for spec in todo:
+            with measure(f"render:{spec.filename}", kind='render'):
+                paths.append(_render(spec))
+
+    for spec, path in zip(todo, paths):
+        manifest[spec.filename] = digests[spec.filename]
+        print(f"[그래프 저장됨] {path}")
+    _save_manifest(manifest)
+    return paths
+
+def submit(filename, draw, payload, dpi=FIGURE_DPI):
+    """
+    그래프 렌더링 요청
+
+    collect_plots() 안에서는 명세만 모아 두었다가 블록이 끝날 때 한꺼번에
+    렌더링하고, 그 밖에서는 바로 렌더링한다. SHOW_PLOTS이면 화면에 띄운다.
+    """
+    spec = PlotSpec(filename, draw, payload, dpi)
+    if SHOW_PLOTS:
+        plt = pyplot()
+        configure_fonts()
+        draw(payload)
+        if SAVE_PLOTS:
+            plt.savefig(spec.path, dpi=dpi, bbox_inches='tight')
+            print(f"\n[그래프 저장됨] {spec.path}")
+        plt.show()
+    elif not SAVE_PLOTS:
+        return
+    elif _collector is not None:
+        _collector.append(spec)
+    else:
+        render_specs([spec], n_jobs=1)
+
+@contextmanager
+def collect_plots(n_jobs=N_JOBS):
+    """블록 안에서 요청된 그래프를 모았다가 정상 종료 시 병렬로 렌더링"""
+    global _collector
+    if _collector is not None:
+        # 중첩된 경우 바깥 블록이 렌더링한다
+        yield _collector
+        return
+
+    _collector = []
+    try:
+        yield _collector
+        specs = _collector
+    finally:
+        _collector = None
+    with measure('render_plots', kind='render', plots=len(specs)):
+        render_specs(specs, n_jobs)
@@ -0,0 +1,252 @@
+# src/scoring.py
+import sys
+import os
+
+import argparse
+import json
+import time
+import warnings
+import joblib
+import numpy as np
+import pandas as pd
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.feature_engineering import INPUT_COLUMNS
+from config import (MODEL_BUNDLE_PATH, SCORING_BATCH_SIZE, SCORING_HOST,
+                    SCORING_PORT)
+
+# 스코어링 입력에 필요한 원본 컬럼
+RAW_COLUMNS = INPUT_COLUMNS
+
+def save_model_bundle(model, scaler, feature_pipeline,
+                      path=MODEL_BUNDLE_PATH, scaled=False, threshold=None,
+                      serve_nothing=False, metadata=None):
+    """
+    스코어링용 모델 번들 저장
+
+    Parameters:
+    -----------
+    model : 학습된 분류 모델
+    scaler : StandardScaler
+        prepare_data에서 학습된 스케일러
+    feature_pipeline : FeaturePipeline
+        학습 데이터로 fit된 피처 파이프라인 (피처 순서와 High_Usage 기준 포함)
+    scaled : bool
+        모델이 스케일링된 입력으로 학습되었는지 여부
+    threshold : float, optional
+        노출 임계값 (확률 >= threshold이면 decision=1). 있으면 스코어링
+        결과에 decision이 함께 출력된다.
+    serve_nothing : bool
+        이익이 나는 임계값이 없어 아무에게도 노출하지 않는 결정
+        (decision이 모두 0, threshold는 None)
+    metadata : dict, optional
+        학습 시각, 성능 등 부가 정보
+    """
+    bundle = {
+        'model': model,
+        'scaler': scaler,
+        'feature_pipeline': feature_pipeline,
+        'feature_cols': list(feature_pipeline.feature_cols),
+        'scaled': scaled,
+        'threshold': threshold,
+        'serve_nothing': serve_nothing,
+        'metadata': dict(metadata or {}, created_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(bundle, path)
+    print(f"모델 번들 저장: {path}")
+    return path
+
+def load_model_bundle(path=MODEL_BUNDLE_PATH):
+    """저장된 모델 번들 로드"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"모델 번들이 없습니다: {path} (main.py를 먼저 실행하세요)")
+    return joblib.load(path)
+
+def score_frame(bundle, df):
+    """원본 컬럼을 가진 DataFrame 한 배치의 클릭 확률 계산 (벡터 연산)"""
+    missing = [col for col in RAW_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼 누락: {missing}")
+
+    X = bundle['feature_pipeline'].transform_frame(df)
+    with warnings.catch_warnings():
+        # 모델은 DataFrame으로 학습됐지만 피처 순서가 같은 행렬을 그대로 넣는다
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        if bundle['scaled']:
+            X = bundle['scaler'].transform(X)
+        return bundle['model'].predict_proba(X)[:, 1]
+
+def decide(bundle, probs):
+    """번들의 노출 임계값으로 노출 여부 결정 (임계값이 없으면 None)"""
+    if bundle.get('serve_nothing'):
+        return np.zeros(len(probs), dtype=np.int8)
+    threshold = bundle.get('threshold')
+    if threshold is None:
+        return None
+    return (probs >= threshold).astype(np.int8)
+
+def score_csv(bundle, input_path, output, batch_size=SCORING_BATCH_SIZE,
+              id_column=None):
+    """
+    CSV를 마이크로 배치로 읽어 click_probability 컬럼을 CSV로 출력
+
+    번들에 노출 임계값이 있으면 decision(0/1) 컬럼도 출력한다.
+    """
+    n_rows = 0
+    start = time.perf_counter()
+    usecols = RAW_COLUMNS + ([id_column] if id_column else [])
+    header = True
+    handle = open(output, 'w', newline='', encoding='utf-8') \
+        if isinstance(output, str) else output
+    try:
+        with pd.read_csv(input_path, usecols=usecols,
+                         chunksize=batch_size) as reader:
+            for chunk in reader:
+                probs = score_frame(bundle, chunk)
+                result = pd.DataFrame({'click_probability': probs})
+                decisions = decide(bundle, probs)
+                if decisions is not None:
+                    result['decision'] = decisions
+                if id_column:
+                    result.insert(0, id_column, chunk[id_column].values)
+                result.to_csv(handle, index=False, header=header,
+                              float_format='%.6f')
+                header = False
+                n_rows += len(chunk)
+    finally:
+        if handle is not output:
+            handle.close()
+    return n_rows, time.perf_counter() - start
+
+def _score_records(bundle, records):
+    """JSON 레코드 리스트 스코어링 (id 필드가 있으면 함께 반환)"""
+    probs = score_frame(bundle, pd.DataFrame.from_records(records))
+    decisions = decide(bundle, probs)
+    results = []
+    for i, (record, prob) in enumerate(zip(records, probs)):
+        item = {'click_probability': round(float(prob), 6)}
+        if decisions is not None:
+            item['decision'] = bool(decisions[i])
+        if 'id' in record:
+            item = {'id': record['id'], **item}
+        results.append(item)
+    return results
+
+def score_jsonl(bundle, in_stream, out_stream, batch_size=SCORING_BATCH_SIZE):
+    """JSON-lines 스트림을 마이크로 배치로 스코어링"""
+    n_rows = 0
+    start = time.perf_counter()
+    batch = []
+
+    def flush():
+        for item in _score_records(bundle, batch):
+            out_stream.write(json.dumps(item) + '\n')
+        out_stream.flush()
+
+    for line in in_stream:
+        line = line.strip()
+        if not line:
+            continue
+        batch.append(json.loads(line))
+        if len(batch) >= batch_size:
+            flush()
+            n_rows += len(batch)
+            batch = []
+    if batch:
+        flush()
+        n_rows += len(batch)
+    return n_rows, time.perf_counter() - start
+
+def serve(bundle, host=SCORING_HOST, port=SCORING_PORT):
+    """
+    미리 로드한 모델로 로컬 HTTP 스코어링 엔드포인트 실행
+
+    POST /score : JSON 객체, JSON 배열 또는 JSON-lines 본문
+    GET /health : 상태 확인
+    """
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send_json(200, {'status': 'ok',
+                                      'threshold': bundle.get('threshold'),
+                                      'serve_nothing': bool(bundle.get('serve_nothing')),
+                                      'metadata': bundle['metadata']})
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/score':
+                self._send_json(404, {'error': 'not found'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                text = self.rfile.read(length).decode('utf-8').strip()
+                try:
+                    payload = json.loads(text)
+                    records = payload if isinstance(payload, list) else [payload]
+                except json.JSONDecodeError:
+                    records = [json.loads(line) for line in text.splitlines()
+                               if line.strip()]
+                self._send_json(200, {'results': _score_records(bundle, records)})
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), ScoringHandler)
+    print(f"스코어링 서버 실행: http://{host}:{port}/score (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='광고 클릭 확률 스코어링')
+    parser.add_argument('--bundle', default=MODEL_BUNDLE_PATH, help='모델 번들 경로')
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    csv_parser = sub.add_parser('csv', help='CSV 파일 배치 스코어링')
+    csv_parser.add_argument('input', help='입력 CSV')
+    csv_parser.add_argument('-o', '--output', default='-',
+                            help='출력 CSV (기본: stdout)')
+    csv_parser.add_argument('--id-column', default=None,
+                            help='결과에 함께 출력할 식별자 컬럼')
+    csv_parser.add_argument('--batch-size', type=int, default=SCORING_BATCH_SIZE)
+
+    jsonl_parser = sub.add_parser('jsonl', help='stdin JSON-lines 스트림 스코어링')
+    jsonl_parser.add_argument('--batch-size', type=int, default=SCORING_BATCH_SIZE)
+
+    serve_parser = sub.add_parser('serve', help='로컬 HTTP 엔드포인트 실행')
+    serve_parser.add_argument('--host', default=SCORING_HOST)
+    serve_parser.add_argument('--port', type=int, default=SCORING_PORT)
+
+    args = parser.parse_args(argv)
+    bundle = load_model_bundle(args.bundle)
+
+    if args.mode == 'csv':
+        output = sys.stdout if args.output == '-' else args.output
+        n_rows, elapsed = score_csv(bundle, args.input, output,
+                                    args.batch_size, args.id_column)
+    elif args.mode == 'jsonl':
+        n_rows, elapsed = score_jsonl(bundle, sys.stdin, sys.stdout,
+                                      args.batch_size)
+    else:
+        serve(bundle, args.host, args.port)
+        return
+
+    print(f"스코어링 완료: {n_rows:,}행 | {elapsed:.2f}초 | "
+          f"{n_rows / max(elapsed, 1e-9):,.0f}행/초", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+# src/segment_cube.py
+import sys
+import os
+
+import argparse
+import itertools
+import re
+import time
+import numpy as np
+import pandas as pd
+from src.quantile_sketch import KLLSketch
+from config import (DATA_PATH, RANDOM_STATE, SEGMENT_CUBE_BINS,
+                    SEGMENT_AGE_THRESHOLD, SEGMENT_TIME_THRESHOLD,
+                    SEGMENT_INCOME_THRESHOLD, SEGMENT_INTERNET_THRESHOLD)
+
+TARGET = 'Clicked on Ad'
+
+# 큐브 차원: 임계값 이름 → 원본 컬럼
+DIMENSIONS = {
+    'age': 'Age',
+    'time': 'Daily Time Spent on Site',
+    'income': 'Area Income',
+    'usage': 'Daily Internet Usage',
+}
+
+# 구간 경계에 항상 포함할 config 임계값 (이 값의 질의는 항상 정확)
+DEFAULT_THRESHOLDS = {
+    'age': [SEGMENT_AGE_THRESHOLD],
+    'time': [SEGMENT_TIME_THRESHOLD],
+    'income': [SEGMENT_INCOME_THRESHOLD],
+    'usage': [SEGMENT_INTERNET_THRESHOLD],
+}
+
+_BOUND_PATTERN = re.compile(r'^(%s)_(ge|le)$' % '|'.join(DIMENSIONS))
+
+# refine()가 만드는 임계값 격자의 최대 칸 수 (넘으면 조합을 나눠 여러 번 만든다)
+REFINE_MAX_CELLS = 1 << 22
+
+def dimension_edges(values, max_bins=SEGMENT_CUBE_BINS, thresholds=(),
+                    seed=RANDOM_STATE):
+    """
+    한 차원의 구간 경계 (오름차순, 마지막 값 = 최대값)
+
+    고유값이 max_bins 이하이면 고유값을 그대로 경계로 써서 모든 임계값
+    질의가 정확하고, 많으면 분위수 스케치의 동일 빈도 경계에 thresholds와
+    그 직전 관측값을 더한다. values 대신 KLLSketch를 넘길 수도 있다.
+    """
+    if isinstance(values, KLLSketch):
+        sketch = values
+    else:
+        values = np.asarray(values, dtype=np.float64)
+        unique = np.unique(values[~np.isnan(values)])
+        if len(unique) <= max_bins:
+            return unique
+        sketch = KLLSketch.from_values(values, seed=seed)
+    edges = sketch.bin_edges(max_bins)
+    # <= t 질의는 경계 t, >= t 질의는 t보다 작은 경계가 필요하다
+    extra = [t for t in thresholds if sketch.min <= t <= sketch.max]
+    extra += [np.nextafter(t, -np.inf) for t in extra]
+    return np.unique(np.concatenate([edges, extra]))
+
+class SegmentCube:
+    """
+    세그먼트 CTR 큐브
+
+    각 차원을 경계로 나눈 4차원 격자에 행 수와 클릭 수를 집계하고,
+    모든 축으로 누적합을 만들어 둔다. 임계값 조합(각 차원의 >= / <= 범위)은
+    누적합 16개 모서리의 포함-배제로 O(1)에 세그먼트 크기와 CTR을 얻으므로
+    원본 행을 다시 훑지 않는다.
+
+    값 v는 v <= edges[j]를 만족하는 가장 작은 j 구간에 속한다. 임계값은
+    구간 단위로 맞춰지며, 차원별 구간 최소/최대 관측값으로 그 결과가 행을
+    직접 필터링한 결과와 같은지(exact)를 함께 판단한다. 경계에 포함된
+    config 임계값은 항상 정확하고, 그 밖의 임계값은 근사일 수 있다.
+    정확한 값이 필요하면 refine(result, data)로 exact가 아닌 조합만 원본
+    행에서 다시 센다 (명시적으로 호출할 때만).
+
+    격자는 누적합(int32, 행 수가 int32 범위를 넘으면 int64)만 보관한다.
+    누적합은 선형이므로 청크/큐브 병합도 누적합끼리 더하면 된다.
+    """
+
+    def __init__(self, edges):
+        self.edges = {dim: np.asarray(edges[dim], dtype=np.float64)
+                      for dim in DIMENSIONS}
+        self.shape = tuple(len(self.edges[dim]) for dim in DIMENSIONS)
+        self.bin_min = {dim: np.full(len(self.edges[dim]), np.inf) for dim in DIMENSIONS}
+        self.bin_max = {dim: np.full(len(self.edges[dim]), -np.inf) for dim in DIMENSIONS}
+        # 앞쪽에 0 한 칸을 붙인 누적합 (인덱스 0 = 빈 범위)
+        cum_shape = tuple(m + 1 for m in self.shape)
+        self._cum_counts = np.zeros(cum_shape, dtype=np.int32)
+        self._cum_clicks = np.zeros(cum_shape, dtype=np.int32)
+
+    @classmethod
+    def build(cls, df, max_bins=SEGMENT_CUBE_BINS, thresholds=None):
+        """DataFrame에서 경계 결정 + 집계"""
+        thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+        edges = {dim: dimension_edges(df[col], max_bins, thresholds.get(dim, ()))
+                 for dim, col in DIMENSIONS.items()}
+        return cls(edges).update(df)
+
+    @classmethod
+    def from_chunks(cls, chunks, edges):
+        """정해진 경계로 청크 이터레이터를 집계 (경계는 스케치 등으로 미리 계산)"""
+        cube = cls(edges)
+        for chunk in chunks:
+            cube.update(chunk)
+        return cube
+
+    def _reserve(self, n_rows):
+        """n_rows행을 더해도 넘치지 않도록 누적합 dtype 확장"""
+        if (self._cum_counts.dtype == np.int32
+                and self.total_rows + n_rows > np.iinfo(np.int32).max):
+            self._cum_counts = self._cum_counts.astype(np.int64)
+            self._cum_clicks = self._cum_clicks.astype(np.int64)
+
+    def _accumulate(self, counts, clicks):
+        """구간별 행 수/클릭 수 격자를 모든 축으로 누적해 누적합에 더함"""
+        inner = (slice(1, None),) * len(self.shape)
+        for grid, cum in ((counts, self._cum_counts), (clicks, self._cum_clicks)):
+            grid = np.asarray(grid).reshape(self.shape).astype(cum.dtype)
+            for axis in range(grid.ndim):
+                np.cumsum(grid, axis=axis, dtype=grid.dtype, out=grid)
+            cum[inner] += grid
+
+    def update(self, df):
+        """청크 하나의 행 수/클릭 수를 누적합에 더함"""
+        idx = []
+        for dim, col in DIMENSIONS.items():
+            edges = self.edges[dim]
+            values = np.asarray(df[col], dtype=np.float64)
+            # 마지막 경계보다 큰 값(청크 모드)은 마지막 구간에 넣는다
+            bins = np.minimum(np.searchsorted(edges, values, side='left'),
+                              len(edges) - 1)
+            np.minimum.at(self.bin_min[dim], bins, values)
+            np.maximum.at(self.bin_max[dim], bins, values)
+            idx.append(bins)
+        flat = np.ravel_multi_index(idx, self.shape)
+        size = int(np.prod(self.shape))
+        clicked = np.asarray(df[TARGET]) == 1
+        self._reserve(len(flat))
+        self._accumulate(np.bincount(flat, minlength=size),
+                         np.bincount(flat[clicked], minlength=size))
+        return self
+
+    def merge(self, other):
+        """같은 경계로 만든 다른 큐브 병합"""
+        for dim in DIMENSIONS:
+            if not np.array_equal(self.edges[dim], other.edges[dim]):
+                raise ValueError(f"경계가 다른 큐브는 병합할 수 없습니다: {dim}")
+        self._reserve(other.total_rows)
+        self._cum_counts += other._cum_counts
+        self._cum_clicks += other._cum_clicks
+        for dim in DIMENSIONS:
+            np.minimum(self.bin_min[dim], other.bin_min[dim], out=self.bin_min[dim])
+            np.maximum(self.bin_max[dim], other.bin_max[dim], out=self.bin_max[dim])
+        return self
+
+    @staticmethod
+    def _difference(cum):
+        """누적합 → 구간별 격자 (모든 축으로 차분)"""
+        grid = cum
+        for axis in range(cum.ndim):
+            grid = np.diff(grid, axis=axis)
+        return grid
+
+    @property
+    def counts(self):
+        """구간별 행 수 격자 (누적합에서 복원)"""
+        return self._difference(self._cum_counts)
+
+    @property
+    def clicks(self):
+        """구간별 클릭 수 격자 (누적합에서 복원)"""
+        return self._difference(self._cum_clicks)
+
+    @property
+    def total_rows(self):
+        return int(self._cum_counts[(-1,) * self._cum_counts.ndim])
+
+    @property
+    def overall_ctr(self):
+        total_clicks = int(self._cum_clicks[(-1,) * self._cum_clicks.ndim])
+        return total_clicks / max(self.total_rows, 1)
+
+    @property
+    def nbytes(self):
+        return self._cum_counts.nbytes + self._cum_clicks.nbytes
+
+    def _bounds(self, dim, ge, le):
+        """
+        임계값 배열 → 누적합 인덱스 (lo, hi)와 정확 여부
+
+        v >= ge : 경계가 ge 이상인 구간부터 (구간 lo 이상)
+        v <= le : 경계가 le 이하인 구간까지 (구간 hi 미만)
+        경계에 걸친 구간에 임계값 반대쪽 관측값이 없으면 정확하다.
+        """
+        edges = self.edges[dim]
+        m = len(edges)
+        lo = np.where(np.isnan(ge), 0, np.searchsorted(edges, ge, side='left'))
+        hi = np.where(np.isnan(le), m, np.searchsorted(edges, le, side='right'))
+        hi = np.maximum(hi, lo)
+
+        # 센티널을 붙여 구간 -1, m을 빈 구간으로 취급
+        bin_min = np.concatenate([[np.inf], self.bin_min[dim], [np.inf]])
+        bin_max = np.concatenate([[-np.inf], self.bin_max[dim], [-np.inf]])
+        with np.errstate(invalid='ignore'):
+            exact_ge = np.isnan(ge) | ((bin_min[lo + 1] >= ge) & (bin_max[lo] < ge))
+            exact_le = np.isnan(le) | ((bin_max[hi] <= le) & (bin_min[hi + 1] > le))
+        return lo, hi, exact_ge & exact_le
+
+    def query_many(self, **bounds):
+        """
+        임계값 배열 일괄 질의 (벡터 연산, 조합당 O(1))
+
+        Parameters:
+        -----------
+        bounds : age_ge, age_le, time_ge, time_le, income_ge, income_le,
+                 usage_ge, usage_le 중 원하는 것 (스칼라 또는 같은 길이 배열,
+                 NaN/None은 제한 없음)
+
+        Returns:
+        --------
+        result : DataFrame
+            size, clicks, ctr, lift, exact (행 필터링 결과와 같은지)
+        """
+        unknown = [name for name in bounds if not _BOUND_PATTERN.match(name)]
+        if unknown:
+            raise ValueError(f"알 수 없는 임계값: {unknown}")
+
+        arrays = {name: np.atleast_1d(np.asarray(
+            np.nan if value is None else value, dtype=np.float64))
+            for name, value in bounds.items()}
+        n = max([len(a) for a in arrays.values()] + [1])
+
+        def get(name):
+            return np.broadcast_to(arrays.get(name, np.array([np.nan])), (n,))
+
+        corners = []
+        exact = np.ones(n, dtype=bool)
+        for dim in DIMENSIONS:
+            lo, hi, dim_exact = self._bounds(dim, get(f'{dim}_ge'),
+                                                   get(f'{dim}_le'))
+            corners.append((lo, hi))
+            exact &= dim_exact
+
+        size = np.zeros(n, dtype=np.int64)
+        clicks = np.zeros(n, dtype=np.int64)
+        # 포함-배제: 각 차원에서 hi(+) 또는 lo(-) 모서리 선택
+        for choice in itertools.product((1, 0), repeat=len(corners)):
+            index = tuple(c[1] if pick else c[0] for c, pick in zip(corners, choice))
+            sign = 1 if (len(choice) - sum(choice)) % 2 == 0 else -1
+            size += sign * self._cum_counts[index]
+            clicks += sign * self._cum_clicks[index]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ctr = np.where(size > 0, clicks / np.maximum(size, 1), np.nan)
+        result = pd.DataFrame({name: get(name) for name in sorted(arrays)})
+        result['size'] = size
+        result['clicks'] = clicks
+        result['ctr'] = ctr
+        result['lift'] = ctr / self.overall_ctr - 1
+        result['exact'] = exact
+        return result
+
+    def refine(self, result, data):
+        """
+        query_many 결과 중 exact가 아닌 조합을 원본 행에서 정확히 다시 계산
+
+        해당 조합의 임계값만 경계로 쓰는 작은 큐브(임계값이 없는 차원은
+        구간 1개)를 원본 행 한 번 훑어 만들고 같은 포함-배제로 답하므로,
+        비용은 조합 수 × 행 수가 아니라 O(행 수 + 조합 수)이다. 격자가
+        REFINE_MAX_CELLS를 넘으면 임계값 순으로 정렬한 조합을 반씩 나눈다.
+
+        Parameters:
+        -----------
+        result : query_many/sweep 결과
+        data : DataFrame - 큐브를 만든 원본 행 (DIMENSIONS 컬럼과 TARGET)
+        """
+        bound_cols = [name for name in result.columns if _BOUND_PATTERN.match(name)]
+        bounds = result[bound_cols].to_numpy(dtype=np.float64)
+        rows = np.flatnonzero(~result['exact'].to_numpy())
+        if not len(rows):
+            return result
+        rows = rows[np.lexsort(bounds[rows].T[::-1])]
+
+        size = result['size'].to_numpy(copy=True)
+        clicks = result['clicks'].to_numpy(copy=True)
+        pending = [rows]
+        while pending:
+            batch = pending.pop()
+            edges = _threshold_edges(bound_cols, bounds[batch])
+            if (len(batch) > 1
+                    and np.prod([len(e) for e in edges.values()]) > REFINE_MAX_CELLS):
+                pending.extend(np.array_split(batch, 2))
+                continue
+            exact = SegmentCube(edges).update(data).query_many(
+                **{name: bounds[batch, j] for j, name in enumerate(bound_cols)})
+            size[batch] = exact['size'].to_numpy()
+            clicks[batch] = exact['clicks'].to_numpy()
+
+        result = result.copy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ctr = np.where(size > 0, clicks / np.maximum(size, 1), np.nan)
+        result['size'] = size
+        result['clicks'] = clicks
+        result['ctr'] = ctr
+        result['lift'] = ctr / self.overall_ctr - 1
+        result['exact'] = True
+        return result
+
+    def query(self, **bounds):
+        """임계값 조합 하나의 세그먼트 크기와 CTR"""
+        row = self.query_many(**bounds).iloc[0]
+        return {'size': int(row['size']), 'clicks': int(row['clicks']),
+                'ctr': float(row['ctr']), 'lift': float(row['lift']),
+                'exact': bool(row['exact'])}
+
+    def sweep(self, thresholds):
+        """
+        임계값 표 일괄 스윕
+
+        thresholds : DataFrame (컬럼 예: age_ge, time_le, income_le, usage_le)
+                     또는 {컬럼: 값 목록} dict (데카르트 곱으로 전개)
+        """
+        if isinstance(thresholds, dict):
+            names = list(thresholds)
+            grid = list(itertools.product(*(thresholds[name] for name in names)))
+            thresholds = pd.DataFrame(grid, columns=names)
+        return self.query_many(**{col: thresholds[col].to_numpy(dtype=np.float64)
+                                  for col in thresholds.columns})
+
+    def save(self, path):
+        arrays = {}
+        for dim in DIMENSIONS:
+            arrays[f'edges_{dim}'] = self.edges[dim]
+            arrays[f'min_{dim}'] = self.bin_min[dim]
+            arrays[f'max_{dim}'] = self.bin_max[dim]
+        np.savez_compressed(path, counts=self.counts, clicks=self.clicks, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            cube = cls({dim: data[f'edges_{dim}'] for dim in DIMENSIONS})
+            for dim in DIMENSIONS:
+                cube.bin_min[dim] = data[f'min_{dim}']
+                cube.bin_max[dim] = data[f'max_{dim}']
+            cube._reserve(int(data['counts'].sum()))
+            cube._accumulate(data['counts'], data['clicks'])
+        return cube
+
+def _threshold_edges(bound_cols, bounds):
+    """
+    임계값 조합이 모두 정확해지는 최소 경계 (refine용)
+
+    v <= t는 경계 t, v >= t는 t 바로 아래 경계가 있으면 구간 단위로 정확하다.
+    마지막 경계 inf는 나머지 값을 모두 담는다.
+    """
+    edges = {dim: [np.array([np.inf])] for dim in DIMENSIONS}
+    for j, name in enumerate(bound_cols):
+        dim, op = _BOUND_PATTERN.match(name).groups()
+        values = bounds[:, j][~np.isnan(bounds[:, j])]
+        edges[dim].append(values if op == 'le' else np.nextafter(values, -np.inf))
+    return {dim: np.unique(np.concatenate(parts)) for dim, parts in edges.items()}
+
+def _parse_grid(specs):
+    """'age_ge=30,35,40' 또는 'time_le=40:80:5'(시작:끝:간격, 끝 포함) 형식 파싱"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if not _BOUND_PATTERN.match(name):
+            raise ValueError(f"알 수 없는 임계값: {name}")
+        if ':' in values:
+            start, stop, step = (float(v) for v in values.split(':'))
+            grid[name] = np.arange(start, stop + step / 2, step)
+        else:
+            grid[name] = [float(v) for v in values.split(',')]
+    return grid
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='세그먼트 임계값 CTR 일괄 스윕')
+    parser.add_argument('thresholds', nargs='?',
+                        help='임계값 CSV (컬럼: age_ge, time_le, income_le, usage_le 등)')
+    parser.add_argument('--grid', nargs='+', default=None,
+                        help="데카르트 곱 스윕 (예: age_ge=30:50:1 time_le=40,60,80)")
+    parser.add_argument('--data', default=DATA_PATH, help='원본 CSV')
+    parser.add_argument('--cube', default=None,
+                        help='큐브 파일(.npz): 있으면 로드, 없으면 생성 후 저장')
+    parser.add_argument('--bins', type=int, default=SEGMENT_CUBE_BINS,
+                        help='연속형 차원의 최대 구간 수')
+    parser.add_argument('-o', '--output', default='-', help='결과 CSV (기본: stdout)')
+    parser.add_argument('--top', type=int, default=None,
+                        help='CTR 상위 N개만 출력')
+    parser.add_argument('--min-size', type=int, default=0,
+                        help='최소 세그먼트 크기')
+    parser.add_argument('--refine', action='store_true',
+                        help='큐브 경계와 맞지 않는 조합(exact=False)을 원본 행에서 정확히 다시 계산')
+    args = parser.parse_args(argv)
+    if not args.thresholds and not args.grid:
+        parser.error('thresholds CSV 또는 --grid가 필요합니다')
+
+    from src.data_loader import load_data
+    columns = list(DIMENSIONS.values()) + [TARGET]
+    df = None
+    start = time.perf_counter()
+    if args.cube and os.path.exists(args.cube):
+        cube = SegmentCube.load(args.cube)
+    else:
+        df = load_data(args.data, columns=columns)
+        cube = SegmentCube.build(df, args.bins)
+        if args.cube:
+            cube.save(args.cube)
+    built = time.perf_counter() - start
+
+    thresholds = pd.read_csv(args.thresholds) if args.thresholds \
+        else _parse_grid(args.grid)
+    start = time.perf_counter()
+    result = cube.sweep(thresholds)
+    n_approximate = int((~result['exact']).sum())
+    if n_approximate and args.refine:
+        if df is None:
+            df = load_data(args.data, columns=columns)
+        result = cube.refine(result, df)
+    elapsed = time.perf_counter() - start
+    n_queries = len(result)
+
+    result = result[result['size'] >= args.min_size]
+    if args.top:
+        result = result.nlargest(args.top, 'ctr')
+    result.to_csv(sys.stdout if args.output == '-' else args.output,
+                  index=False, float_format='%.6g')
+    print(f"큐브 {cube.shape} ({cube.total_rows:,}행, {cube.nbytes / 1e6:.1f}MB) "
+          f"준비 {built:.2f}초 | 조합 {n_queries:,}개 (근사 {n_approximate:,}개"
+          f"{', 재계산' if args.refine and n_approximate else ''}) "
+          f"스윕 {elapsed * 1000:.1f}ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
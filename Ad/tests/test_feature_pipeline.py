@@ -0,0 +1,40 @@
+# tests/test_feature_pipeline.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from config import DATA_PATH
+from src.data_loader import load_data
+from src.feature_engineering import (FeaturePipeline, create_features,
+                                     get_feature_columns, INPUT_COLUMNS)
+
+def _training_features(df, feature_cols):
+    """main.py 학습 경로의 피처 (create_features → DataFrame 컬럼)"""
+    return create_features(df.copy(), verbose=False)[feature_cols].to_numpy()
+
+def test_pipeline_matches_create_features():
+    df = load_data(use_cache=False)
+    feature_cols = get_feature_columns()
+    expected = _training_features(df, feature_cols)
+    actual = FeaturePipeline(feature_cols).fit(df).transform_frame(df)
+
+    assert actual.dtype == expected.dtype == np.float64
+    np.testing.assert_array_equal(actual, expected)
+
+def test_cached_load_matches_csv_features():
+    feature_cols = get_feature_columns()
+    cached = load_data(use_cache=True)
+    pd.testing.assert_frame_equal(cached, pd.read_csv(DATA_PATH))
+    np.testing.assert_array_equal(
+        FeaturePipeline(feature_cols).fit(cached).transform_frame(cached),
+        _training_features(pd.read_csv(DATA_PATH), feature_cols))
+
+def test_chunked_transform_uses_training_median():
+    df = load_data(use_cache=False)
+    pipeline = FeaturePipeline().fit(df)
+    chunks = [df.iloc[i:i + 100] for i in range(0, len(df), 100)]
+    np.testing.assert_array_equal(
+        np.vstack([pipeline.transform_frame(chunk) for chunk in chunks]),
+        pipeline.transform_frame(df[INPUT_COLUMNS]))
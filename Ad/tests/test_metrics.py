@@ -0,0 +1,67 @@
+# tests/test_metrics.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn import metrics
+from src import metrics as ad_metrics
+from src.metrics import ScoreCurves, bootstrap_metrics
+
+def _tied_scores(n=2000, seed=0):
+    """소수 둘째 자리로 반올림해 동점이 많은 점수"""
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    score = np.round(np.clip(rng.normal(0.4 + 0.2 * y, 0.2), 0, 1), 2)
+    return y, score
+
+def test_score_curves_match_sklearn():
+    y, score = _tied_scores()
+    curves = ScoreCurves(y, score)
+    np.testing.assert_allclose(curves.roc_auc(), metrics.roc_auc_score(y, score), atol=1e-12)
+    np.testing.assert_allclose(curves.average_precision(),
+                               metrics.average_precision_score(y, score), atol=1e-12)
+
+    fpr, tpr, thresholds = metrics.roc_curve(y, score, drop_intermediate=False)
+    for ours, expected in zip(curves.roc_curve(), (fpr, tpr, thresholds)):
+        np.testing.assert_allclose(ours, expected)
+    for ours, expected in zip(curves.pr_curve(), metrics.precision_recall_curve(y, score)):
+        np.testing.assert_allclose(ours, expected)
+
+    # 동점 점수와 그 사이 값 모두에서 score > t / score >= t 지표
+    for threshold in (0.0, 0.3, 0.35, 0.5, 0.555, 1.0):
+        for inclusive in (False, True):
+            pred = score >= threshold if inclusive else score > threshold
+            ours = curves.metrics_at(threshold, inclusive)
+            assert ours['Accuracy'] == metrics.accuracy_score(y, pred)
+            assert ours['Precision'] == metrics.precision_score(y, pred, zero_division=0)
+            assert ours['Recall'] == metrics.recall_score(y, pred, zero_division=0)
+            np.testing.assert_allclose(ours['F1-Score'],
+                                       metrics.f1_score(y, pred, zero_division=0))
+
+def test_bootstrap_matches_sklearn_resamples(monkeypatch):
+    y, score = _tied_scores(500)
+    n_boot, ci = 40, 0.9
+    # 배치를 여러 개로 나눠도 난수열은 같다
+    monkeypatch.setattr(ad_metrics, '_BOOTSTRAP_BATCH_CELLS', 3 * len(y))
+    result = bootstrap_metrics(y, score, n_boot=n_boot, ci=ci,
+                               random_state=0).set_index('metric')
+    np.testing.assert_allclose(result.loc['ROC-AUC', 'estimate'],
+                               metrics.roc_auc_score(y, score))
+
+    # 같은 재표본(점수 내림차순 위치에서 뽑음)을 sklearn으로 하나씩 계산한 신뢰구간
+    order = np.argsort(-score, kind='mergesort')
+    y, score = y[order], score[order]
+    draws = np.random.RandomState(0).randint(0, len(y), size=(n_boot, len(y)))
+    scorers = {
+        'ROC-AUC': lambda t, s: metrics.roc_auc_score(t, s),
+        'Accuracy': lambda t, s: metrics.accuracy_score(t, s > 0.5),
+        'Precision': lambda t, s: metrics.precision_score(t, s > 0.5, zero_division=0),
+        'Recall': lambda t, s: metrics.recall_score(t, s > 0.5, zero_division=0),
+        'F1-Score': lambda t, s: metrics.f1_score(t, s > 0.5, zero_division=0),
+    }
+    alpha = (1 - ci) / 2
+    for name, scorer in scorers.items():
+        values = [scorer(y[d], score[d]) for d in draws]
+        np.testing.assert_allclose(result.loc[name, ['lower', 'upper']].to_numpy(dtype=float),
+                                   np.quantile(values, [alpha, 1 - alpha]))
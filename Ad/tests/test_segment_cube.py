@@ -0,0 +1,119 @@
+# tests/test_segment_cube.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from src.segment_cube import SegmentCube, DIMENSIONS, TARGET, dimension_edges
+
+BOUNDS = [f'{dim}_{op}' for dim in DIMENSIONS for op in ('ge', 'le')]
+
+def _frame(n=3000, seed=0):
+    """정수 나이(고유값 적음)와 동률이 많은 연속형 값의 합성 데이터"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Age': rng.integers(19, 62, n),
+        'Daily Time Spent on Site': np.round(rng.uniform(30, 92, n), 1),
+        'Area Income': np.round(rng.normal(55000, 13000, n), -2),
+        'Daily Internet Usage': rng.uniform(100, 270, n),
+        TARGET: rng.integers(0, 2, n),
+    })
+
+def _brute_force(df, bounds):
+    """임계값 조합마다 boolean 필터로 센 (size, clicks)"""
+    sizes, clicks = [], []
+    n = len(next(iter(bounds.values())))
+    for i in range(n):
+        mask = np.ones(len(df), dtype=bool)
+        for name, values in bounds.items():
+            value = values[i]
+            if value is None or np.isnan(value):
+                continue
+            dim, op = name.split('_')
+            column = df[DIMENSIONS[dim]].to_numpy(dtype=np.float64)
+            mask &= column >= value if op == 'ge' else column <= value
+        sizes.append(mask.sum())
+        clicks.append((mask & (df[TARGET].to_numpy() == 1)).sum())
+    return np.array(sizes), np.array(clicks)
+
+def _random_bounds(df, cube, n=400, seed=1, names=BOUNDS):
+    """경계 위 / 경계 밖 / 관측값 / NaN 임계값을 섞은 질의"""
+    rng = np.random.default_rng(seed)
+    bounds = {}
+    for name in names:
+        dim = name.split('_')[0]
+        values = df[DIMENSIONS[dim]].to_numpy(dtype=np.float64)
+        candidates = np.concatenate([
+            cube.edges[dim],
+            rng.uniform(values.min() - 1, values.max() + 1, 50),
+            rng.choice(values, 50),
+            [np.nan] * 30,
+        ])
+        bounds[name] = rng.choice(candidates, n)
+    return bounds
+
+def test_exact_queries_match_brute_force():
+    df = _frame()
+    cube = SegmentCube.build(df, max_bins=8)
+    bounds = _random_bounds(df, cube, names=['age_ge', 'time_le', 'income_ge', 'usage_le'])
+    result = cube.query_many(**bounds)
+    size, clicks = _brute_force(df, bounds)
+
+    exact = result['exact'].to_numpy()
+    assert exact.any() and not exact.all()
+    np.testing.assert_array_equal(result['size'].to_numpy()[exact], size[exact])
+    np.testing.assert_array_equal(result['clicks'].to_numpy()[exact], clicks[exact])
+
+def test_edge_thresholds_are_exact():
+    df = _frame()
+    cube = SegmentCube.build(df, max_bins=8)
+    bounds = {'time_le': cube.edges['time'], 'usage_le': cube.edges['usage'][::-1]}
+    result = cube.query_many(**bounds)
+    assert result['exact'].all()
+    size, clicks = _brute_force(df, bounds)
+    np.testing.assert_array_equal(result['size'], size)
+    np.testing.assert_array_equal(result['clicks'], clicks)
+
+def test_refine_matches_brute_force(monkeypatch):
+    df = _frame()
+    cube = SegmentCube.build(df, max_bins=8)
+    bounds = _random_bounds(df, cube, seed=2)
+    size, clicks = _brute_force(df, bounds)
+    # 임계값 격자를 작게 잡아 조합을 나누는 경로도 확인
+    for max_cells in (1 << 22, 64):
+        monkeypatch.setattr('src.segment_cube.REFINE_MAX_CELLS', max_cells)
+        refined = cube.refine(cube.query_many(**bounds), df)
+        assert refined['exact'].all()
+        np.testing.assert_array_equal(refined['size'], size)
+        np.testing.assert_array_equal(refined['clicks'], clicks)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            np.testing.assert_allclose(refined['ctr'], clicks / size)
+
+def test_sweep_and_none_bounds():
+    df = _frame()
+    cube = SegmentCube.build(df, max_bins=8)
+    swept = cube.sweep({'age_ge': [20, 40, 61], 'time_le': [None, 60.0]})
+    assert len(swept) == 6
+    size, _ = _brute_force(df, {'age_ge': swept['age_ge'].to_numpy(),
+                                'time_le': swept['time_le'].to_numpy()})
+    refined = cube.refine(swept, df)
+    np.testing.assert_array_equal(refined['size'], size)
+    assert cube.query()['size'] == len(df)
+    assert cube.query(age_ge=None)['size'] == len(df)
+
+def test_save_load_merge_round_trip(tmp_path):
+    df = _frame()
+    edges = {dim: dimension_edges(df[col], 8) for dim, col in DIMENSIONS.items()}
+    cube = SegmentCube(edges).update(df)
+    merged = SegmentCube(edges).update(df.iloc[:1000]).merge(
+        SegmentCube(edges).update(df.iloc[1000:]))
+    path = tmp_path / 'cube.npz'
+    cube.save(path)
+    loaded = SegmentCube.load(path)
+
+    bounds = _random_bounds(df, cube, seed=3)
+    expected = cube.query_many(**bounds)
+    for other in (merged, loaded):
+        np.testing.assert_array_equal(other.counts, cube.counts)
+        pd.testing.assert_frame_equal(other.query_many(**bounds), expected)
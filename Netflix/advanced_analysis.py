@@ -16,6 +16,8 @@ import seaborn as sns
 from matplotlib import rcParams
 import warnings
 
+from aggregate_store import Aggregates
+
 warnings.filterwarnings('ignore')
 
 # 한글 폰트 설정
@@ -130,7 +132,7 @@ def funnel_analysis(df):
         return None, None
 
 
-def cohort_analysis(df):
+def cohort_analysis(df, aggregates=None):
     """
     분석 내용:
     - 연도별 장르 콘텐츠 수 변화
@@ -144,27 +146,10 @@ def cohort_analysis(df):
     """
     
     try:
-        df_clean = df.copy()
-        df_clean['year_added'] = df_clean['date_added'].dt.year
-        
-        # 장르 데이터 추출
-        genre_data = []
-        for idx, row in df_clean.iterrows():
-            if pd.notna(row['listed_in']):
-                genres = [genre.strip() for genre in str(row['listed_in']).split(',')]
-                for genre in genres[:2]:  # 상위 2개 장르만
-                    genre_data.append({
-                        'year_added': row['year_added'], 
-                        'genre': genre, 
-                        'type': row['type']
-                    })
-        
-        genre_df = pd.DataFrame(genre_data)
-        
-        # 코호트 테이블 생성
-        cohort_table = genre_df.pivot_table(
-            index='genre', columns='year_added', values='type', aggfunc='count', fill_value=0
-        )
+        # 코호트 테이블 (aggregate_store.build_genre_cohort, 타이틀당 상위 2개 장르)
+        if aggregates is None:
+            aggregates = Aggregates(df)
+        cohort_table = aggregates['genre_cohort']
         
         # 상위 10개 장르
         top_genres = cohort_table.sum(axis=1).nlargest(10).index
@@ -211,29 +196,12 @@ def cohort_analysis(df):
         return None, None, None
 
 
-def cohort_analysis_with_trend(df):
+def cohort_analysis_with_trend(df, aggregates=None):
      
     try:
-        df_clean = df.copy()
-        df_clean['year_added'] = df_clean['date_added'].dt.year
-        
-        # 장르 데이터 추출
-        genre_data = []
-        for idx, row in df_clean.iterrows():
-            if pd.notna(row['listed_in']):
-                genres = [genre.strip() for genre in str(row['listed_in']).split(',')]
-                for genre in genres[:2]:
-                    genre_data.append({
-                        'year_added': row['year_added'], 
-                        'genre': genre, 
-                        'type': row['type']
-                    })
-        
-        genre_df = pd.DataFrame(genre_data)
-        
-        cohort_table = genre_df.pivot_table(
-            index='genre', columns='year_added', values='type', aggfunc='count', fill_value=0
-        )
+        if aggregates is None:
+            aggregates = Aggregates(df)
+        cohort_table = aggregates['genre_cohort']
         
         top_genres = cohort_table.sum(axis=1).nlargest(10).index
         cohort_table_top = cohort_table.loc[top_genres]
@@ -386,20 +354,22 @@ def time_series_analysis(df):
         return None, None
 
 
-def run_all_advanced_analysis(df):
+def run_all_advanced_analysis(df, aggregates=None):
     
     results = {}
+    if aggregates is None:
+        aggregates = Aggregates(df)
     
     # 1. 퍼널 분석
     funnel_fig, funnel_df = funnel_analysis(df)
     results['funnel'] = {'figure': funnel_fig, 'data': funnel_df}
     
     # 2. 코호트 분석
-    cohort_fig, cohort_table, trends = cohort_analysis(df)
+    cohort_fig, cohort_table, trends = cohort_analysis(df, aggregates)
     results['cohort'] = {'figure': cohort_fig, 'table': cohort_table, 'trends': trends}
     
     # 3. 트렌드 포함 코호트
-    trend_fig = cohort_analysis_with_trend(df)
+    trend_fig = cohort_analysis_with_trend(df, aggregates)
     results['cohort_trend'] = {'figure': trend_fig}
     
     # 4. 시계열 분석
@@ -0,0 +1,316 @@
+"""
+aggregate_store.py
+==================
+Netflix 대시보드 집계 테이블 저장소
+
+1. 집계 정의 (이름 → 입력 컬럼, 계산 함수)
+   - 브리지 테이블, 연도별 타입, 월별 추가량, 등급, 국가, 장르 코호트
+   - TF-IDF 벡터라이저/행렬, 설명 기반 장르 추출
+2. 디스크 저장소 (CSV 해시 → 집계별 키 매니페스트, 집계별 pickle 파일)
+3. 지연 로딩 접근자 (Aggregates)
+4. 추천용 유사도 인덱스와 제목 검색 사전 (similarity_index)
+
+집계 키는 집계가 읽는 컬럼 내용과 집계 계산 소스 코드의 해시이므로, CSV가
+바뀌어도 해당 컬럼이 그대로인 집계는 다시 계산하지 않고 기존 파일을 읽고,
+전처리/집계/유사도 인덱스 코드가 바뀌면 전부 다시 계산한다.
+"""
+
+import os
+import json
+import time
+import pickle
+import hashlib
+import pandas as pd
+import numpy as np
+
+from data_preprocessing import build_bridge_tables
+from similarity_index import SimilarityIndex, TitleLookup
+
+# 저장 위치와 형식 버전 (집계 계산 방식이 바뀌면 버전을 올려 전부 다시 계산)
+AGGREGATE_DIR = 'netflix_cache'
+AGGREGATE_VERSION = 2
+# 집계 결과에 영향을 주는 소스 파일 (내용이 바뀌면 집계 키가 바뀐다)
+SOURCE_FILES = ['aggregate_store.py', 'data_preprocessing.py', 'similarity_index.py']
+# 매니페스트에 기억할 최근 CSV 수 (이보다 오래된 CSV의 집계 파일은 삭제)
+MAX_CSV_ENTRIES = 5
+
+# 설명 기반 장르 키워드 (content_similarity_analysis)
+GENRE_KEYWORDS = {
+    '액션': ['action', 'fight', 'battle', 'adventure', 'thriller'],
+    '코미디': ['comedy', 'funny', 'humor', 'laugh', 'hilarious'],
+    '드라마': ['drama', 'emotional', 'family', 'life', 'story'],
+    '로맨스': ['love', 'romance', 'relationship', 'romantic'],
+    '공포': ['horror', 'scary', 'fear', 'haunted', 'terror'],
+    '다큐멘터리': ['documentary', 'real', 'true', 'history'],
+    'SF': ['sci-fi', 'science', 'future', 'space', 'technology'],
+    '범죄': ['crime', 'criminal', 'police', 'detective', 'murder']
+}
+
+
+def _year_attributes(df):
+    """브리지 테이블 long 형식에 붙일 추가 연도/타입 (행 위치 순서)"""
+    return pd.DataFrame({
+        'year_added': df['date_added'].dt.year.to_numpy(),
+        'type': df['type'].to_numpy(dtype=object),
+    })
+
+
+def build_yearly_type(df, aggregates):
+    """연도별 콘텐츠 타입 수 (index: year_added, columns: type)"""
+    year = df['date_added'].dt.year.rename('year_added')
+    return df.groupby([year, 'type'], observed=True).size().unstack(fill_value=0)
+
+
+def build_monthly_counts(df, aggregates):
+    """(year_added, month_added)별 콘텐츠 추가 수"""
+    year = df['date_added'].dt.year.rename('year_added')
+    month = df['date_added'].dt.month.rename('month_added')
+    return df.groupby([year, month]).size()
+
+
+def build_rating_counts(df, aggregates):
+    """등급별 콘텐츠 수 (내림차순)"""
+    counts = df['rating'].value_counts()
+    return counts[counts > 0]
+
+
+def build_country_tables(df, aggregates):
+    """
+    국가 집계 (타이틀↔국가 브리지 테이블)
+
+    Returns:
+    --------
+    dict - counts(국가별 항목 수), by_year(국가×연도 타이틀 수),
+           by_type(국가×타입 타이틀 수), diversity(연도별 국가 수)
+    """
+    index = aggregates['bridges']['country']
+    attrs = _year_attributes(df)
+    long = index.frame(attrs, columns=['year_added', 'type'], name='country')
+    counts = index.value_counts()
+    return {
+        'counts': counts[counts > 0],
+        'by_year': long.groupby(['country', 'year_added'], observed=True)['row'].nunique(),
+        'by_type': long.groupby(['country', 'type'], observed=True)['row'].nunique().unstack(fill_value=0),
+        'diversity': (long.groupby('year_added')['country'].nunique()
+                      .reindex(np.sort(attrs['year_added'].unique()), fill_value=0)),
+    }
+
+
+def build_genre_cohort(df, aggregates):
+    """장르 × 추가 연도 콘텐츠 수 (타이틀당 앞의 2개 장르)"""
+    genre_df = aggregates['bridges']['genre'].frame(
+        _year_attributes(df), columns=['year_added'], name='genre', max_per_row=2)
+    cohort_table = genre_df.groupby(['genre', 'year_added'], observed=True).size().unstack(fill_value=0)
+    cohort_table.index = cohort_table.index.astype(str)
+    return cohort_table
+
+
+def build_tfidf(df, aggregates):
+    """description TF-IDF (학습된 벡터라이저와 희소 행렬)"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+    matrix = vectorizer.fit_transform(df['description'].fillna(''))
+    return {'vectorizer': vectorizer, 'matrix': matrix}
+
+
+def extract_genre(description):
+    """설명에 처음 일치하는 GENRE_KEYWORDS 장르 (없으면 '기타')"""
+    description_lower = str(description).lower()
+    for genre, keywords in GENRE_KEYWORDS.items():
+        if any(keyword in description_lower for keyword in keywords):
+            return genre
+    return '기타'
+
+
+def build_extracted_genre(df, aggregates):
+    """타이틀별 설명 기반 장르 (행 위치 순서의 ndarray)"""
+    return df['description'].map(extract_genre).to_numpy(dtype=object)
+
+
+def build_similarity_index(df, aggregates):
+    """TF-IDF 행렬의 코사인 유사도 인덱스 (큰 카탈로그는 IVF 근사 검색 포함)"""
+    return SimilarityIndex(aggregates['tfidf']['matrix'])
+
+
+def build_title_lookup(df, aggregates):
+    """제목 → 행 위치 검색 사전"""
+    return TitleLookup(df['title'])
+
+
+# 집계 이름 → (입력 컬럼, 계산 함수). 계산 함수는 (df, aggregates)를 받는다.
+AGGREGATES = {
+    'bridges': (['country', 'director', 'cast', 'listed_in'],
+                lambda df, aggregates: build_bridge_tables(df)),
+    'yearly_type': (['date_added', 'type'], build_yearly_type),
+    'monthly_counts': (['date_added'], build_monthly_counts),
+    'rating_counts': (['rating'], build_rating_counts),
+    'country': (['country', 'date_added', 'type'], build_country_tables),
+    'genre_cohort': (['listed_in', 'date_added'], build_genre_cohort),
+    'tfidf': (['description'], build_tfidf),
+    'extracted_genre': (['description'], build_extracted_genre),
+    'similarity_index': (['description'], build_similarity_index),
+    'title_lookup': (['title'], build_title_lookup),
+}
+
+
+def file_hash(path, block_size=1 << 20):
+    """파일 내용의 sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hash(files=SOURCE_FILES):
+    """집계 계산 소스 파일(이 모듈과 같은 폴더) 내용의 sha256"""
+    folder = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for filename in files:
+        digest.update(file_hash(os.path.join(folder, filename)).encode())
+    return digest.hexdigest()
+
+
+def column_hash(series):
+    """컬럼 값(행 순서 포함)의 sha256"""
+    hashed = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+
+class AggregateStore:
+    """
+    CSV 해시를 키로 하는 집계 테이블 디스크 저장소
+
+    root/manifest.json에 CSV 해시 → {source: 소스 해시, keys: {집계 이름: 집계 키}}를
+    기록하고, 집계는 root/<이름>/<키>.pkl로 저장한다. 집계 키는 입력 컬럼 내용과
+    소스 코드(SOURCE_FILES)의 해시이므로 CSV가 바뀌면 입력 컬럼이 바뀐 집계만 새 키가
+    되어 다시 계산되고, 나머지는 기존 파일을 그대로 읽는다. 같은 CSV와 같은 소스로
+    다시 실행하면 매니페스트의 키로 바로 읽으므로 컬럼 해시도 계산하지 않는다.
+    """
+
+    def __init__(self, csv_path, root=AGGREGATE_DIR):
+        self.root = root
+        self.csv_hash = file_hash(csv_path)
+        self.source_hash = source_hash()
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.manifest = self._read_manifest()
+        entry = self.manifest['csv'].get(self.csv_hash, {})
+        self.keys = dict(entry['keys']) if entry.get('source') == self.source_hash else {}
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == AGGREGATE_VERSION:
+                return manifest
+        except (FileNotFoundError, ValueError):
+            pass
+        return {'version': AGGREGATE_VERSION, 'csv': {}}
+
+    def _path(self, name, key):
+        return os.path.join(self.root, name, f'{key}.pkl')
+
+    def key(self, name, df):
+        """집계 키 (이 CSV와 소스로 이미 계산한 적이 있으면 매니페스트 값)"""
+        if name not in self.keys:
+            columns, _ = AGGREGATES[name]
+            digest = hashlib.sha256(f'{name}:{AGGREGATE_VERSION}:{self.source_hash}'.encode())
+            for col in columns:
+                digest.update(column_hash(df[col]).encode())
+            self.keys[name] = digest.hexdigest()[:16]
+        return self.keys[name]
+
+    def load(self, name, df):
+        """저장된 집계 (없으면 None)"""
+        path = self._path(name, self.key(name, df))
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        self._record(name)
+        return value
+
+    def save(self, name, df, value):
+        """집계 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = self._path(name, self.key(name, df))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._record(name)
+
+    def _record(self, name):
+        """현재 CSV의 집계 키를 매니페스트에 기록하고 오래된 CSV 항목 정리"""
+        entries = self.manifest['csv']
+        entry = entries.pop(self.csv_hash, {})
+        if entry.get('source') != self.source_hash:
+            entry = {'source': self.source_hash, 'keys': {}}
+        if entry['keys'].get(name) == self.keys[name]:
+            entries[self.csv_hash] = entry
+            return
+        entry['keys'][name] = self.keys[name]
+        entries[self.csv_hash] = entry  # 가장 최근 CSV가 마지막
+        for old_hash in list(entries)[:-MAX_CSV_ENTRIES]:
+            del entries[old_hash]
+        self._prune(name)
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _prune(self, name):
+        """매니페스트에서 참조하지 않는 name 집계 파일 삭제"""
+        live = {entry['keys'][name] for entry in self.manifest['csv'].values()
+                if name in entry['keys']}
+        folder = os.path.join(self.root, name)
+        for filename in os.listdir(folder) if os.path.isdir(folder) else []:
+            if filename.endswith('.pkl') and filename[:-4] not in live:
+                os.remove(os.path.join(folder, filename))
+
+
+class Aggregates:
+    """
+    DataFrame의 집계 테이블 지연 접근자
+
+    aggregates['country']처럼 처음 접근할 때 저장소에서 읽거나 계산하고
+    (계산한 값은 저장소에 저장), 같은 객체에서는 메모리에 둔 값을 재사용한다.
+    store가 None이면 디스크를 쓰지 않고 메모리에서만 계산한다.
+    반환값은 공유되므로 호출하는 쪽에서 수정하려면 복사해서 쓴다.
+    """
+
+    def __init__(self, df, store=None, verbose=True):
+        self.df = df
+        self.store = store
+        self.verbose = verbose
+        self._values = {}
+
+    def __getitem__(self, name):
+        if name not in self._values:
+            start = time.perf_counter()
+            value = self.store.load(name, self.df) if self.store is not None else None
+            source = '로드'
+            if value is None:
+                _, build = AGGREGATES[name]
+                value = build(self.df, self)
+                source = '계산'
+                if self.store is not None:
+                    self.store.save(name, self.df, value)
+            self._values[name] = value
+            if self.verbose and self.store is not None:
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"   [집계 {source}] {name} ({elapsed:.1f}ms)")
+        return self._values[name]
+
+    def preload(self, names=None):
+        """집계를 미리 읽거나 계산 (기본: 전체)"""
+        for name in names or AGGREGATES:
+            self[name]
+        return self
+
+
+def open_aggregates(df, csv_path, root=AGGREGATE_DIR):
+    """csv_path 해시 기준 디스크 저장소를 쓰는 Aggregates"""
+    return Aggregates(df, AggregateStore(csv_path, root))
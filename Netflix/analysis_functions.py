@@ -16,9 +16,9 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import networkx as nx
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.linear_model import LinearRegression
+from aggregate_store import Aggregates
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -27,7 +27,7 @@ import matplotlib as mpl
 mpl.rcParams['font.family'] = 'Malgun Gothic'
 mpl.rcParams['axes.unicode_minus'] = False 
 
-def analyze_content_strategy_shift(df):
+def analyze_content_strategy_shift(df, aggregates=None):
     """
     Netflix 콘텐츠 전략 변화를 분석합니다.
     
@@ -36,11 +36,16 @@ def analyze_content_strategy_shift(df):
     - 콘텐츠 타입 비율 변화
     - 월별 콘텐츠 추가 패턴
     - 등급별 분포
+    
+    집계 테이블은 aggregates(aggregate_store.Aggregates)에서 가져온다.
     """
     
     try:
-        # 연도별 콘텐츠 타입 집계
-        yearly_content = df.groupby(['year_added', 'type']).size().unstack(fill_value=0)
+        if aggregates is None:
+            aggregates = Aggregates(df)
+        
+        # 연도별 콘텐츠 타입 집계 (공유 집계이므로 복사해서 비율 컬럼 추가)
+        yearly_content = aggregates['yearly_type'].copy()
         yearly_content['total'] = yearly_content.sum(axis=1)
         yearly_content['movie_ratio'] = yearly_content['Movie'] / yearly_content['total']
         yearly_content['tv_ratio'] = yearly_content['TV Show'] / yearly_content['total']
@@ -74,7 +79,7 @@ def analyze_content_strategy_shift(df):
         )
         
         # 3. 월별 패턴
-        monthly_pattern = df.groupby('month_added').size()
+        monthly_pattern = aggregates['monthly_counts'].groupby(level='month_added').sum()
         fig.add_trace(
             go.Bar(x=monthly_pattern.index, y=monthly_pattern.values,
                    name='월별 추가량', marker_color='green'), 
@@ -82,7 +87,7 @@ def analyze_content_strategy_shift(df):
         )
         
         # 4. 등급별 분포
-        rating_dist = df['rating'].value_counts().head(10) 
+        rating_dist = aggregates['rating_counts'].head(10)
         fig.add_trace(
             go.Pie(labels=rating_dist.index, values=rating_dist.values, name='등급별 분포'), 
             row=2, col=2
@@ -98,7 +103,7 @@ def analyze_content_strategy_shift(df):
         return None, None
 
 
-def analyze_global_content_distribution(df):
+def analyze_global_content_distribution(df, aggregates=None):
     """
     글로벌 콘텐츠 분포를 분석합니다.
     
@@ -107,23 +112,25 @@ def analyze_global_content_distribution(df):
     - 미국 vs 기타 국가 비율
     - 연도별 국가 다양성
     - 지역별 콘텐츠 타입 분포
+    
+    국가 집계는 타이틀↔국가 브리지 테이블로 만든 aggregates['country']를 사용한다.
     """
     
     try:
+        if aggregates is None:
+            aggregates = Aggregates(df)
+        country_tables = aggregates['country']
+        
         # 국가별 콘텐츠 수 계산
-        country_counts = {}
-        for countries in df['country'].dropna():
-            for country in str(countries).split(', '):
-                country = country.strip()
-                if country and country != 'Unknown':
-                    country_counts[country] = country_counts.get(country, 0) + 1
+        country_series = country_tables['counts']
+        country_counts = country_series.to_dict()
         
         if not country_counts:
             print("국가 데이터가 없습니다.")
             return None, None
         
         # 상위 15개 국가
-        top_countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)[:15]
+        top_countries = list(country_series.head(15).items())
         
         # 서브플롯 생성
         fig = make_subplots(
@@ -152,10 +159,7 @@ def analyze_global_content_distribution(df):
         )
         
         # 3. 연도별 국가 다양성
-        yearly_countries = df.groupby('year_added')['country'].apply(
-            lambda x: len(set([c.strip() for countries in x.dropna() 
-                             for c in str(countries).split(', ') if c.strip() != 'Unknown']))
-        )
+        yearly_countries = country_tables['diversity']
         fig.add_trace(
             go.Scatter(x=yearly_countries.index, y=yearly_countries.values,
                       name='연도별 국가 수', line=dict(color='orange')), 
@@ -163,16 +167,12 @@ def analyze_global_content_distribution(df):
         )
         
         # 4. 지역별 콘텐츠 타입
+        # 국가명이 정확히 일치하는 타이틀만 센다 (부분 문자열 매칭 X)
         top_5_countries = [c[0] for c in top_countries[:5]]
-        movies_data = []
-        tv_data = []
-        
-        for country in top_5_countries:
-            country_data = df[df['country'].str.contains(country, na=False)]
-            movie_count = len(country_data[country_data['type'] == 'Movie'])
-            tv_count = len(country_data[country_data['type'] == 'TV Show'])
-            movies_data.append(movie_count)
-            tv_data.append(tv_count)
+        type_counts = country_tables['by_type'].reindex(
+            index=top_5_countries, columns=['Movie', 'TV Show'], fill_value=0)
+        movies_data = type_counts['Movie'].tolist()
+        tv_data = type_counts['TV Show'].tolist()
         
         fig.add_trace(
             go.Bar(x=top_5_countries, y=movies_data, name='영화', marker_color='blue'), 
@@ -193,7 +193,7 @@ def analyze_global_content_distribution(df):
         return None, None
 
 
-def create_actor_director_network(df):
+def create_actor_director_network(df, aggregates=None):
     """
     배우-감독 네트워크를 분석합니다.
     
@@ -201,34 +201,37 @@ def create_actor_director_network(df):
     - 배우와 감독 간의 협업 관계 네트워크
     - 중심성 지표 (Degree, Betweenness)
     - 주요 인물 파악
+    
+    감독/배우 목록은 타이틀↔인물(역할) 브리지 테이블에서 가져온다.
     """
     
     try:
+        if aggregates is None:
+            aggregates = Aggregates(df)
         G = nx.Graph()
         
         # 처리할 데이터 필터링 
         # Unknown 제외, 성능을 위해 100개만 선택함
         
-        valid_data = df[(df['cast'] != 'Unknown') & (df['director'] != 'Unknown')].head(100)
-        
-        for _, row in valid_data.iterrows():
-            directors = [d.strip() for d in str(row['director']).split(',')]
-            actors = [a.strip() for a in str(row['cast']).split(',')]
-            
-            for director in directors:
-                if director and director != 'Unknown':
-                    if not G.has_node(director):
-                        G.add_node(director, type='director')
-                    
-                    for actor in actors:
-                        if actor and actor != 'Unknown':
-                            if not G.has_node(actor):
-                                G.add_node(actor, type='actor')
-                            
-                            if G.has_edge(director, actor):
-                                G[director][actor]['weight'] += 1
-                            else:
-                                G.add_edge(director, actor, weight=1)
+        valid_mask = ((df['cast'] != 'Unknown') & (df['director'] != 'Unknown')).to_numpy()
+        valid_rows = np.flatnonzero(valid_mask)[:100]
+        people = aggregates['bridges']['person'].frame(name='person')
+        people = people[np.isin(people['row'].to_numpy(), valid_rows)]
+        directors = people.loc[people['role'] == 'director', ['row', 'person']]
+        actors = people.loc[people['role'] == 'cast', ['row', 'person']]
+        
+        # 같은 타이틀의 감독 × 배우 쌍과 협업 횟수
+        pairs = directors.merge(actors, on='row', suffixes=('_director', '_actor'))
+        weights = pairs.groupby(['person_director', 'person_actor'], observed=True).size()
+        
+        G.add_nodes_from(directors['person'].unique(), type='director')
+        G.add_nodes_from((actor for actor in actors['person'].unique() if not G.has_node(actor)),
+                         type='actor')
+        for (director, actor), weight in weights.items():
+            if G.has_edge(director, actor):
+                G[director][actor]['weight'] += weight
+            else:
+                G.add_edge(director, actor, weight=weight)
         
         # 연결되지 않은 노드 제거
         nodes_to_remove = [node for node, degree in G.degree() if degree == 0]
@@ -306,7 +309,7 @@ def create_actor_director_network(df):
         return None, None, None
 
 
-def content_similarity_analysis(df):
+def content_similarity_analysis(df, aggregates=None):
     """
     콘텐츠 유사도를 분석하고 추천 시스템을 구축합니다.
     
@@ -315,63 +318,43 @@ def content_similarity_analysis(df):
     - 장르 자동 추출 및 분포
     - 장르별 트렌드 및 평균 등급
     - 유사도 히트맵
+    
+    TF-IDF 행렬과 설명 기반 장르는 aggregates에 저장된 값을 사용한다.
     """
     
     try:
-        # 텍스트 전처리
-        descriptions = df['description'].fillna('')
+        if aggregates is None:
+            aggregates = Aggregates(df)
         
-        # TF-IDF 벡터화
-        vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform(descriptions)
+        # TF-IDF 벡터화 (description 기준 저장된 벡터라이저/행렬)
+        tfidf_matrix = aggregates['tfidf']['matrix']
         
         # 코사인 유사도 계산 (샘플링)
         sample_size = min(500, len(df))
         sample_indices = np.random.choice(len(df), sample_size, replace=False)
         cosine_sim = cosine_similarity(tfidf_matrix[sample_indices], tfidf_matrix[sample_indices])
         
-        # 장르 키워드 정의
-        genre_keywords = {
-            '액션': ['action', 'fight', 'battle', 'adventure', 'thriller'],
-            '코미디': ['comedy', 'funny', 'humor', 'laugh', 'hilarious'],
-            '드라마': ['drama', 'emotional', 'family', 'life', 'story'],
-            '로맨스': ['love', 'romance', 'relationship', 'romantic'],
-            '공포': ['horror', 'scary', 'fear', 'haunted', 'terror'],
-            '다큐멘터리': ['documentary', 'real', 'true', 'history'],
-            'SF': ['sci-fi', 'science', 'future', 'space', 'technology'],
-            '범죄': ['crime', 'criminal', 'police', 'detective', 'murder']
-        }
-        
-        # 장르 추출 함수
-        def extract_genre(description):
-            description_lower = str(description).lower()
-            for genre, keywords in genre_keywords.items():
-                if any(keyword in description_lower for keyword in keywords):
-                    return genre
-            return '기타'
-        
-        df['extracted_genre'] = df['description'].apply(extract_genre)
+        # 장르 추출 (aggregate_store.GENRE_KEYWORDS 기준)
+        df['extracted_genre'] = aggregates['extracted_genre']
         genre_dist = df['extracted_genre'].value_counts()
         
-        # 추천 함수 정의
-        def get_recommendations(title, df=df):
+        # 추천 함수 정의 (제목 사전 검색 + 유사도 인덱스 top-k, similarity_index)
+        similarity_index = aggregates['similarity_index']
+        title_lookup = aggregates['title_lookup']
+        # 결과 표 컬럼은 미리 골라 두고 질의마다 k행만 take
+        recommend_table = df[['title', 'type', 'extracted_genre', 'rating']].assign(similarity_score=0.0)
+        
+        def get_recommendations(title, k=5):
             try:
-                matches = df[df['title'].str.contains(title, case=False, na=False)]
-                if matches.empty:
+                idx = title_lookup.find(title)
+                if idx is None:
                     return f"'{title}' 제목을 찾을 수 없습니다."
                 
-                idx = matches.index[0]
-                
-                full_cosine_sim = cosine_similarity(tfidf_matrix[idx:idx+1], tfidf_matrix)
-                sim_scores = list(enumerate(full_cosine_sim[0]))
-                sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
+                # 상위 k개 추천 (자기 자신 제외)
+                content_indices, scores = similarity_index.search(idx, k)
                 
-                # 상위 5개 추천 (자기 자신 제외)
-                sim_scores = sim_scores[1:6]
-                content_indices = [i[0] for i in sim_scores]
-                
-                recommendations = df.iloc[content_indices][['title', 'type', 'extracted_genre', 'rating']].copy()
-                recommendations['similarity_score'] = [score[1] for score in sim_scores]
+                recommendations = recommend_table.take(content_indices)
+                recommendations['similarity_score'] = scores
                 
                 return recommendations
                 
@@ -443,7 +426,7 @@ def content_similarity_analysis(df):
         return None, None, None
 
 
-def growth_modeling_analysis(df):
+def growth_modeling_analysis(df, aggregates=None):
     """
     성장 모델링 및 예측 분석을 수행합니다.
     
@@ -452,23 +435,16 @@ def growth_modeling_analysis(df):
     - 연도별 성장률
     - TV 프로그램 비율 변화 및 예측
     - 국가별 성장 패턴
+    
+    월별/연도별/국가별 집계는 aggregates에 저장된 테이블을 사용한다.
     """
     
     try:
-        # 날짜 데이터 확인 및 변환
-        if not np.issubdtype(df['date_added'].dtype, np.datetime64):
-            df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-        
-        # 연, 월 컬럼 생성
-        df['year_added'] = df['date_added'].dt.year
-        df['month_added'] = df['date_added'].dt.month
+        if aggregates is None:
+            aggregates = Aggregates(df)
 
         # 월별 데이터 집계
-        monthly_data = (
-            df.groupby(['year_added', 'month_added'])
-              .size()
-              .reset_index(name='count')
-        )
+        monthly_data = aggregates['monthly_counts'].reset_index(name='count')
 
         # date 컬럼 생성
         monthly_data['date'] = pd.to_datetime({
@@ -483,11 +459,11 @@ def growth_modeling_analysis(df):
         monthly_data['ma_6'] = monthly_data['count'].rolling(window=6, min_periods=1).mean()
         
         # 연도별 성장률
-        yearly_growth = df.groupby('year_added').size()
+        yearly_type_ratio = aggregates['yearly_type'].copy()
+        yearly_growth = yearly_type_ratio.sum(axis=1)
         yearly_growth_rate = yearly_growth.pct_change() * 100
         
         # TV Show 비율 변화
-        yearly_type_ratio = df.groupby(['year_added', 'type']).size().unstack(fill_value=0)
         yearly_type_ratio['tv_ratio'] = yearly_type_ratio['TV Show'] / (
             yearly_type_ratio['Movie'] + yearly_type_ratio['TV Show']
         )
@@ -549,17 +525,12 @@ def growth_modeling_analysis(df):
         )
         
         # 4. 국가별 성장 패턴 (상위 3개국)
-        country_counts = {}
-        for countries in df['country'].dropna():
-            for country in str(countries).split(', '):
-                country = country.strip()
-                if country and country != 'Unknown':
-                    country_counts[country] = country_counts.get(country, 0) + 1
-        
-        top_countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        country_tables = aggregates['country']
+        top_countries = list(country_tables['counts'].head(3).items())
+        yearly_by_country = country_tables['by_year']
         
         for country, _ in top_countries:
-            country_yearly = df[df['country'].str.contains(country, na=False)].groupby('year_added').size()
+            country_yearly = yearly_by_country.loc[country]
             if not country_yearly.empty:
                 fig.add_trace(
                     go.Scatter(x=country_yearly.index, y=country_yearly.values,
@@ -0,0 +1,104 @@
+"""
+batch_recommend.py
+==================
+전체 카탈로그 추천 이웃 표 생성 (배치 모드)
+
+실행 방법:
+    python batch_recommend.py [netflix_titles.csv] [--k 10] [--n-jobs -1] [--output netflix_neighbors]
+
+interactive_recommendation_system은 제목 하나씩 추천하지만, 이 스크립트는
+모든 타이틀의 top-k 유사 타이틀을 한 번에 계산해 (타이틀 수 × k) 표로 저장한다.
+- neighbors.npy : int32 행 위치 (전처리 후 DataFrame의 행 순서, 부족하면 -1)
+- scores.npy    : float16 코사인 유사도
+- ids.npy       : 행 위치별 show_id (전처리 없이 행 위치를 타이틀로 변환)
+- meta.json     : CSV sha256, ID 컬럼, k, 근사 여부 (근사면 표본 행의 재현율 recall)
+
+다른 프로그램에서는 NeighborTable.load(경로)로 메모리 맵을 열어
+table.recommend(show_id, by_id=True)로 바로 조회한다 (이웃도 show_id로 반환).
+"""
+
+import argparse
+import time
+import warnings
+warnings.filterwarnings('ignore')
+
+from data_preprocessing import load_and_preprocess_netflix_data
+from aggregate_store import open_aggregates
+from similarity_index import (
+    build_neighbor_table,
+    NEIGHBOR_K, NEIGHBOR_N_JOBS, NEIGHBOR_BLOCK_MB, N_PROBE
+)
+
+NEIGHBOR_DIR = 'netflix_neighbors'
+# 이웃 표에 함께 저장할 타이틀 ID 컬럼
+ID_COLUMN = 'show_id'
+
+
+def build_catalog_neighbors(df, csv_path, output=NEIGHBOR_DIR, k=NEIGHBOR_K, n_jobs=NEIGHBOR_N_JOBS,
+                            block_mb=NEIGHBOR_BLOCK_MB, n_probe=N_PROBE, exact=False, aggregates=None):
+    """
+    df 전체의 top-k 이웃 표를 output에 저장
+
+    TF-IDF와 유사도 인덱스는 aggregates(기본: csv_path 해시 기준 저장소)에서 가져오고,
+    행 위치별 ID_COLUMN 값을 ids.npy로 함께 저장한다.
+
+    Returns:
+    --------
+    NeighborTable (메모리 맵)
+    """
+    if aggregates is None:
+        aggregates = open_aggregates(df, csv_path)
+    index = aggregates['similarity_index']
+
+    start = time.perf_counter()
+    table = build_neighbor_table(index, output, k=k, n_jobs=n_jobs, block_mb=block_mb,
+                                 n_probe=n_probe, exact=exact, ids=df[ID_COLUMN].astype(str),
+                                 meta={'csv_sha256': getattr(aggregates.store, 'csv_hash', None),
+                                       'id_column': ID_COLUMN})
+    elapsed = time.perf_counter() - start
+    mode = '정확'
+    if table.meta.get('approximate'):
+        mode = (f"근사(IVF), 재현율 {table.meta['recall']:.1%} "
+                f"(표본 {table.meta['recall_sample']}개)" if 'recall' in table.meta else '근사(IVF)')
+    print(f"이웃 표 생성: {output} ({len(table):,}개 × {table.k}, {mode}, "
+          f"{elapsed:.1f}초, {len(table) / max(elapsed, 1e-9):,.0f}개/초)")
+    return table
+
+
+def print_sample(df, table, row=0, k=5):
+    """행 row 타이틀의 이웃 표 추천 결과 출력 (show_id로 조회)"""
+    titles = df.set_index(ID_COLUMN)
+    neighbors, scores = table.recommend(df[ID_COLUMN].iloc[row], k, by_id=True)
+    print(f"\n'{df['title'].iloc[row]}'와 유사한 콘텐츠:")
+    for i, (neighbor, score) in enumerate(zip(neighbors, scores), 1):
+        print(f"  {i}. {titles.at[neighbor, 'title']} ({titles.at[neighbor, 'type']}) - 유사도 {score:.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='전체 카탈로그 top-k 추천 이웃 표 생성')
+    parser.add_argument('csv_path', nargs='?', default='netflix_titles.csv')
+    parser.add_argument('-o', '--output', default=NEIGHBOR_DIR,
+                        help=f'출력 디렉터리 (기본: {NEIGHBOR_DIR})')
+    parser.add_argument('--k', type=int, default=NEIGHBOR_K, help='타이틀당 이웃 수')
+    parser.add_argument('--n-jobs', type=int, default=NEIGHBOR_N_JOBS)
+    parser.add_argument('--block-mb', type=int, default=NEIGHBOR_BLOCK_MB,
+                        help='블록 하나의 점수 행렬 메모리 상한(MB)')
+    parser.add_argument('--n-probe', type=int, default=N_PROBE,
+                        help='근사 검색에서 군집마다 비교할 군집 수')
+    parser.add_argument('--exact', action='store_true',
+                        help='근사 검색 구조가 있어도 전체 타이틀과 비교')
+    args = parser.parse_args(argv)
+
+    df = load_and_preprocess_netflix_data(args.csv_path)
+    if df is None:
+        print("\n데이터를 불러올 수 없습니다.")
+        return
+
+    table = build_catalog_neighbors(df, args.csv_path, args.output, args.k, args.n_jobs,
+                                    args.block_mb, args.n_probe, args.exact)
+    print_sample(df, table)
+    return table
+
+
+if __name__ == "__main__":
+    main()
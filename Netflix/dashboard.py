@@ -13,6 +13,7 @@ Netflix 대시보드 생성 및 관리 모듈
 """
 
 import os
+import time
 import pandas as pd
 from datetime import datetime
 import warnings
@@ -23,7 +24,7 @@ mpl.rcParams['font.family'] = 'Malgun Gothic'
 mpl.rcParams['axes.unicode_minus'] = False 
 
 
-def create_comprehensive_dashboard(df):
+def create_comprehensive_dashboard(df, aggregates=None):
     
     if df is None or df.empty:
         print("유효한 데이터가 없다.")
@@ -52,29 +53,34 @@ def create_comprehensive_dashboard(df):
         growth_modeling_analysis
     )
     
+    # 집계 테이블(브리지 테이블, 연도/월/국가/장르 집계, TF-IDF)은 한 번만 만들어 공유
+    if aggregates is None:
+        from aggregate_store import Aggregates
+        aggregates = Aggregates(df)
+    
     # 1. 콘텐츠 전략 분석
-    strategy_fig, yearly_content = analyze_content_strategy_shift(df)
+    strategy_fig, yearly_content = analyze_content_strategy_shift(df, aggregates)
     dashboard_results['strategy_analysis'] = strategy_fig
     print("Content Strategy Analysis")
     
     # 2. 글로벌 콘텐츠 분포
-    global_fig, country_counts = analyze_global_content_distribution(df)
+    global_fig, country_counts = analyze_global_content_distribution(df, aggregates)
     dashboard_results['global_distribution'] = global_fig
     print("Global Content Distribution Analysis")
     
     # 3. 배우-감독 네트워크
-    network_fig, top_degree, top_betweenness = create_actor_director_network(df)
+    network_fig, top_degree, top_betweenness = create_actor_director_network(df, aggregates)
     dashboard_results['network_analysis'] = network_fig
     print("Actor-Director Network Analysis")
     
     # 4. 콘텐츠 유사도 분석
-    similarity_fig, recommender, genre_dist = content_similarity_analysis(df)
+    similarity_fig, recommender, genre_dist = content_similarity_analysis(df, aggregates)
     dashboard_results['similarity_analysis'] = similarity_fig
     dashboard_results['recommender'] = recommender
     print("Content Similarity Analysis")
     
     # 5. 성장 모델링
-    growth_fig, monthly_data, future_predictions = growth_modeling_analysis(df)
+    growth_fig, monthly_data, future_predictions = growth_modeling_analysis(df, aggregates)
     dashboard_results['growth_modeling'] = growth_fig
     print("Growth Modeling Analysis")
     
@@ -407,10 +413,12 @@ def interactive_recommendation_system(dashboard, df):
                 continue
             
             print(f"\n'{user_input}'와 유사한 콘텐츠를 찾는 중...\n")
+            start = time.perf_counter()
             recommendations = dashboard['recommender'](user_input)
+            elapsed_ms = (time.perf_counter() - start) * 1000
             
             if isinstance(recommendations, pd.DataFrame):
-                print("추천 결과:")
+                print(f"추천 결과 ({elapsed_ms:.2f}ms):")
                 print("-"*50)
                 for i, (idx, row) in enumerate(recommendations.iterrows(), 1):
                     print(f"\n{i}. {row['title']} ({row['type']})")
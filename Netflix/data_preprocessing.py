@@ -6,6 +6,8 @@ data_preprocessing.py
 3. 결측치 처리
 4. 파생 변수 생성 (연도, 월, 시즌 등)
 5. Duration 컬럼 분리 (값, 단위)
+6. dtype 스키마 적용 (category, nullable Int16) 및 메모리 비교
+7. 다중값 컬럼 브리지 테이블 (타이틀↔국가, 타이틀↔인물/역할, 타이틀↔장르)
 """
 
 import pandas as pd
@@ -19,7 +21,90 @@ warnings.filterwarnings('ignore')
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.detach(), encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.detach(), encoding='utf-8')
-    
+
+# 로딩 dtype 스키마
+# - 값 종류가 적고 반복이 많은 문자열 컬럼은 category (행마다 정수 코드만 저장)
+# - 연도/기간은 nullable Int16 (결측이 있어도 float64로 바뀌지 않음)
+CATEGORY_COLUMNS = ['type', 'rating', 'country', 'listed_in', 'duration_unit']
+DTYPE_SCHEMA = {
+    'type': 'category',
+    'rating': 'category',
+    'country': 'category',
+    'listed_in': 'category',
+    'release_year': 'Int16',
+}
+
+# 다중값 컬럼: 브리지 테이블 이름 → 원본 컬럼 (person은 역할별 컬럼)
+BRIDGE_COLUMNS = {
+    'country': ['country'],
+    'person': ['director', 'cast'],
+    'genre': ['listed_in'],
+}
+# 브리지 테이블에서 제외할 값 (결측치 대체값과 빈 문자열)
+MULTI_VALUE_EXCLUDE = ['Unknown', '']
+
+# duration 형식: "90 min", "2 Seasons" → 숫자(value)와 단위(unit)를 한 번에 추출
+# (앞에 영문자가 없는 일반 형식만 매칭, 숫자는 필수)
+DURATION_PATTERN = re.compile(r'^[^0-9A-Za-z]*(?P<value>\d+)\s*(?P<unit>[A-Za-z]+)?')
+# 일반 형식이 아닌 값("Season 2", "min" 등)은 숫자/단위를 각각 첫 번째 것으로 추출
+DURATION_VALUE_PATTERN = re.compile(r'(?P<value>\d+)')
+DURATION_UNIT_PATTERN = re.compile(r'(?P<unit>[A-Za-z]+)')
+
+
+def _fill_missing(series, value):
+    """결측치를 value로 채움 (category 컬럼은 value를 범주에 먼저 추가)"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def split_duration(duration):
+    """
+    duration 문자열을 (값, 단위)로 분리
+
+    대부분의 값은 DURATION_PATTERN 한 번으로 분리하고, 매칭되지 않거나 단위가 없는
+    행만 숫자/단위 패턴으로 따로 추출한다. 결과는 문자열 안의 첫 번째 숫자와
+    첫 번째 영문 단어를 쓰던 기존 방식과 같다.
+    값이 없으면 <NA>, 단위가 없으면 'Unknown'.
+
+    Returns:
+    --------
+    (pd.Series[Int16], pd.Series[category])
+    """
+    parts = duration.str.extract(DURATION_PATTERN)
+    rest = parts['unit'].isna() & duration.notna()
+    if rest.any():
+        parts.loc[rest, 'value'] = duration[rest].str.extract(DURATION_VALUE_PATTERN)['value']
+        parts.loc[rest, 'unit'] = duration[rest].str.extract(DURATION_UNIT_PATTERN)['unit']
+    value = pd.to_numeric(parts['value']).astype('Int16')
+    unit = parts['unit'].fillna('Unknown').astype('category')
+    return value, unit
+
+
+def _untyped_memory(series):
+    """스키마를 적용하지 않았을 때(범주 대신 문자열, 정수는 64bit)의 메모리 (byte)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(series.cat.categories.dtype).memory_usage(index=False, deep=True)
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and \
+            pd.api.types.is_integer_dtype(series.dtype):
+        return len(series) * 8
+    return series.memory_usage(index=False, deep=True)
+
+
+def memory_comparison(df):
+    """
+    컬럼별 메모리 사용량 비교
+
+    Returns:
+    --------
+    pd.DataFrame - dtype, typed_mb(현재), untyped_mb(스키마 미적용 추정)
+    """
+    return pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'typed_mb': df.memory_usage(index=False, deep=True) / 1024**2,
+        'untyped_mb': pd.Series({col: _untyped_memory(df[col]) for col in df.columns}) / 1024**2,
+    })
+
 def load_and_preprocess_netflix_data(csv_path='netflix_titles.csv'):
     """
     Parameters:
@@ -35,10 +120,11 @@ def load_and_preprocess_netflix_data(csv_path='netflix_titles.csv'):
     - year_added, month_added, release_decade 생성
     - 결측치를 'Unknown' 또는 빈 문자열로 대체
     - duration을 값(숫자)과 단위(문자)로 분리
+    - DTYPE_SCHEMA로 로딩 (category, nullable Int16)
     """
     
     try:
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, dtype=DTYPE_SCHEMA)
         print(f" 원본 데이터 shape: {df.shape}")
         print(f"   - 행(Rows): {df.shape[0]:,}개")
         print(f"   - 열(Columns): {df.shape[1]}개")
@@ -58,8 +144,8 @@ def load_and_preprocess_netflix_data(csv_path='netflix_titles.csv'):
             print(f"   ✓ 모든 행에 날짜 정보 있음")
         
         # 3. 날짜 관련 파생 변수 생성
-        df['year_added'] = df['date_added'].dt.year
-        df['month_added'] = df['date_added'].dt.month
+        df['year_added'] = df['date_added'].dt.year.astype('Int16')
+        df['month_added'] = df['date_added'].dt.month.astype('Int8')
         df['release_decade'] = (df['release_year'] // 10) * 10
         print("   ✓ year_added, month_added, release_decade 생성 완료")
         
@@ -68,31 +154,31 @@ def load_and_preprocess_netflix_data(csv_path='netflix_titles.csv'):
         
         # country 결측치 처리
         country_missing = df['country'].isna().sum()
-        df['country'] = df['country'].fillna('Unknown')
+        df['country'] = _fill_missing(df['country'], 'Unknown')
         if country_missing > 0:
             missing_info.append(f"country: {country_missing}개")
         
         # director 결측치 처리
         director_missing = df['director'].isna().sum()
-        df['director'] = df['director'].fillna('Unknown')
+        df['director'] = _fill_missing(df['director'], 'Unknown')
         if director_missing > 0:
             missing_info.append(f"director: {director_missing}개")
         
         # cast 결측치 처리
         cast_missing = df['cast'].isna().sum()
-        df['cast'] = df['cast'].fillna('Unknown')
+        df['cast'] = _fill_missing(df['cast'], 'Unknown')
         if cast_missing > 0:
             missing_info.append(f"cast: {cast_missing}개")
         
         # rating 결측치 처리
         rating_missing = df['rating'].isna().sum()
-        df['rating'] = df['rating'].fillna('UNRATED')
+        df['rating'] = _fill_missing(df['rating'], 'UNRATED')
         if rating_missing > 0:
             missing_info.append(f"rating: {rating_missing}개")
         
         # description 결측치 처리
         description_missing = df['description'].isna().sum()
-        df['description'] = df['description'].fillna('')
+        df['description'] = _fill_missing(df['description'], '')
         if description_missing > 0:
             missing_info.append(f"description: {description_missing}개")
         
@@ -102,22 +188,13 @@ def load_and_preprocess_netflix_data(csv_path='netflix_titles.csv'):
         else:
             print("   ✓ 결측치 없음")
         
-        # 5. Duration 컬럼 분리
-        # 숫자 추출 (duration_value)
-        df['duration_value'] = df['duration'].apply(
-            lambda x: int(re.findall(r'\d+', str(x))[0]) 
-            if pd.notna(x) and re.findall(r'\d+', str(x)) 
-            else np.nan
-        )
-        
-        # 단위 추출 (duration_unit)
-        df['duration_unit'] = df['duration'].apply(
-            lambda x: re.findall(r'[a-zA-Z]+', str(x))[0].strip() 
-            if pd.notna(x) and re.findall(r'[a-zA-Z]+', str(x)) 
-            else 'Unknown'
-        )
-        
+        # 5. Duration 컬럼 분리 (숫자: duration_value, 단위: duration_unit)
+        df['duration_value'], df['duration_unit'] = split_duration(df['duration'])
         print("   ✓ duration_value, duration_unit 생성 완료")
+
+        # 제거된 행에만 있던 범주 정리
+        for col in CATEGORY_COLUMNS:
+            df[col] = df[col].cat.remove_unused_categories()
         
         # 통계
         print(f"  최종 데이터 shape: {df.shape}")
@@ -158,7 +235,11 @@ def get_data_summary(df):
     print(f"\n 기본 정보")
     print(f"   • 전체 행 수: {len(df):,}")
     print(f"   • 전체 열 수: {len(df.columns)}")
-    print(f"   • 메모리 사용량: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    memory = memory_comparison(df)
+    typed_mb = memory['typed_mb'].sum()
+    untyped_mb = memory['untyped_mb'].sum()
+    print(f"   • 메모리 사용량: {typed_mb:.2f} MB "
+          f"(스키마 미적용 시 {untyped_mb:.2f} MB, {1 - typed_mb / untyped_mb:.0%} 절감)")
     
     # 컬럼
     print(f"\n 컬럼 목록 ({len(df.columns)}개)")
@@ -166,7 +247,8 @@ def get_data_summary(df):
         dtype = df[col].dtype
         non_null = df[col].notna().sum()
         null_count = df[col].isna().sum()
-        print(f"   {i:2d}. {col:20s} | {str(dtype):10s} | Non-Null: {non_null:5,} | Null: {null_count:5,}")
+        print(f"   {i:2d}. {col:20s} | {str(dtype):10s} | Non-Null: {non_null:5,} | Null: {null_count:5,}"
+              f" | {memory.at[col, 'untyped_mb']:6.2f} → {memory.at[col, 'typed_mb']:6.2f} MB")
     
     # 중복 데이터
     duplicates = df.duplicated().sum()
@@ -182,6 +264,159 @@ def get_data_summary(df):
     print("="*60 + "\n")
 
 
+class MultiValueIndex:
+    """
+    콤마로 이어진 다중값 컬럼의 정규화 인덱스 (타이틀↔값 브리지 테이블)
+
+    행 위치 i(타이틀)의 값은 codes[indptr[i]:indptr[i+1]]이고, 각 코드는
+    categories(정렬된 고유값)의 위치다 (CSR 형식). 행 안의 순서는 원본
+    문자열의 순서를 유지한다. roles가 있으면 항목별 역할 코드(role_names의
+    위치, 예: director/cast)를 함께 저장한다.
+
+    행 위치는 인덱스를 만든 DataFrame의 행 순서 기준이므로, 행을 걸러낸
+    DataFrame에는 다시 만들어야 한다.
+    """
+
+    def __init__(self, categories, codes, indptr, roles=None, role_names=()):
+        self.categories = pd.Index(categories)
+        self.codes = codes
+        self.indptr = indptr
+        self.roles = roles
+        self.role_names = list(role_names)
+
+    @classmethod
+    def from_series(cls, series, sep=',', exclude=MULTI_VALUE_EXCLUDE):
+        """
+        다중값 문자열 컬럼 → MultiValueIndex
+
+        문자열 분리는 컬럼의 고유값마다 한 번만 하고, 행별 값은 고유값의
+        분리 결과를 코드 배열에서 모아 만든다. 같은 국가/장르 조합이
+        반복되는 컬럼은 행 수가 아니라 고유값 수만큼만 문자열을 다룬다.
+        """
+        row_unique, uniques = pd.factorize(series)
+        parts = pd.Series(np.asarray(uniques, dtype=object)).str.split(sep).explode().str.strip()
+        parts = parts[parts.notna() & ~parts.isin(exclude)]
+        part_codes, categories = pd.factorize(parts.to_numpy(dtype=object), sort=True)
+
+        # 고유값별 항목 수/시작 위치 (마지막 원소는 결측 행(-1)용 0)
+        per_unique = np.append(np.bincount(parts.index.to_numpy(), minlength=len(uniques)), 0)
+        unique_start = np.append(np.cumsum(per_unique) - per_unique, 0)
+        row_counts = per_unique[row_unique]
+        indptr = np.concatenate([[0], np.cumsum(row_counts)]).astype(np.int64)
+
+        # 항목 j(행 r) → 행 r의 고유값 분리 결과에서 (j - indptr[r])번째
+        offset = np.repeat(unique_start[row_unique] - indptr[:-1], row_counts)
+        source = np.arange(indptr[-1]) + offset
+        return cls(categories, part_codes[source].astype(np.int32), indptr)
+
+    @classmethod
+    def combine(cls, indexes, role_names):
+        """
+        같은 행 순서의 인덱스들을 역할 코드와 함께 하나로 합침
+
+        categories는 합집합으로 다시 정렬하고, 각 행에서는 indexes 순서
+        (예: 감독 다음 배우)대로 항목을 배치한다.
+        """
+        categories = indexes[0].categories
+        for index in indexes[1:]:
+            categories = categories.union(index.categories)
+        rows = np.concatenate([index.rows for index in indexes])
+        codes = np.concatenate([categories.get_indexer(index.categories)[index.codes]
+                                for index in indexes])
+        roles = np.concatenate([np.full(index.nnz, role, dtype=np.int8)
+                                for role, index in enumerate(indexes)])
+        order = np.argsort(rows, kind='stable')
+        indptr = np.sum([index.indptr for index in indexes], axis=0)
+        return cls(categories, codes[order].astype(np.int32), indptr,
+                   roles[order], role_names)
+
+    @property
+    def n_rows(self):
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self):
+        return len(self.codes)
+
+    @property
+    def rows(self):
+        """항목별 행 위치"""
+        return np.repeat(np.arange(self.n_rows), np.diff(self.indptr))
+
+    @property
+    def order(self):
+        """항목별 행 안의 순서 (0부터)"""
+        return np.arange(self.nnz) - np.repeat(self.indptr[:-1], np.diff(self.indptr))
+
+    def value_counts(self, role=None):
+        """값별 항목 수 (내림차순)"""
+        codes = self.codes if role is None else self.codes[self.roles == self.role_names.index(role)]
+        counts = np.bincount(codes, minlength=len(self.categories))
+        return pd.Series(counts, index=self.categories).sort_values(ascending=False, kind='stable')
+
+    def rows_with(self, value):
+        """value를 (부분 문자열이 아니라 정확히) 포함하는 행 위치"""
+        code = self.categories.get_indexer([value])[0]
+        return np.unique(self.rows[self.codes == code]) if code >= 0 else np.array([], dtype=np.int64)
+
+    def frame(self, df=None, columns=(), name='value', max_per_row=None):
+        """
+        long 형식 DataFrame (항목당 1행)
+
+        Parameters:
+        -----------
+        df : pd.DataFrame, optional
+            인덱스를 만든 DataFrame. columns의 값을 항목의 행 위치로 가져온다.
+        columns : list
+            함께 붙일 df의 컬럼 (예: year_added, type)
+        name : str
+            값 컬럼 이름 (categories를 범주로 갖는 category)
+        max_per_row : int, optional
+            행마다 앞에서부터 이 개수까지만 사용 (예: 장르 상위 2개)
+
+        Returns:
+        --------
+        pd.DataFrame - row, order, name, [role], columns
+        """
+        rows, order = self.rows, self.order
+        keep = slice(None) if max_per_row is None else order < max_per_row
+        long = pd.DataFrame({
+            'row': rows[keep],
+            'order': order[keep],
+            name: pd.Categorical.from_codes(self.codes[keep], self.categories),
+        })
+        if self.roles is not None:
+            long['role'] = pd.Categorical.from_codes(self.roles[keep], self.role_names)
+        for col in columns:
+            long[col] = df[col].to_numpy()[long['row'].to_numpy()]
+        return long
+
+
+def build_bridge_tables(df):
+    """
+    다중값 컬럼의 브리지 테이블을 한 번에 생성
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        load_and_preprocess_netflix_data()의 결과
+
+    Returns:
+    --------
+    dict - 'country', 'person'(role: director/cast), 'genre' → MultiValueIndex
+    """
+    bridges = {}
+    for name, columns in BRIDGE_COLUMNS.items():
+        indexes = [MultiValueIndex.from_series(df[col]) for col in columns]
+        if len(indexes) == 1:
+            bridges[name] = indexes[0]
+        else:
+            bridges[name] = MultiValueIndex.combine(indexes, columns)
+        print(f"   ✓ 브리지 테이블 {name}: {bridges[name].nnz:,}건 "
+              f"(고유값 {len(bridges[name].categories):,}개)")
+    return bridges
+
+
 def validate_data(df):
     """
     데이터 유효성을 검증합니다.
@@ -245,6 +480,7 @@ if __name__ == "__main__":
     if df is not None:
         get_data_summary(df)
         validate_data(df)
+        build_bridge_tables(df)
         print(" 모듈 테스트 완료함")
     else:
         print(" 데이터를 로드할 수 없음.")
@@ -20,6 +20,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from data_preprocessing import load_and_preprocess_netflix_data
+from aggregate_store import open_aggregates
 from dashboard import (
     create_comprehensive_dashboard,
     save_charts_as_html,
@@ -41,9 +42,9 @@ def print_menu():
     print("7. 추천 시스템 사용")
 
 
-def run_basic_analysis(df):
+def run_basic_analysis(df, aggregates=None):
     
-    dashboard = create_comprehensive_dashboard(df)
+    dashboard = create_comprehensive_dashboard(df, aggregates)
     
     if dashboard:
         show_all_charts(dashboard)
@@ -52,8 +53,8 @@ def run_basic_analysis(df):
         return None
 
 
-def run_advanced_analysis(df):
-    results = run_all_advanced_analysis(df)
+def run_advanced_analysis(df, aggregates=None):
+    results = run_all_advanced_analysis(df, aggregates)
     
     if results:
         import matplotlib.pyplot as plt
@@ -72,7 +73,7 @@ def run_advanced_analysis(df):
         return None
 
 
-def interactive_mode(df):
+def interactive_mode(df, aggregates=None):
     
     dashboard = None
     advanced_results = None
@@ -87,14 +88,14 @@ def interactive_mode(df):
                 break
             
             elif choice == '1':
-                dashboard = run_basic_analysis(df)
+                dashboard = run_basic_analysis(df, aggregates)
             
             elif choice == '2':
-                advanced_results = run_advanced_analysis(df)
+                advanced_results = run_advanced_analysis(df, aggregates)
             
             elif choice == '3':
-                dashboard = run_basic_analysis(df)
-                advanced_results = run_advanced_analysis(df)
+                dashboard = run_basic_analysis(df, aggregates)
+                advanced_results = run_advanced_analysis(df, aggregates)
             
             elif choice == '4':
                 if dashboard is None:
@@ -138,17 +139,17 @@ def interactive_mode(df):
             traceback.print_exc()
 
 
-def auto_mode(df):
+def auto_mode(df, aggregates=None):
     
     # 1. 기본 분석
-    dashboard = create_comprehensive_dashboard(df)
+    dashboard = create_comprehensive_dashboard(df, aggregates)
     
     if dashboard is None:
         print("기본 분석 실패. 프로그램을 종료합니다.")
         return
     
     # 2. 고급 분석
-    advanced_results = run_all_advanced_analysis(df)
+    advanced_results = run_all_advanced_analysis(df, aggregates)
     
     # 3. HTML 저장
     save_charts_as_html(dashboard, 'netflix_charts')
@@ -180,6 +181,10 @@ def main():
         print("\n데이터를 불러올 수 없습니다.")
         return
     
+    # 집계 테이블은 CSV 해시 기준 디스크 저장소(netflix_cache/)에서 읽고,
+    # 없는 집계만 계산해 저장한 뒤 모든 분석에서 공유
+    aggregates = open_aggregates(df, csv_path)
+    
     # 실행 모드 선택
     print("\n실행 모드 선택하기:")
     print("1. 인터랙티브 모드 (메뉴에서 원하는 분석 선택)")
@@ -189,9 +194,9 @@ def main():
         mode = input("\n선택 (1 또는 2, 기본값: 1): ").strip()
         
         if mode == '2':
-            auto_mode(df)
+            auto_mode(df, aggregates)
         else:
-            interactive_mode(df)
+            interactive_mode(df, aggregates)
     
     except KeyboardInterrupt:
         print("\n\n프로그램을 종료합니다.")
@@ -0,0 +1,458 @@
+"""
+similarity_index.py
+===================
+Netflix 콘텐츠 추천용 유사도 인덱스
+
+1. 제목 검색 (TitleLookup) - 정확히 일치 → 접두사 → 부분 문자열 순서
+2. 코사인 유사도 top-k (SimilarityIndex)
+   - L2 정규화한 TF-IDF 희소 벡터
+   - 정확 검색: 전체 점수 계산 후 argpartition
+   - 근사 검색(IVF): k-means 군집별로 행을 모아 두고, 질의와 가까운
+     군집 몇 개만 점수 계산
+3. 전체 카탈로그 이웃 표 (build_neighbor_table, NeighborTable)
+   - 블록 단위 희소 행렬 곱을 joblib 워커로 병렬 계산 (벡터 행렬은 메모리 맵으로 공유)
+   - (n × k) int32 이웃 / float16 유사도 .npy 파일, 메모리 맵으로 읽기
+   - 행 위치 ↔ 타이틀 ID(show_id) 표 (ids.npy)
+
+두 객체 모두 aggregate_store에서 집계로 저장하므로 재실행 시 다시 만들지 않는다.
+"""
+
+import os
+import json
+from bisect import bisect_left
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+# 기본 추천 개수
+TOP_K = 5
+# 이 행 수 이상이면 근사 검색(IVF) 구조를 만든다 (작은 카탈로그는 정확 검색도 1ms 이하)
+ANN_MIN_ROWS = 50_000
+# 질의마다 점수를 계산할 군집 수
+N_PROBE = 8
+# 군집 중심 학습에 쓰는 군집당 표본 행 수와 할당 블록 크기
+KMEANS_SAMPLES_PER_LIST = 50
+ASSIGN_BLOCK_ROWS = 50_000
+RANDOM_STATE = 42
+# 배치 이웃 표: 기본 이웃 수, 블록 하나의 점수 행렬 메모리 상한(MB), 병렬 작업 수
+NEIGHBOR_K = 10
+NEIGHBOR_BLOCK_MB = 64
+NEIGHBOR_N_JOBS = -1
+# 근사 이웃 표의 재현율(정확 검색 top-k 중 표에 있는 비율)을 잴 표본 행 수
+NEIGHBOR_RECALL_SAMPLE = 200
+
+
+def normalize_title(title):
+    """검색용 제목 키 (앞뒤 공백 제거, 대소문자 무시)"""
+    return str(title).strip().casefold()
+
+
+class TitleLookup:
+    """
+    제목 → 행 위치 검색
+
+    정확히 일치하는 제목은 dict로, 접두사는 정렬된 키 목록의 이진 탐색으로
+    찾는다 (둘 다 카탈로그 크기와 무관하게 1ms 이하). 둘 다 없을 때만
+    전체 제목을 훑는 부분 문자열 검색을 한다. 같은 키가 여러 행이면 앞의 행.
+    """
+
+    def __init__(self, titles):
+        self.keys = [normalize_title(title) for title in titles]
+        self.rows = {}
+        for row, key in enumerate(self.keys):
+            self.rows.setdefault(key, row)
+        self.sorted_keys = sorted(self.rows)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find(self, title):
+        """title의 행 위치 (없으면 None)"""
+        key = normalize_title(title)
+        if not key:
+            return None
+        row = self.rows.get(key)
+        if row is not None:
+            return row
+        i = bisect_left(self.sorted_keys, key)
+        if i < len(self.sorted_keys) and self.sorted_keys[i].startswith(key):
+            return self.rows[self.sorted_keys[i]]
+        return next((row for row, candidate in enumerate(self.keys) if key in candidate), None)
+
+
+class SimilarityIndex:
+    """
+    L2 정규화 희소 벡터의 코사인 유사도 top-k 인덱스
+
+    n_lists > 0이면 행을 k-means 군집(inverted list) 순서로 재배열해 두고,
+    질의 벡터와 중심이 가까운 n_probe개 군집의 행만 점수를 계산한다.
+    군집마다 행이 연속된 저장 위치를 차지하므로 단어별 postings(CSC)에서
+    군집 범위를 이진 탐색으로 잘라 질의 단어와 겹치는 항목만 더한다.
+    n_lists=None이면 ANN_MIN_ROWS 이상일 때 sqrt(행 수)개.
+    정확 검색은 전체 행렬 × 질의 벡터 후 argpartition으로 k개만 정렬한다.
+
+    Parameters:
+    -----------
+    vectors : scipy.sparse 행렬 (n_titles × n_features), 예: TF-IDF
+    n_lists : int 또는 None - 군집 수 (0이면 정확 검색만)
+    """
+
+    def __init__(self, vectors, n_lists=None, random_state=RANDOM_STATE):
+        vectors = normalize(sp.csr_matrix(vectors, dtype=np.float32))
+        n_rows = vectors.shape[0]
+        if n_lists is None:
+            n_lists = int(np.sqrt(n_rows)) if n_rows >= ANN_MIN_ROWS else 0
+        self.n_lists = min(n_lists, n_rows)
+        self.order = None        # 저장 위치 → 원래 행
+        self.slot = None         # 원래 행 → 저장 위치
+        self.list_ptr = None     # 군집 l의 행은 저장 위치 list_ptr[l]:list_ptr[l+1]
+        self.centroids_t = None  # (n_features × n_lists) 정규화 군집 중심
+        self.postings = None     # 저장 순서 행렬의 CSC (단어별 저장 위치 오름차순)
+        if self.n_lists:
+            vectors = self._build_lists(vectors, random_state)
+        vectors.sort_indices()
+        self.vectors = vectors
+
+    def _build_lists(self, vectors, random_state):
+        from sklearn.cluster import MiniBatchKMeans
+
+        n_rows = vectors.shape[0]
+        rng = np.random.default_rng(random_state)
+        sample = rng.choice(n_rows, min(n_rows, KMEANS_SAMPLES_PER_LIST * self.n_lists), replace=False)
+        kmeans = MiniBatchKMeans(n_clusters=self.n_lists, batch_size=4096, n_init=1,
+                                 max_iter=20, random_state=random_state)
+        kmeans.fit(vectors[np.sort(sample)])
+        centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+
+        # 모든 행을 가장 가까운(코사인) 중심에 할당 (블록 단위로 메모리 제한)
+        labels = np.empty(n_rows, dtype=np.int32)
+        for start in range(0, n_rows, ASSIGN_BLOCK_ROWS):
+            block = vectors[start:start + ASSIGN_BLOCK_ROWS] @ centroids.T
+            labels[start:start + ASSIGN_BLOCK_ROWS] = np.asarray(block).argmax(axis=1)
+
+        self.order = np.argsort(labels, kind='stable').astype(np.int32)
+        self.slot = np.empty(n_rows, dtype=np.int32)
+        self.slot[self.order] = np.arange(n_rows, dtype=np.int32)
+        self.list_ptr = np.zeros(self.n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=self.n_lists), out=self.list_ptr[1:])
+        self.centroids_t = np.ascontiguousarray(centroids.T)
+        vectors = vectors[self.order]
+        self.postings = vectors.tocsc()
+        self.postings.sort_indices()
+        return vectors
+
+    @property
+    def n_rows(self):
+        return self.vectors.shape[0]
+
+    def _stored(self, row):
+        return row if self.slot is None else int(self.slot[row])
+
+    def _original(self, stored):
+        return stored if self.order is None else self.order[stored]
+
+    def _list_scores(self, terms, weights, lists):
+        """
+        군집 lists에 속한 행의 질의 점수
+
+        열(단어) 방향 postings에서 질의 단어의 구간 중 각 군집 저장 위치
+        범위만 searchsorted로 잘라 더하므로, 후보 행의 전체 단어가 아니라
+        질의 단어와 겹치는 항목만 계산한다.
+
+        Returns:
+        --------
+        tuple : (np.ndarray 저장 위치, np.ndarray 점수)
+        """
+        lows, highs = self.list_ptr[lists], self.list_ptr[lists + 1]
+        sizes = highs - lows
+        bases = np.cumsum(sizes) - sizes
+        rows = np.arange(sizes.sum()) + np.repeat(lows - bases, sizes)
+
+        col_ptr, col_rows = self.postings.indptr, self.postings.indices
+        # searchsorted는 dtype이 다르면 열 전체를 변환하므로 postings 인덱스 dtype으로 맞춘다
+        bounds = np.concatenate((lows, highs)).astype(col_rows.dtype)
+        spans = np.array([col_ptr[term] + np.searchsorted(col_rows[col_ptr[term]:col_ptr[term + 1]], bounds)
+                          for term in terms]).reshape(len(terms), 2, len(lists))
+        starts, lengths = spans[:, 0].ravel(), (spans[:, 1] - spans[:, 0]).ravel()
+        total = lengths.sum()
+        if not total:
+            return rows, np.zeros(len(rows), dtype=np.float32)
+
+        # (단어, 군집) 구간을 이어 붙인 postings 위치와 후보 배열 안의 위치
+        ends = np.cumsum(lengths)
+        positions = np.arange(total) + np.repeat(starts - (ends - lengths), lengths)
+        shift = np.repeat(np.tile(bases - lows, len(terms)), lengths)
+        values = self.postings.data[positions] * np.repeat(np.repeat(weights, len(lists)), lengths)
+        scores = np.bincount(col_rows[positions] + shift, weights=values, minlength=len(rows))
+        return rows, scores
+
+    def search(self, row, k=TOP_K, exact=None, n_probe=N_PROBE):
+        """
+        row(원래 행 위치)와 코사인 유사도가 높은 k개 행 (자기 자신 제외)
+
+        exact=None이면 IVF 구조가 있을 때 근사 검색, 없으면 정확 검색.
+
+        Returns:
+        --------
+        tuple : (np.ndarray 행 위치, np.ndarray 유사도) - 유사도 내림차순
+        """
+        stored = self._stored(row)
+        start, end = self.vectors.indptr[stored], self.vectors.indptr[stored + 1]
+        terms = self.vectors.indices[start:end]
+        weights = self.vectors.data[start:end]
+        q = np.zeros(self.vectors.shape[1], dtype=np.float32)
+        q[terms] = weights
+
+        if exact or not self.n_lists:
+            candidates = np.arange(self.n_rows)
+            scores = self.vectors @ q
+        else:
+            n_probe = min(n_probe, self.n_lists)
+            centroid_scores = weights @ self.centroids_t[terms]
+            lists = np.argpartition(centroid_scores, -n_probe)[-n_probe:]
+            candidates, scores = self._list_scores(terms, weights, lists)
+
+        scores[candidates == stored] = -np.inf
+        k = min(k, len(scores) - 1)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return np.asarray(self._original(candidates[top]), dtype=np.int64), scores[top]
+
+    def neighbor_blocks(self, block_mb=NEIGHBOR_BLOCK_MB, n_probe=N_PROBE, exact=False):
+        """
+        배치 이웃 계산 블록 (질의 저장 위치 start, stop, 후보 저장 위치)
+
+        exact=True이거나 IVF 구조가 없으면 후보는 전체 행(None)이고, 아니면
+        군집마다 중심이 가까운 n_probe개 군집(자기 군집 포함)의 행이다.
+        블록 행 수는 (블록 행 수 × 후보 수) float32 점수 행렬이 block_mb
+        이하가 되도록 정한다.
+        """
+        budget = block_mb * 2 ** 20 // 4
+        if exact or not self.n_lists:
+            rows = max(1, budget // max(self.n_rows, 1))
+            for start in range(0, self.n_rows, rows):
+                yield start, min(start + rows, self.n_rows), None
+            return
+
+        list_scores = self.centroids_t.T @ self.centroids_t
+        n_probe = min(n_probe, self.n_lists)
+        for lst in range(self.n_lists):
+            lo, hi = self.list_ptr[lst], self.list_ptr[lst + 1]
+            if lo == hi:
+                continue
+            probe = np.union1d(np.argpartition(list_scores[lst], -n_probe)[-n_probe:], [lst])
+            candidates = np.concatenate([np.arange(self.list_ptr[p], self.list_ptr[p + 1]) for p in probe])
+            rows = max(1, budget // len(candidates))
+            for start in range(lo, hi, rows):
+                yield start, min(start + rows, hi), candidates
+
+
+def _block_top_k(vectors, start, stop, candidates, k):
+    """
+    워커: 저장 위치 start:stop 질의 블록의 top-k (자기 자신 제외)
+
+    vectors는 메모리 맵 배열의 희소 행렬이므로 작업마다 파일 경로만 전달되고,
+    워커는 필요한 행만 잘라 쓴다. candidates(오름차순 저장 위치, None이면 전체 행)
+    행렬 @ 질의.T를 밀집 (후보 수 × 블록 행 수) 점수 행렬로 계산하고
+    행마다 argpartition으로 k개만 골라 정렬한다.
+
+    Returns:
+    --------
+    tuple : (query_rows, np.ndarray int32 (블록 행 수 × k) 저장 위치, np.ndarray float16 유사도)
+    """
+    query_rows = np.arange(start, stop)
+    if candidates is None:
+        pool, pool_rows = vectors, np.arange(vectors.shape[0])
+    else:
+        pool, pool_rows = vectors[candidates], candidates
+    scores = np.asarray(pool @ vectors[start:stop].T.toarray()).T
+    n_queries = len(query_rows)
+    self_cols = np.searchsorted(pool_rows, query_rows)
+    scores[np.arange(n_queries), self_cols] = -np.inf
+
+    neighbors = np.full((n_queries, k), -1, dtype=np.int32)
+    top_scores = np.zeros((n_queries, k), dtype=np.float16)
+    kk = min(k, scores.shape[1] - 1)
+    if kk > 0:
+        top = np.argpartition(scores, -kk, axis=1)[:, -kk:]
+        values = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-values, axis=1, kind='stable')
+        neighbors[:, :kk] = pool_rows[np.take_along_axis(top, order, axis=1)]
+        top_scores[:, :kk] = np.take_along_axis(values, order, axis=1)
+    return query_rows, neighbors, top_scores
+
+
+class NeighborTable:
+    """
+    미리 계산한 전체 카탈로그 이웃 표
+
+    neighbors[i] : 행 i와 유사한 행 위치 (int32, 유사도 내림차순, 부족하면 -1)
+    scores[i]    : 그 유사도 (float16)
+    ids[i]       : 행 i의 타이틀 ID (예: show_id, 저장하지 않았으면 ids는 None)
+
+    load()는 .npy 파일을 np.load(mmap_mode='r')로 열므로 표 전체를 읽지 않고
+    필요한 행만 페이지 단위로 읽는다 (행 하나 조회는 카탈로그 크기와 무관).
+    """
+
+    NEIGHBORS_FILE = 'neighbors.npy'
+    SCORES_FILE = 'scores.npy'
+    IDS_FILE = 'ids.npy'
+    META_FILE = 'meta.json'
+
+    def __init__(self, neighbors, scores, meta=None, ids=None):
+        self.neighbors = neighbors
+        self.scores = scores
+        self.meta = meta or {}
+        self.ids = ids
+        self._rows = None  # ID → 행 위치 (처음 ID로 조회할 때 생성)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        neighbors = np.load(os.path.join(path, cls.NEIGHBORS_FILE), mmap_mode=mmap_mode)
+        scores = np.load(os.path.join(path, cls.SCORES_FILE), mmap_mode=mmap_mode)
+        ids_path = os.path.join(path, cls.IDS_FILE)
+        ids = np.load(ids_path, mmap_mode=mmap_mode) if os.path.exists(ids_path) else None
+        meta_path = os.path.join(path, cls.META_FILE)
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        return cls(neighbors, scores, meta, ids)
+
+    def __len__(self):
+        return self.neighbors.shape[0]
+
+    @property
+    def k(self):
+        return self.neighbors.shape[1]
+
+    def row_of(self, title_id):
+        """타이틀 ID의 행 위치 (없으면 KeyError)"""
+        if self.ids is None:
+            raise ValueError("이웃 표에 타이틀 ID(ids.npy)가 없습니다.")
+        if self._rows is None:
+            self._rows = {str(value): row for row, value in enumerate(self.ids)}
+        return self._rows[str(title_id)]
+
+    def recommend(self, row, k=None, by_id=False):
+        """
+        행 row의 상위 k개 이웃 (행 위치, 유사도)
+
+        by_id=True이면 row 대신 타이틀 ID를 받고 이웃도 타이틀 ID로 반환한다.
+        """
+        if by_id:
+            row = self.row_of(row)
+        neighbors = np.asarray(self.neighbors[row, :k])
+        valid = neighbors >= 0
+        neighbors = neighbors[valid].astype(np.int64)
+        if by_id:
+            neighbors = np.asarray(self.ids[neighbors])
+        return neighbors, np.asarray(self.scores[row, :k])[valid].astype(np.float32)
+
+
+def build_neighbor_table(index, path, k=NEIGHBOR_K, n_jobs=NEIGHBOR_N_JOBS,
+                         block_mb=NEIGHBOR_BLOCK_MB, n_probe=N_PROBE, exact=False, meta=None, ids=None,
+                         recall_sample=NEIGHBOR_RECALL_SAMPLE, random_state=RANDOM_STATE):
+    """
+    모든 행의 top-k 이웃을 계산해 path에 NeighborTable 파일로 저장
+
+    index.vectors를 한 번 joblib 파일로 저장해 메모리 맵으로 열고, 워커에는
+    index.neighbor_blocks()의 블록마다 행 범위와 후보 저장 위치만 보낸다
+    (메모리 맵 배열은 파일 경로로 전달되므로 작업마다 행렬을 복사하지 않는다).
+    결과는 받는 대로 .npy 메모리 맵에 원래 행 순서로 기록한다. 동시에 처리
+    중인 블록은 워커 수의 2배 이하이므로 점수 행렬 메모리는 block_mb와 워커
+    수에 비례한다. IVF 구조가 있으면 군집 단위 근사 결과이고 (군집 단위로
+    후보를 고르므로 search()보다 재현율이 낮다), recall_sample개 행을 정확
+    검색과 비교한 재현율을 meta.json의 recall에 기록한다. exact=True이면 전체
+    행과 비교한다 (행 수의 제곱에 비례하므로 대규모 카탈로그에서는 느리다).
+    ids(원래 행 순서의 타이틀 ID)를
+    주면 ids.npy로 함께 저장한다. 임시 파일에 쓴 뒤 이름을 바꾸고, 실패하면
+    임시 파일을 지운다.
+
+    Returns:
+    --------
+    NeighborTable (메모리 맵)
+    """
+    import joblib
+    from joblib import Parallel, delayed
+
+    os.makedirs(path, exist_ok=True)
+    n_rows = index.n_rows
+    names = [NeighborTable.NEIGHBORS_FILE, NeighborTable.SCORES_FILE]
+    if ids is not None:
+        ids = np.asarray(ids, dtype=str)
+        if len(ids) != n_rows:
+            raise ValueError(f"ids 길이({len(ids)})가 행 수({n_rows})와 다릅니다.")
+        names.append(NeighborTable.IDS_FILE)
+    files = {name: os.path.join(path, name) for name in names}
+    vectors_path = os.path.join(path, 'vectors.joblib.tmp')
+    neighbors = scores = vectors = None
+    try:
+        try:
+            neighbors = np.lib.format.open_memmap(files[NeighborTable.NEIGHBORS_FILE] + '.tmp', mode='w+',
+                                                  dtype=np.int32, shape=(n_rows, k))
+            scores = np.lib.format.open_memmap(files[NeighborTable.SCORES_FILE] + '.tmp', mode='w+',
+                                               dtype=np.float16, shape=(n_rows, k))
+            if ids is not None:
+                # np.save는 파일 객체에 쓰면 확장자를 붙이지 않는다
+                with open(files[NeighborTable.IDS_FILE] + '.tmp', 'wb') as f:
+                    np.save(f, ids)
+            joblib.dump(index.vectors, vectors_path)
+            vectors = joblib.load(vectors_path, mmap_mode='r')
+
+            # 작업 인자는 행 범위와 후보 위치뿐이고 디스패치할 때 만들어진다
+            results = Parallel(n_jobs=n_jobs, return_as='generator', pre_dispatch='2*n_jobs')(
+                delayed(_block_top_k)(vectors, start, stop, candidates, k)
+                for start, stop, candidates in index.neighbor_blocks(block_mb, n_probe, exact)
+            )
+            for query_rows, block_neighbors, block_scores in results:
+                rows = index._original(query_rows)
+                mapped = index._original(np.maximum(block_neighbors, 0))
+                neighbors[rows] = np.where(block_neighbors >= 0, mapped, -1)
+                scores[rows] = block_scores
+            neighbors.flush()
+            scores.flush()
+        finally:
+            # 임시 파일을 옮기거나 지우기 전에 메모리 맵을 놓는다
+            del neighbors, scores, vectors
+        for final_path in files.values():
+            os.replace(final_path + '.tmp', final_path)
+    except BaseException:
+        for final_path in files.values():
+            if os.path.exists(final_path + '.tmp'):
+                os.remove(final_path + '.tmp')
+        raise
+    finally:
+        if os.path.exists(vectors_path):
+            os.remove(vectors_path)
+    if ids is None and os.path.exists(os.path.join(path, NeighborTable.IDS_FILE)):
+        os.remove(os.path.join(path, NeighborTable.IDS_FILE))  # 이전 표의 ID가 남지 않도록
+    table = NeighborTable.load(path)
+    approximate = bool(index.n_lists) and not exact
+    meta = dict(meta or {}, n_rows=n_rows, k=k, approximate=approximate, n_probe=n_probe)
+    if approximate and recall_sample:
+        meta['recall'], meta['recall_sample'] = neighbor_recall(index, table, recall_sample, random_state)
+    with open(os.path.join(path, NeighborTable.META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    table.meta = meta
+    return table
+
+
+def neighbor_recall(index, table, sample=NEIGHBOR_RECALL_SAMPLE, random_state=RANDOM_STATE):
+    """
+    이웃 표의 재현율 (표본 행마다 정확 검색 top-k 중 표에 있는 비율)
+
+    Returns:
+    --------
+    tuple : (float 재현율, int 표본 행 수)
+    """
+    rng = np.random.default_rng(random_state)
+    rows = rng.choice(index.n_rows, min(sample, index.n_rows), replace=False)
+    found = total = 0
+    for row in rows:
+        expected, _ = index.search(row, table.k, exact=True)
+        found += len(np.intersect1d(expected, table.neighbors[row]))
+        total += len(expected)
+    return (found / total if total else 1.0), len(rows)
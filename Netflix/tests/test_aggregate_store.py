@@ -0,0 +1,84 @@
+# tests/test_aggregate_store.py
+import sys
+import os
+import re
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import aggregate_store
+from aggregate_store import AGGREGATES, open_aggregates
+from data_preprocessing import load_and_preprocess_netflix_data
+
+WORDS = ['action fight', 'love story', 'space future', 'crime police', 'funny laugh', 'true history']
+
+def _write_csv(path, n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'show_id': [f's{i}' for i in range(n)],
+        'type': rng.choice(['Movie', 'TV Show'], n),
+        'title': [f'Title {i}' for i in range(n)],
+        'director': rng.choice(['A', 'B, C', None], n),
+        'cast': rng.choice(['X, Y', 'Z', None], n),
+        'country': rng.choice(['United States, India', 'India', None], n),
+        'date_added': rng.choice(['September 25, 2021', 'January 1, 2020'], n),
+        'release_year': rng.integers(1990, 2021, n),
+        'rating': rng.choice(['TV-MA', 'PG'], n),
+        'duration': rng.choice(['90 min', '2 Seasons'], n),
+        'listed_in': rng.choice(['Dramas, Comedies', 'Horror Movies'], n),
+        'description': [f'{WORDS[i % len(WORDS)]} number {i}' for i in range(n)],
+    }).to_csv(path, index=False)
+
+def _open(csv_path, root, capsys):
+    """전처리 후 모든 집계를 읽거나 계산하고, 계산한 집계 이름을 반환"""
+    df = load_and_preprocess_netflix_data(str(csv_path))
+    capsys.readouterr()
+    aggregates = open_aggregates(df, str(csv_path), root=str(root)).preload()
+    built = set(re.findall(r'\[집계 계산\] (\w+)', capsys.readouterr().out))
+    return aggregates, built
+
+def _pickles(root):
+    return {name: sorted(os.listdir(root / name)) for name in AGGREGATES}
+
+def test_edited_column_rebuilds_only_dependents(tmp_path, capsys):
+    csv_path, root = tmp_path / 'titles.csv', tmp_path / 'cache'
+    _write_csv(csv_path)
+    _, built = _open(csv_path, root, capsys)
+    assert built == set(AGGREGATES)
+    _, built = _open(csv_path, root, capsys)
+    assert built == set()
+    first = _pickles(root)
+
+    # description 한 행만 바꾸면 description을 읽는 집계만 다시 계산
+    df = pd.read_csv(csv_path)
+    df.loc[3, 'description'] = 'haunted scary terror'
+    df.to_csv(csv_path, index=False)
+    aggregates, built = _open(csv_path, root, capsys)
+    dependents = {name for name, (columns, _) in AGGREGATES.items() if 'description' in columns}
+    assert built == dependents
+    assert aggregates['extracted_genre'][3] == '공포'
+
+    second = _pickles(root)
+    for name in AGGREGATES:
+        # 이전 CSV의 파일은 매니페스트에 남아 있으므로 유지된다
+        assert len(second[name]) == len(first[name]) + (name in dependents)
+
+def test_prune_removes_unreferenced_pickles(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(aggregate_store, 'MAX_CSV_ENTRIES', 1)
+    csv_path, root = tmp_path / 'titles.csv', tmp_path / 'cache'
+    _write_csv(csv_path)
+    _open(csv_path, root, capsys)
+    first = _pickles(root)
+
+    df = pd.read_csv(csv_path)
+    df.loc[0, 'rating'] = 'R'
+    df.to_csv(csv_path, index=False)
+    _, built = _open(csv_path, root, capsys)
+    assert built == {'rating_counts'}
+
+    # 이전 CSV 항목이 밀려나면 그 CSV만 참조하던 rating_counts 파일은 삭제
+    second = _pickles(root)
+    assert second['rating_counts'] != first['rating_counts']
+    assert all(len(files) == 1 for files in second.values())
+    assert {name: files for name, files in second.items() if name != 'rating_counts'} == \
+        {name: files for name, files in first.items() if name != 'rating_counts'}
@@ -0,0 +1,84 @@
+# tests/test_bridge_tables.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from data_preprocessing import MultiValueIndex, MULTI_VALUE_EXCLUDE
+
+def _frame():
+    """결측/Unknown/빈 항목/반복 조합이 섞인 다중값 컬럼 (일부 행은 미리 걸러냄)"""
+    df = pd.DataFrame({
+        'country': ['United States, India', np.nan, 'Unknown', 'India',
+                    'United States, India', ' France ,United States', 'India, , Japan',
+                    'Japan', 'United States, India', 'Unknown, Korea'],
+        'director': ['A', 'B, C', np.nan, 'A', 'Unknown', 'C', 'B', np.nan, 'A, D', 'E'],
+        'cast': ['X, Y', 'Y', 'Z, A', np.nan, 'X', 'Unknown', 'Y, X', 'Z', 'X', np.nan],
+        'keep': [True, True, True, False, True, True, True, True, False, True],
+    })
+    return df[df['keep']]
+
+def _explode(series):
+    """기준: 행마다 str.split(',') 후 공백 제거, 결측/제외 값 삭제 (row, order, value)"""
+    records = []
+    for row, value in enumerate(series):
+        if pd.isna(value):
+            continue
+        parts = [part.strip() for part in str(value).split(',')]
+        parts = [part for part in parts if part not in MULTI_VALUE_EXCLUDE]
+        records += [(row, order, part) for order, part in enumerate(parts)]
+    return pd.DataFrame(records, columns=['row', 'order', 'value'])
+
+def _long(index, **kwargs):
+    long = index.frame(**kwargs)
+    long['value'] = long['value'].astype(object)
+    return long
+
+def test_from_series_matches_explode():
+    df = _frame()
+    for col in ('country', 'director', 'cast'):
+        for series in (df[col], df[col].astype('category')):
+            index = MultiValueIndex.from_series(series)
+            expected = _explode(series)
+            pd.testing.assert_frame_equal(_long(index)[['row', 'order', 'value']],
+                                          expected, check_dtype=False)
+            assert index.n_rows == len(series)
+            assert list(index.categories) == sorted(expected['value'].unique())
+            for value in list(expected['value'].unique()) + ['Unknown', 'Nowhere']:
+                np.testing.assert_array_equal(
+                    index.rows_with(value),
+                    np.unique(expected.loc[expected['value'] == value, 'row']))
+
+def test_frame_columns_and_max_per_row():
+    df = _frame().assign(year=lambda d: np.arange(len(d)) + 2000)
+    index = MultiValueIndex.from_series(df['country'])
+    long = _long(index, df=df, columns=['year'], max_per_row=1)
+    expected = _explode(df['country'])
+    expected = expected[expected['order'] < 1].reset_index(drop=True)
+    pd.testing.assert_frame_equal(long[['row', 'order', 'value']], expected, check_dtype=False)
+    np.testing.assert_array_equal(long['year'], df['year'].to_numpy()[expected['row']])
+
+def test_combine_roles_matches_explode():
+    df = _frame()
+    person = MultiValueIndex.combine(
+        [MultiValueIndex.from_series(df['director']), MultiValueIndex.from_series(df['cast'])],
+        ['director', 'cast'])
+
+    # 행마다 감독 다음 배우 순서
+    parts = [_explode(df[col]).assign(role=col) for col in ('director', 'cast')]
+    expected = pd.concat(parts).sort_values('row', kind='stable').reset_index(drop=True)
+    expected['order'] = expected.groupby('row').cumcount()
+    long = _long(person)
+    long['role'] = long['role'].astype(object)
+    pd.testing.assert_frame_equal(long[['row', 'order', 'value', 'role']],
+                                  expected[['row', 'order', 'value', 'role']], check_dtype=False)
+
+    for value in expected['value'].unique():
+        np.testing.assert_array_equal(
+            person.rows_with(value),
+            np.unique(expected.loc[expected['value'] == value, 'row']))
+    for role in ('director', 'cast'):
+        counts = person.value_counts(role)
+        expected_counts = expected.loc[expected['role'] == role, 'value'].value_counts()
+        assert counts[counts > 0].to_dict() == expected_counts.to_dict()
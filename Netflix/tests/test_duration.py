@@ -0,0 +1,37 @@
+# tests/test_duration.py
+import sys
+import os
+import re
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from data_preprocessing import split_duration
+
+CASES = ['90 min', ' 90 min', '90min', '2 Seasons', '1 Season', 'Season 2',
+         'min', '90', '', '  ', 'abc 90 min', np.nan]
+
+def _findall_duration(x):
+    """기존 방식: 문자열의 첫 번째 숫자와 첫 번째 영문 단어"""
+    if pd.isna(x):
+        return np.nan, 'Unknown'
+    numbers = re.findall(r'\d+', str(x))
+    words = re.findall(r'[a-zA-Z]+', str(x))
+    return (int(numbers[0]) if numbers else np.nan,
+            words[0].strip() if words else 'Unknown')
+
+def test_split_duration_matches_findall():
+    duration = pd.Series(CASES, dtype='str')
+    value, unit = split_duration(duration)
+    for i, x in enumerate(CASES):
+        expected_value, expected_unit = _findall_duration(x)
+        if pd.isna(expected_value):
+            assert pd.isna(value.iloc[i]), x
+        else:
+            assert value.iloc[i] == expected_value, x
+        assert unit.iloc[i] == expected_unit, x
+
+def test_split_duration_edge_cases():
+    value, unit = split_duration(pd.Series([' 90 min', 'Season 2'], dtype='str'))
+    assert value.tolist() == [90, 2]
+    assert unit.tolist() == ['min', 'Season']
@@ -0,0 +1,93 @@
+# tests/test_neighbor_table.py
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+import similarity_index
+from similarity_index import SimilarityIndex, NeighborTable, build_neighbor_table
+
+def _vectors(n, n_features=200, seed=0):
+    vectors = sp.random(n, n_features, density=0.05, random_state=seed, format='lil')
+    vectors[np.arange(n), np.arange(n) % n_features] = 0.5
+    return vectors.tocsr()
+
+def _brute_force(vectors, k):
+    """행마다 코사인 유사도 내림차순 top-k (자기 자신 제외, 부족하면 -1)"""
+    similarity = cosine_similarity(vectors)
+    np.fill_diagonal(similarity, -np.inf)
+    order = np.argsort(-similarity, axis=1, kind='stable')[:, :k]
+    n_valid = min(k, len(similarity) - 1)
+    neighbors = np.full((len(similarity), k), -1)
+    neighbors[:, :n_valid] = order[:, :n_valid]
+    scores = np.zeros((len(similarity), k))
+    scores[:, :n_valid] = np.take_along_axis(similarity, order[:, :n_valid], axis=1)
+    return neighbors, scores
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_exact_table_matches_brute_force(tmp_path, n_jobs):
+    vectors = _vectors(1200)
+    index = SimilarityIndex(vectors, n_lists=0)
+    # 블록 하나가 약 200행이 되도록 block_mb를 작게 잡아 여러 블록으로 나눠 계산
+    table = build_neighbor_table(index, tmp_path / 'table', k=6, n_jobs=n_jobs,
+                                 block_mb=1, exact=True)
+    neighbors, scores = _brute_force(vectors, 6)
+    np.testing.assert_array_equal(table.neighbors, neighbors)
+    np.testing.assert_allclose(table.scores, scores, atol=2e-3)
+    assert not table.meta['approximate'] and 'recall' not in table.meta
+    assert sorted(os.listdir(tmp_path / 'table')) == ['meta.json', 'neighbors.npy', 'scores.npy']
+
+def test_padding_and_id_lookup(tmp_path):
+    vectors = sp.csr_matrix(np.random.default_rng(0).random((5, 4)))
+    ids = [f's{i}' for i in range(10, 15)]
+    table = build_neighbor_table(SimilarityIndex(vectors, n_lists=0), tmp_path / 'table',
+                                 k=7, n_jobs=1, exact=True, ids=ids)
+    neighbors, _ = _brute_force(vectors, 7)
+    np.testing.assert_array_equal(table.neighbors, neighbors)
+    assert (table.neighbors[:, 4:] == -1).all()
+
+    loaded = NeighborTable.load(tmp_path / 'table')
+    for row, title_id in enumerate(ids):
+        rows, row_scores = loaded.recommend(row)
+        assert len(rows) == 4 and row not in rows
+        id_neighbors, id_scores = loaded.recommend(title_id, by_id=True)
+        assert list(id_neighbors) == [ids[r] for r in rows]
+        np.testing.assert_array_equal(id_scores, row_scores)
+    assert len(loaded.recommend('s12', k=2, by_id=True)[0]) == 2
+    with pytest.raises(KeyError):
+        loaded.recommend('missing', by_id=True)
+
+    # ID 없이 다시 만들면 이전 ids.npy는 지운다
+    table = build_neighbor_table(SimilarityIndex(vectors, n_lists=0), tmp_path / 'table',
+                                 k=3, n_jobs=1, exact=True)
+    assert table.ids is None and not os.path.exists(tmp_path / 'table' / 'ids.npy')
+
+def test_approximate_table_records_recall(tmp_path):
+    vectors = _vectors(1200, seed=1)
+    index = SimilarityIndex(vectors, n_lists=16)
+    table = build_neighbor_table(index, tmp_path / 'ivf', k=5, n_jobs=1, n_probe=2,
+                                 recall_sample=100)
+    with open(tmp_path / 'ivf' / 'meta.json', encoding='utf-8') as f:
+        meta = json.load(f)
+    assert meta['approximate'] and meta['recall_sample'] == 100
+    assert 0 < meta['recall'] < 1 and table.meta == meta
+
+    # 모든 군집을 후보로 보면 정확 검색과 같은 표 (재현율 1)
+    table = build_neighbor_table(index, tmp_path / 'all', k=5, n_jobs=1,
+                                 n_probe=index.n_lists, recall_sample=100)
+    assert table.meta['recall'] == 1.0
+    neighbors, _ = _brute_force(vectors, 5)
+    np.testing.assert_array_equal(table.neighbors, neighbors)
+
+def test_failed_build_removes_temporary_files(tmp_path, monkeypatch):
+    def fail(*args):
+        raise RuntimeError('worker failed')
+    monkeypatch.setattr(similarity_index, '_block_top_k', fail)
+    with pytest.raises(RuntimeError):
+        build_neighbor_table(SimilarityIndex(_vectors(50), n_lists=0), tmp_path / 'table',
+                             k=3, n_jobs=1, ids=[str(i) for i in range(50)])
+    assert os.listdir(tmp_path / 'table') == []
@@ -0,0 +1,79 @@
+# tests/test_similarity_index.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+from similarity_index import SimilarityIndex, TitleLookup
+
+def _vectors(n=1500, n_features=300, seed=0):
+    """TF-IDF처럼 희소한 음이 아닌 벡터 (빈 행 없음)"""
+    vectors = sp.random(n, n_features, density=0.03, random_state=seed, format='lil')
+    vectors[np.arange(n), np.arange(n) % n_features] = 0.5
+    return vectors.tocsr()
+
+def _expected(similarity, row, k):
+    scores = similarity[row].copy()
+    scores[row] = -np.inf
+    top = np.argsort(-scores, kind='stable')[:k]
+    return top, scores[top]
+
+def test_exact_search_matches_cosine_similarity():
+    vectors = _vectors()
+    index = SimilarityIndex(vectors, n_lists=0)
+    similarity = cosine_similarity(vectors)
+    for row in range(0, vectors.shape[0], 37):
+        rows, scores = index.search(row, k=7)
+        expected_rows, expected_scores = _expected(similarity, row, 7)
+        assert row not in rows
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-5)
+        np.testing.assert_array_equal(rows, expected_rows)
+
+def test_ivf_search_returns_original_rows():
+    vectors = _vectors(seed=1)
+    index = SimilarityIndex(vectors, n_lists=12)
+    assert index.order is not None and not np.array_equal(index.order, np.arange(len(index.order)))
+    np.testing.assert_array_equal(index.order[index.slot], np.arange(vectors.shape[0]))
+    similarity = cosine_similarity(vectors)
+
+    for row in range(0, vectors.shape[0], 53):
+        rows, scores = index.search(row, k=5)
+        assert row not in rows and len(set(rows)) == len(rows)
+        assert np.all((rows >= 0) & (rows < vectors.shape[0]))
+        # 반환한 점수는 원래 행 위치 기준의 실제 코사인 유사도
+        np.testing.assert_allclose(scores, similarity[row, rows], rtol=1e-5, atol=1e-6)
+        assert np.all(np.diff(scores) <= 0)
+
+        # 모든 군집을 보면 정확 검색과 같다
+        all_rows, all_scores = index.search(row, k=5, n_probe=index.n_lists)
+        expected_rows, expected_scores = _expected(similarity, row, 5)
+        np.testing.assert_allclose(all_scores, expected_scores, rtol=1e-5)
+        np.testing.assert_array_equal(all_rows, expected_rows)
+        np.testing.assert_array_equal(index.search(row, k=5, exact=True)[0], expected_rows)
+
+def test_search_small_catalog():
+    index = SimilarityIndex(sp.csr_matrix(np.array([[1.0, 0.0], [1.0, 1.0]])), n_lists=0)
+    rows, scores = index.search(0, k=5)
+    np.testing.assert_array_equal(rows, [1])
+    np.testing.assert_allclose(scores, [np.sqrt(0.5)], rtol=1e-6)
+
+def test_title_lookup_order():
+    titles = ['The Office (UK)', 'Office Space', 'The Office', 'office', 'Spaceballs', 'The Office']
+    lookup = TitleLookup(titles)
+    assert len(lookup) == len(titles)
+    # 정확히 일치 (대소문자/공백 무시, 같은 제목은 앞의 행)
+    assert lookup.find('  OFFICE ') == 3
+    assert lookup.find('the office') == 2
+    # 접두사: 정렬 순서로 가장 앞의 키 ('the office' < 'the office (uk)')
+    assert lookup.find('The Off') == 2
+    # 접두사가 부분 문자열보다 우선 (행 순서로 앞서 포함하는 제목이 있어도)
+    assert lookup.find('offi') == 3
+    assert lookup.find('Office S') == 1
+    assert lookup.find('space') == 4
+    # 부분 문자열: 행 순서로 처음 포함하는 제목
+    assert lookup.find('ace') == 1
+    assert lookup.find('(uk)') == 0
+    assert lookup.find('missing') is None
+    assert lookup.find('   ') is None